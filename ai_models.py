@@ -0,0 +1,61 @@
+# ai_models.py
+# Lazy registry for the optional AI enrichment models.
+# Nothing is imported or downloaded until a model is first requested, and
+# only models enabled in config are ever created. Load times are recorded
+# so the run can report what each model cost.
+
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional
+
+# name -> (transformers pipeline task, model id)
+MODEL_SPECS = {
+    "summarizer": ("summarization", "facebook/bart-large-cnn"),
+    "translator": ("translation", "Helsinki-NLP/opus-mt-en-hi"),
+    "skill_extractor": ("text2text-generation", "google/flan-t5-small"),
+    "faq_generator": ("text2text-generation", "google/flan-t5-small"),
+}
+
+
+class ModelRegistry:
+    """Create transformer pipelines on first use; disabled or failed models return None."""
+
+    def __init__(self, enabled: Iterable[str], specs: Optional[Dict[str, tuple]] = None):
+        self.specs = dict(specs or MODEL_SPECS)
+        self.enabled = set(enabled)
+        unknown = self.enabled - set(self.specs)
+        if unknown:
+            logging.warning(f"⚠️ Unknown AI models in config ignored: {', '.join(sorted(unknown))}")
+        self._models: Dict[str, Any] = {}
+        self._failed = set()
+        self.load_seconds: Dict[str, float] = {}
+
+    def is_enabled(self, name: str) -> bool:
+        return name in self.enabled and name in self.specs and name not in self._failed
+
+    def get(self, name: str):
+        """Return the pipeline for name, loading it now if needed."""
+        if name in self._models:
+            return self._models[name]
+        if not self.is_enabled(name):
+            return None
+        task, model_id = self.specs[name]
+        start = time.perf_counter()
+        try:
+            from transformers import pipeline
+
+            self._models[name] = pipeline(task, model=model_id)
+        except Exception as e:
+            self._failed.add(name)
+            logging.warning(f"⚠️ Could not load {name} ({model_id}): {e}")
+            return None
+        self.load_seconds[name] = time.perf_counter() - start
+        logging.info(f"🧠 Loaded {name} ({model_id}) in {self.load_seconds[name]:.1f}s")
+        return self._models[name]
+
+    def report(self) -> str:
+        if not self.load_seconds and not self._failed:
+            return "AI models: none loaded"
+        parts = [f"{name} {secs:.1f}s" for name, secs in self.load_seconds.items()]
+        parts += [f"{name} failed" for name in sorted(self._failed)]
+        return "AI models: " + ", ".join(parts)
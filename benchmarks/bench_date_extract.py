@@ -0,0 +1,96 @@
+"""
+Micro-benchmark: date_extract.extract_last_date vs. the previous regex +
+dateutil implementation.
+
+Usage:
+    python benchmarks/bench_date_extract.py [notification.txt ...]
+
+Without arguments it uses the extracted PDF texts in the local PDF store
+(.cache/pdfs) if any, plus benchmarks/fixtures/notification_sample.txt.
+"""
+
+import glob
+import os
+import re
+import sys
+import timeit
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from dateutil import parser as dateparser  # noqa: E402
+
+from date_extract import extract_last_date, parse_date  # noqa: E402
+
+# Fixed "today" so the sample's 2025 dates still count as upcoming.
+# The "expired" scenario (no upcoming date) forces a full scan of every candidate.
+SCENARIOS = {"upcoming": date(2025, 6, 1), "expired": date(2030, 1, 1)}
+TODAY = SCENARIOS["upcoming"]
+
+
+def legacy_extract_last_date(text, today=TODAY):
+    """The implementation extract_last_date replaced (patterns recompiled per call)."""
+    patterns = [
+        r"(?:last\s*date|apply\s*before|closing\s*date|last\s*day|deadline)[^\n:]*[:\-]?\s*([\d]{1,2}[\/\-][\d]{1,2}[\/\-][\d]{2,4})",
+        r"([\d]{1,2}[\/\-][\d]{1,2}[\/\-][\d]{2,4})",
+        r"(?:last\s*date|apply\s*before|closing\s*date|last\s*day|deadline)[^\n:]*[:\-]?\s*([A-Za-z]{3,9}\s+\d{1,2},?\s+\d{4})",
+        r"([A-Za-z]{3,9}\s+\d{1,2},?\s+\d{4})"
+    ]
+    for pattern in patterns:
+        for match in re.findall(pattern, text, re.IGNORECASE):
+            try:
+                dt = dateparser.parse(match, dayfirst=True, fuzzy=True)
+                if dt and dt.date() >= today:
+                    return str(dt.date())
+            except Exception:
+                continue
+    return "Not Specified"
+
+
+def legacy_per_line(text, today=TODAY):
+    """Old parse_pdf_for_job_info fallback: one extract_last_date call per line."""
+    for line in text.splitlines():
+        found = legacy_extract_last_date(line, today)
+        if found != "Not Specified":
+            return found
+    return "Not Specified"
+
+
+def load_texts(paths):
+    if not paths:
+        paths = glob.glob(os.path.join(ROOT, ".cache", "pdfs", "*", "*.txt"))
+        paths.append(os.path.join(ROOT, "benchmarks", "fixtures", "notification_sample.txt"))
+    texts = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            texts.append(f.read())
+    return texts
+
+
+def bench(label, fn, texts, number):
+    seconds = min(timeit.repeat(lambda: [fn(t) for t in texts], number=number, repeat=3)) / number
+    print(f"{label:<38} {seconds * 1000:8.2f} ms/run")
+    return seconds
+
+
+def main(argv):
+    texts = load_texts(argv)
+    size = sum(len(t) for t in texts)
+    print(f"{len(texts)} documents, {size / 1024:.1f} KiB of text\n")
+
+    for name, today in SCENARIOS.items():
+        print(f"[{name}: today={today}]")
+        old = bench("legacy extract_last_date (whole doc)", lambda t: legacy_extract_last_date(t, today), texts, 10)
+        old_lines = bench("legacy per-line PDF fallback", lambda t: legacy_per_line(t, today), texts, 3)
+        parse_date.cache_clear()
+        new = bench("date_extract.extract_last_date", lambda t: extract_last_date(t, today=today), texts, 10)
+        print(f"speedup vs whole-doc legacy: {old / new:.1f}x, vs per-line fallback: {old_lines / new:.1f}x")
+        print("results (legacy / per-line / new):")
+        for text in texts:
+            print(f"  {legacy_extract_last_date(text, today)} / {legacy_per_line(text, today)} / "
+                  f"{extract_last_date(text, today=today)}")
+        print()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,392 @@
+"""
+Local replay server for the portal fixtures used by the benchmark suite.
+
+Every site in PRIVATE_SOURCES and PORTALS is served from its own port on
+127.0.0.1, so relative links and per-host concurrency limits behave as they
+do against the live sites. Absolute links back to a replayed site are
+rewritten to its local address; links to other hosts are left alone.
+
+Pages come from recordings under benchmarks/fixtures/sites/<host>/ when one
+exists, otherwise from a deterministic synthetic site (listing page, detail
+pages with dates and official links, notification PDFs) so the suite runs
+without any recording.
+
+Record the live sites (listing pages, a sample of detail pages and PDFs):
+    python benchmarks/fixture_server.py record [--details 20]
+Serve the fixtures for manual poking:
+    python benchmarks/fixture_server.py serve
+"""
+
+import argparse
+import hashlib
+import http.server
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SITES_DIR = os.path.join(ROOT, "benchmarks", "fixtures", "sites")
+PAGES_FILE = "pages.json"
+
+# A site is {path_with_query: (body, content_type)}
+Site = Dict[str, Tuple[bytes, str]]
+
+HTML = "text/html; charset=utf-8"
+PDF = "application/pdf"
+
+
+def site_key(url: str) -> Tuple[str, str]:
+    """(host, path?query) of a URL, as used to store and look up fixture pages."""
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    return parts.netloc.lower(), path + ("?" + parts.query if parts.query else "")
+
+
+# =======================
+# Recorded fixtures
+# =======================
+
+def load_recorded(host: str) -> Optional[Site]:
+    folder = os.path.join(SITES_DIR, host)
+    try:
+        with open(os.path.join(folder, PAGES_FILE), encoding="utf-8") as f:
+            pages = json.load(f)
+    except FileNotFoundError:
+        return None
+    site = {}
+    for path, entry in pages.items():
+        with open(os.path.join(folder, entry["file"]), "rb") as f:
+            site[path] = (f.read(), entry["content_type"])
+    return site
+
+
+def save_recorded(host: str, site: Site):
+    folder = os.path.join(SITES_DIR, host)
+    os.makedirs(folder, exist_ok=True)
+    pages = {}
+    for path, (body, content_type) in sorted(site.items()):
+        ext = ".pdf" if content_type.startswith(PDF) else ".html"
+        name = hashlib.sha1(path.encode("utf-8")).hexdigest()[:16] + ext
+        with open(os.path.join(folder, name), "wb") as f:
+            f.write(body)
+        pages[path] = {"file": name, "content_type": content_type}
+    with open(os.path.join(folder, PAGES_FILE), "w", encoding="utf-8") as f:
+        json.dump(pages, f, indent=1)
+
+
+def record(details_per_site: int = 20):
+    """Fetch the live listing pages, a sample of their detail pages and the PDFs those link to."""
+    import fetch_jobs as fj
+    from bs4 import BeautifulSoup
+
+    sites: Dict[str, Site] = {}
+
+    def keep(result, url):
+        if result.ok:
+            content_type = result.headers.get("content-type", PDF if fj.is_pdf_link(url) else HTML)
+            host, path = site_key(url)
+            sites.setdefault(host, {})[path] = (result.content, content_type)
+        else:
+            print(f"  failed {url}: {result.error}")
+
+    urls = list(fj.PRIVATE_SOURCES) + [portal["url"] for portal in fj.PORTALS]
+    listings = fj.fetch_pages(urls, verify_ssl=False)
+    details = []
+    for site in fj.PRIVATE_SOURCES:
+        res = listings[site]
+        keep(res, site)
+        if res.ok:
+            links = fj.parse_listing_page(site, res.content, res.encoding, "html.parser")
+            details += [link for _, link in links[:details_per_site]]
+    for portal in fj.PORTALS:
+        keep(listings[portal["url"]], portal["url"])
+    pdfs = []
+    pages = fj.fetch_pages(details, verify_ssl=False)
+    for url, res in pages.items():
+        keep(res, url)
+        if res.ok:
+            soup = BeautifulSoup(res.content, "html.parser")
+            pdfs += [a["href"] for a in soup.find_all("a", href=True) if fj.is_pdf_link(a["href"])][:1]
+    for url, res in fj.fetch_pages([u for u in pdfs if u.startswith("http")], verify_ssl=False).items():
+        keep(res, url)
+    for host, site in sites.items():
+        save_recorded(host, site)
+        print(f"recorded {len(site):4d} pages for {host}")
+
+
+# =======================
+# Synthetic fixtures
+# =======================
+
+ORGS = [
+    ("SSC", "ssc.nic.in"), ("UPSC", "upsc.gov.in"), ("RRB", "indianrailways.gov.in"),
+    ("IBPS", "ibps.in"), ("SBI", "sbi.co.in"), ("Bihar Police", "csbc.bih.nic.in"),
+    ("UPPSC", "uppsc.up.nic.in"), ("Rajasthan Police", "police.rajasthan.gov.in"),
+    ("KVS", "kvsangathan.nic.in"), ("DSSSB", "dsssb.delhi.gov.in"), ("Indian Navy", "joinindiannavy.gov.in"),
+    ("ISRO", "isro.gov.in"), ("MPPSC", "mppsc.mp.gov.in"), ("HSSC", "hssc.gov.in"), ("AIIMS", "aiims.edu"),
+]
+POSTS = [
+    "CGL", "CHSL", "Constable", "Sub Inspector", "Teacher", "PGT Teacher", "Clerk", "PO", "Group D",
+    "Assistant", "Junior Engineer", "Stenographer", "Staff Nurse", "Apprentice", "Technician",
+]
+TITLE_FORMS = [
+    "{org} {post} Recruitment {year} - {n} Posts",
+    "{org} {post} Vacancy {year} Apply Online for {n} Posts",
+    "{org} {post} {year} Notification Out for {n} Post",
+    "{org} Recruitment {year} for {n} {post} Posts",
+]
+FILLER = (
+    "Candidates who are interested in the vacancy and have completed all the eligibility criteria "
+    "can read the notification and apply online. Age limit, educational qualification, selection "
+    "process, application fee and pay scale details are given below. "
+)
+
+
+def make_pdf(lines: List[str], extra_pages: int = 0) -> bytes:
+    """
+    A minimal PDF with one line of Helvetica text per entry on the first
+    page, followed by `extra_pages` pages of filler (annexures, syllabus).
+    """
+    def esc(s):
+        return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    def content(page_lines):
+        stream = "BT /F1 10 Tf 40 800 Td 13 TL " + " ".join(f"({esc(line)}) Tj T*" for line in page_lines) + " ET"
+        return f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream"
+
+    pages = [lines] + [[f"Annexure {n}"] + [FILLER[:90]] * 55 for n in range(1, extra_pages + 1)]
+    first_page = 4  # objects 1-3: catalog, page tree, font; then a page and its content stream per page
+    kids = " ".join(f"{first_page + 2 * n} 0 R" for n in range(len(pages)))
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for n, page_lines in enumerate(pages):
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> "
+            f"/Contents {first_page + 2 * n + 1} 0 R >>"
+        )
+        objects.append(content(page_lines))
+    out, offsets = b"%PDF-1.4\n", []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+def _page(title: str, body: str) -> bytes:
+    nav = "".join(f'<li><a href="/{p}">{p.title()}</a></li>' for p in ("about", "contact", "privacy", "admit-card"))
+    return (
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{title}</title></head>"
+        f"<body><header><ul class='nav'>{nav}</ul></header><main>{body}</main>"
+        f"<footer><p>Copyright {date.today().year}. All rights reserved.</p></footer></body></html>"
+    ).encode("utf-8")
+
+
+def _notifications(rng: random.Random, count: int, today: date):
+    """(title, org domain, last date) triples; about a fifth have already closed."""
+    items = []
+    for _ in range(count):
+        org, domain = rng.choice(ORGS)
+        title = rng.choice(TITLE_FORMS).format(
+            org=org, post=rng.choice(POSTS), year=today.year + rng.choice((0, 0, 1)), n=rng.randint(5, 9000)
+        )
+        last = today + timedelta(days=rng.randint(-20, 80))
+        items.append((title, domain, last))
+    return items
+
+
+def synthetic_private(url: str, jobs: int, today: date) -> Site:
+    """An aggregator: a listing page linking to `jobs` detail pages, a third of them with a PDF."""
+    host, listing_path = site_key(url)
+    base = f"{urlsplit(url).scheme}://{host}"
+    rng = random.Random(host)
+    site: Site = {}
+    rows = []
+    for i, (title, domain, last) in enumerate(_notifications(rng, jobs, today)):
+        slug = "-".join(title.lower().split())[:70]
+        path = f"/{today.year}/{slug}-{i}.html"
+        rows.append(f'<tr><td><a href="{base}{path}">{title}</a></td><td>{last:%d/%m/%Y}</td></tr>')
+        body = (
+            f"<h1>{title}</h1>"
+            + "".join(f"<p>{FILLER}</p>" for _ in range(rng.randint(2, 6)))
+            + f"<table><tr><td>Application Begin</td><td>{last - timedelta(days=30):%d/%m/%Y}</td></tr>"
+            f"<tr><td>Last Date for Apply Online</td><td>{last:%d/%m/%Y}</td></tr></table>"
+            f'<p><a href="https://{domain}/recruitment/{i}">Official Website</a></p>'
+        )
+        if i % 3 == 0:
+            pdf_path = f"/notifications/{slug[:40]}-{i}.pdf"
+            body += f'<p><a href="{base}{pdf_path}">Download Notification</a></p>'
+            site[pdf_path] = (make_pdf([
+                title, f"Advertisement No. {i}/{today.year}", f"Department of {domain.split('.')[0].upper()}",
+                f"Apply online at https://{domain}/apply", f"Last date: {last:%d/%m/%Y}",
+            ] + [FILLER[:90]] * 20, extra_pages=2 + i % 11), PDF)
+        site[path] = (_page(title, body), HTML)
+    site[listing_path] = (_page("Latest Govt Jobs", "<table>" + "".join(rows) + "</table>"), HTML)
+    return site
+
+
+# The synthetic notice board doesn't reproduce a portal's own markup, so
+# replayed portals are pointed at it with this selector instead of theirs.
+SYNTHETIC_PORTAL_SELECTOR = "table a[href]"
+
+
+def synthetic_portal(portal: Dict, notices: int, today: date) -> Site:
+    """An official portal: a notice board table linking to advertisements."""
+    host, path = site_key(portal["url"])
+    rng = random.Random(host)
+    date_format = rng.choice(("%d-%m-%Y", "%d-%m-%Y", "%Y-%m-%d"))  # some boards print ISO dates
+    rows = []
+    for i, (title, _, last) in enumerate(_notifications(rng, notices, today)):
+        rows.append(
+            f'<tr><td><a href="/writereaddata/advt-{i}.pdf">{title}</a></td>'
+            f"<td>Last date: {last.strftime(date_format)}</td></tr>"
+        )
+    return {path: (_page(portal["name"], "<h2>What's New</h2><table>" + "".join(rows) + "</table>"), HTML)}
+
+
+def build_sites(private_sources, portals, jobs_per_site=25, notices_per_portal=15) -> Dict[str, Site]:
+    """{host: site} for every source, recorded where available, synthetic otherwise."""
+    today = date.today()
+    sites: Dict[str, Site] = {}
+    for url in private_sources:
+        host = site_key(url)[0]
+        sites[host] = load_recorded(host) or synthetic_private(url, jobs_per_site, today)
+    for portal in portals:
+        host = site_key(portal["url"])[0]
+        if host in sites:
+            continue
+        sites[host] = load_recorded(host) or synthetic_portal(portal, notices_per_portal, today)
+    return sites
+
+
+# =======================
+# Server
+# =======================
+
+class FixtureServer:
+    """One local HTTP server per replayed host; map() turns a live URL into its local one."""
+
+    def __init__(self, sites: Dict[str, Site], latency: float = 0.0):
+        self.sites = sites
+        self.latency = latency
+        self.requests = 0
+        self.bases: Dict[str, str] = {}
+        self._servers = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        for host in self.sites:
+            server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self._handler(host))
+            server.daemon_threads = True
+            self._servers.append(server)
+            self.bases[host] = f"http://127.0.0.1:{server.server_address[1]}"
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        # Longest hosts first so "www.x.com" is not clobbered by a rewrite of "x.com"
+        self._rewrites = []
+        for host in sorted(self.bases, key=len, reverse=True):
+            for scheme in ("https://", "http://"):
+                self._rewrites.append(((scheme + host).encode(), self.bases[host].encode()))
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+    def map(self, url: str) -> str:
+        host, path = site_key(url)
+        return self.bases[host] + path if host in self.bases else url
+
+    def _body(self, host: str, path: str) -> Optional[Tuple[bytes, str]]:
+        page = self.sites[host].get(path)
+        if page is None:
+            return None
+        body, content_type = page
+        if content_type.startswith("text/html"):
+            for old, new in self._rewrites:
+                body = body.replace(old, new)
+        return body, content_type
+
+    def _handler(self, host: str):
+        fixture = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with fixture._lock:
+                    fixture.requests += 1
+                if fixture.latency:
+                    time.sleep(fixture.latency)
+                page = fixture._body(host, self.path)
+                if page is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body, content_type = page
+                etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="record the live sites into benchmarks/fixtures/sites")
+    rec.add_argument("--details", type=int, default=20, help="detail pages recorded per aggregator")
+    sub.add_parser("serve", help="serve the fixtures until interrupted")
+    args = parser.parse_args(argv)
+
+    from fetch_jobs import PRIVATE_SOURCES
+    from portals import PORTALS
+    if args.command == "record":
+        record(args.details)
+        return
+    with FixtureServer(build_sites(PRIVATE_SOURCES, PORTALS)) as server:
+        for url in list(PRIVATE_SOURCES) + [p["url"] for p in PORTALS]:
+            print(f"{server.map(url):<40} {url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,372 @@
+"""
+Offline benchmark suite: the scraper pipeline and its hot helpers, replayed
+against local portal fixtures (see fixture_server.py) instead of the 38 live
+sites, compared with a stored baseline.
+
+Benchmarks:
+  pipeline.cold   a full fetch_jobs.main() run: portals -> dedupe -> enrich
+                  (models disabled) -> save_jobs -> delete_expired_jobs ->
+                  publish, on empty caches
+  pipeline.warm   the same run again with the caches and jobs/ it left
+                  (the incremental path a scheduled run usually takes)
+  micro.*         extract_last_date, find_official_link, extract_pdf_text
+                  and slugify over the fixture pages and PDFs, plus
+                  extract_last_date accuracy on the DATE_CASES snippets
+  categorizer.*   job category / state accuracy on the hand-labelled test
+                  titles in fixtures/categories_test.json, which were used
+                  neither to write the keyword rules nor to train the
+                  classifier: rules + classifier as published (State PSC
+                  per state), the rules alone and the classifier alone;
+                  plus batch throughput
+
+Usage:
+    python benchmarks/run_benchmarks.py                  # run and compare with the baseline
+    python benchmarks/run_benchmarks.py --save-baseline  # record the current numbers as the baseline
+    python benchmarks/run_benchmarks.py --only micro --micro-tolerance 0.5
+
+Exits with status 1 if a metric regressed by more than the tolerance. The
+baseline is machine specific: record it on the machine that runs the
+comparison. Micro-benchmark throughputs are the exception: each is also
+stored relative to a fixed reference loop timed next to it in the same run,
+and compared that way (with --micro-tolerance), so a baseline from another
+machine doesn't fail the gate.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+import categorizer  # noqa: E402
+import date_extract  # noqa: E402
+import fetch_jobs as fj  # noqa: E402
+from fixture_server import (  # noqa: E402
+    PDF, SYNTHETIC_PORTAL_SELECTOR, FixtureServer, build_sites, load_recorded, site_key,
+)
+from metrics import METRICS, peak_rss_bytes  # noqa: E402
+
+BASELINE_FILE = os.path.join(ROOT, "benchmarks", "baseline.json")
+MIB = 1024 * 1024
+
+# The live sources, before configure() points fetch_jobs at the fixture server
+ORIGINAL_SOURCES = list(fj.PRIVATE_SOURCES)
+ORIGINAL_PORTALS = list(fj.PORTALS)
+
+# (text, expected extract_last_date result) as of DATE_CASES_TODAY
+DATE_CASES_TODAY = date(2025, 1, 1)
+DATE_CASES = [
+    ("Last Date: 25/12/2025", "2025-12-25"),
+    ("Last date for apply online 05-03-25", "2025-03-05"),
+    ("Last Date 2025-12-25", "2025-12-25"),
+    ("Closing date: 2025/06/30", "2025-06-30"),
+    ("Published 2025-02-01. Last date 2025-03-15", "2025-03-15"),
+    ("Apply before December 25, 2025", "2025-12-25"),
+    ("Last date 25th Dec 2025", "2025-12-25"),
+    ("अंतिम तिथि 25 दिसंबर 2025", "2025-12-25"),
+    ("Application Begin 01/02/2025 Last Date 28/02/2025", "2025-02-28"),
+    ("Advt No. 12025-12-25 dated 2024", "Not Specified"),
+    ("Last date was 15/11/2024", "Not Specified"),
+    ("Last date: 15.03.2025", "2025-03-15"),
+    ("Notice No. 1.2.2026 regarding Last date 20 March 2025", "2025-03-20"),
+    ("Ref 12.05.25/Estt. Closing on 30 June 2025", "2025-06-30"),
+]
+
+
+class Results:
+    """Benchmark metrics: {name: {"value", "unit", "better": "lower" | "higher"}}."""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def add(self, name, value, unit, better, relative=None):
+        self.metrics[name] = {"value": round(value, 4), "unit": unit, "better": better}
+        if relative is not None:
+            self.metrics[name]["relative"] = float(f"{relative:.5g}")
+        print(f"  {name:<40} {value:>12.2f} {unit}" + (f"  ({relative:.4g}x reference)" if relative else ""))
+
+
+# =======================
+# Pipeline
+# =======================
+
+def replayed_portal(portal, server):
+    """The portal pointed at the fixture server (with the synthetic board's selector if not recorded)."""
+    replayed = dict(portal, url=server.map(portal["url"]))
+    if portal.get("selector") and load_recorded(site_key(portal["url"])[0]) is None:
+        replayed["selector"] = SYNTHETIC_PORTAL_SELECTOR
+    return replayed
+
+
+def configure(server, workdir):
+    """Point fetch_jobs at the fixture server and a scratch working directory."""
+    os.chdir(workdir)
+    fj.PRIVATE_SOURCES = [server.map(url) for url in ORIGINAL_SOURCES]
+    fj.PORTALS = [replayed_portal(portal, server) for portal in ORIGINAL_PORTALS]
+    fj.AI_MODELS = []          # keep runs download-free; enrichment uses its non-model fallbacks
+    fj.ENABLE_DONUT = False
+    fj.TELEGRAM_BOT_TOKEN = None
+
+
+def run_pipeline():
+    """One scheduled run (fetch_jobs.main) against the fixtures; returns the number of jobs."""
+    fj.main()
+    return METRICS.gauges["jobs_scraped"][()]
+
+
+def http_requests():
+    return sum(METRICS.counters.get("http_requests_total", {}).values())
+
+
+def bench_pipeline(results, sites, latency):
+    workdir = tempfile.mkdtemp(prefix="sarkari-bench-")
+    cwd = os.getcwd()
+    try:
+        with FixtureServer(sites, latency=latency) as server:
+            configure(server, workdir)
+            for name in ("cold", "warm"):
+                requests_before, served_before = http_requests(), server.requests
+                start = time.perf_counter()
+                jobs = run_pipeline()
+                seconds = time.perf_counter() - start
+                print(f"pipeline.{name}: {jobs} jobs, {http_requests() - requests_before:.0f} requests "
+                      f"({server.requests - served_before} reached the server)")
+                results.add(f"pipeline.{name}.seconds", seconds, "s", "lower")
+                results.add(f"pipeline.{name}.jobs_per_second", jobs / seconds, "jobs/s", "higher")
+        results.add("pipeline.peak_rss", peak_rss_bytes() / MIB, "MiB", "lower")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# =======================
+# Micro-benchmarks
+# =======================
+
+# Fixed pure-Python string work, timed next to every micro-benchmark throughput
+REFERENCE_ITEMS = [f"Recruitment {n} for the Posts of Clerk, Typist & Driver / 2025" for n in range(500)]
+
+
+def reference_loop(text):
+    return text.lower().replace(" ", "-").replace("/", "-").split("-")[0] + text.title()
+
+
+def relative_throughput(fn, items, repeat=7):
+    """
+    (items per second, the same relative to the reference loop) for fn
+    applied to every item: the best of `repeat` rounds, and the median of the
+    per-round ratios. Each round times the reference right before fn, so slow
+    stretches of the machine hit both; each sample loops until it takes at
+    least 0.2 s (Timer.autorange), so fast functions aren't timed over a few
+    milliseconds of noise.
+    """
+    reference = timeit.Timer(lambda: [reference_loop(i) for i in REFERENCE_ITEMS])
+    timer = timeit.Timer(lambda: [fn(i) for i in items])
+    ref_number, _ = reference.autorange()
+    number, _ = timer.autorange()
+    rates, ratios = [], []
+    for _ in range(repeat):
+        ref_rate = len(REFERENCE_ITEMS) * ref_number / reference.timeit(ref_number)
+        rates.append(len(items) * number / timer.timeit(number))
+        ratios.append(rates[-1] / ref_rate)
+    return max(rates), statistics.median(ratios)
+
+
+def allocation_peak(fn, items):
+    """Peak Python heap allocated while processing every item once, in KiB."""
+    tracemalloc.start()
+    for item in items:
+        fn(item)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def pdf_backend():
+    for module in ("fitz", "pdfplumber"):
+        try:
+            __import__(module)
+            return module
+        except ImportError:
+            continue
+    return None
+
+
+def link_titles(sites):
+    """Anchor texts of every fixture page (the titles a listing page offers)."""
+    parser = fj.resolve_parser(fj.HTML_PARSER)
+    soups = [BeautifulSoup(body, parser) for site in sites.values()
+             for body, kind in site.values() if kind.startswith("text/html")]
+    return [t for t in (a.get_text(strip=True) for soup in soups for a in soup.find_all("a", href=True)) if t]
+
+
+def bench_micro(results, sites):
+    pages = [body for site in sites.values() for body, kind in site.values() if kind.startswith("text/html")]
+    pdfs = [body for site in sites.values() for body, kind in site.values() if kind.startswith(PDF)]
+    soups = [BeautifulSoup(body, fj.resolve_parser(fj.HTML_PARSER)) for body in pages]
+    texts = [soup.get_text(separator="\n") for soup in soups]
+    titles = [a.get_text(strip=True) for soup in soups for a in soup.find_all("a", href=True)]
+    titles = [t for t in titles if t] or ["SSC CGL Recruitment 2025"]
+    print(f"micro: {len(pages)} pages, {len(pdfs)} PDFs, {len(titles)} link titles")
+
+    def extract(text):
+        date_extract.parse_date.cache_clear()  # every document is new in a real run
+        return date_extract.extract_last_date(text)
+
+    value, relative = relative_throughput(extract, texts)
+    results.add("micro.extract_last_date.docs_per_second", value, "docs/s", "higher", relative)
+    found = [date_extract.extract_last_date(text, DATE_CASES_TODAY) for text, _ in DATE_CASES]
+    for (text, expected), got in zip(DATE_CASES, found):
+        if got != expected:
+            print(f"    {text!r}: {got} (expected {expected})")
+    results.add("micro.extract_last_date.accuracy",
+                100 * sum(got == expected for (_, expected), got in zip(DATE_CASES, found)) / len(DATE_CASES),
+                "%", "higher")
+    value, relative = relative_throughput(lambda soup: fj.find_official_link(soup, ""), soups)
+    results.add("micro.find_official_link.pages_per_second", value, "pages/s", "higher", relative)
+    value, relative = relative_throughput(fj.slugify, titles)
+    results.add("micro.slugify.titles_per_second", value, "titles/s", "higher", relative)
+
+    backend = pdf_backend()
+    if not backend or not pdfs:
+        print("  micro.extract_pdf_text skipped (no PyMuPDF/pdfplumber or no PDFs)")
+        return
+    folder = tempfile.mkdtemp(prefix="sarkari-bench-pdf-")
+    try:
+        paths = []
+        for i, body in enumerate(pdfs):
+            paths.append(os.path.join(folder, f"{i}.pdf"))
+            with open(paths[-1], "wb") as f:
+                f.write(body)
+        value, relative = relative_throughput(fj.extract_pdf_text, paths, repeat=5)
+        results.add("micro.extract_pdf_text.pdfs_per_second", value, "pdfs/s", "higher", relative)
+        results.add("micro.extract_pdf_text.peak_alloc",
+                    allocation_peak(fj.extract_pdf_text, paths), "KiB", "lower")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def bench_categorizer(results, sites):
+    gold = categorizer.load_labelled(categorizer.TEST_FILE)
+    model = fj.get_categorizer()
+    predicted = model.classify([g["title"] for g in gold])
+    expected = [categorizer.published_category(g["category"], g["state"]) for g in gold]
+    misses = [(g, p, e) for g, p, e in zip(gold, predicted, expected) if p[0] != e]
+    rule_hits = sum((categorizer.rule_category(g["title"])[0] or categorizer.GENERAL) == g["category"] for g in gold)
+    model_hits = sum(model.predict(g["title"])[0] == g["category"] for g in gold)
+    print(f"categorizer: {len(gold)} held-out labelled titles, {len(model.weights)} model features")
+    for g, p, e in misses:
+        print(f"    {g['title'][:60]!r}: {p[0]} (expected {e})")
+    results.add("categorizer.accuracy", 100 * (1 - len(misses) / len(gold)), "%", "higher")
+    results.add("categorizer.state_accuracy",
+                100 * sum(p[1] == g["state"] for g, p in zip(gold, predicted)) / len(gold), "%", "higher")
+    results.add("categorizer.rules_accuracy", 100 * rule_hits / len(gold), "%", "higher")
+    results.add("categorizer.model_accuracy", 100 * model_hits / len(gold), "%", "higher")
+    # Distinct titles, so classify() cannot answer repeats from its per-batch memo
+    titles = list(dict.fromkeys(link_titles(sites) + [g["title"] for g in gold]))
+    titles = [f"{title} {n}" for n in range(max(1, 20000 // len(titles))) for title in titles]
+    seconds = min(timeit.repeat(lambda: model.classify(titles), number=1, repeat=3))
+    results.add("categorizer.titles_per_second", len(titles) / seconds, "titles/s", "higher")
+
+
+# =======================
+# Baseline comparison
+# =======================
+
+def compare(current, baseline, tolerance, relative_tolerance):
+    """
+    Print current vs baseline; return the names of metrics worse by more than
+    `tolerance`. Metrics measured relative to the reference loop on both sides
+    are compared by that ratio, against `relative_tolerance`.
+    """
+    regressions = []
+    print(f"\n{'metric':<42} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, metric in current.items():
+        base = baseline.get("metrics", {}).get(name)
+        if not base or not base["value"]:
+            print(f"{name:<42} {'-':>12} {metric['value']:>12.2f} {'new':>8}")
+            continue
+        relative = "relative" in metric and base.get("relative")
+        if relative:
+            change = metric["relative"] / base["relative"] - 1
+        else:
+            change = metric["value"] / base["value"] - 1
+        worse = -change if metric["better"] == "higher" else change
+        flag = " vs reference" if relative else ""
+        if worse > (relative_tolerance if relative else tolerance):
+            regressions.append(name)
+            flag += "  REGRESSION"
+        print(f"{name:<42} {base['value']:>12.2f} {metric['value']:>12.2f} {change:>+8.0%}{flag}")
+    return regressions
+
+
+def machine():
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Offline scraper benchmarks against recorded portal fixtures.")
+    parser.add_argument("--only", choices=("pipeline", "micro", "categorizer"), help="run one group of benchmarks")
+    parser.add_argument("--jobs-per-site", type=int, default=25, help="detail pages per synthetic aggregator")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds the fixture server waits per request")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--micro-tolerance", type=float, default=0.4,
+                        help="allowed slowdown of micro-benchmark throughputs relative to the reference loop")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show the scraper's own log output")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.CRITICAL)
+    sites = build_sites(ORIGINAL_SOURCES, ORIGINAL_PORTALS, jobs_per_site=args.jobs_per_site)
+    results = Results()
+    if args.only in (None, "pipeline"):
+        bench_pipeline(results, sites, args.latency)
+    if args.only in (None, "micro"):
+        bench_micro(results, sites)
+    if args.only in (None, "categorizer"):
+        bench_categorizer(results, sites)
+
+    report = {"machine": machine(), "metrics": results.metrics}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    if baseline.get("machine") != report["machine"]:
+        print("\nNote: the baseline was recorded on a different machine/Python; expect noise")
+    regressions = compare(results.metrics, baseline, args.tolerance, args.micro_tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed beyond the tolerance: {', '.join(regressions)}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
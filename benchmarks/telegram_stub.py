@@ -0,0 +1,277 @@
+"""
+Local stand-in for the Telegram Bot API, and checks of TelegramDispatcher
+against it.
+
+The stub accepts POST /bot<token>/sendMessage, records every message and
+answers like Telegram does: {"ok": true, ...}, or a 429 with
+parameters.retry_after / a 400 / a 5xx when told to. The checks drive the
+real dispatcher over HTTP with a simulated clock, so rate limiting and
+back-off cost no wall time:
+
+  digests     40 jobs are packed into 15-job digests under 4096 characters;
+              over-long fields are clipped before escaping, so the
+              MarkdownV2 stays well-formed
+  retry_after a 429 is retried after exactly the server's retry_after
+  errors      a 5xx is retried with back-off; a 400 is given up at once
+              and its jobs stay out of the outbox
+  outbox      jobs already announced are not sent again, in the same run
+              or after the outbox is reloaded from disk
+
+Usage:
+    python benchmarks/telegram_stub.py [check]  # run the checks (exit status 1 on failure)
+    python benchmarks/telegram_stub.py serve    # serve the stub; point TELEGRAM_API_BASE at it
+"""
+
+import argparse
+import http.server
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from telegram_dispatch import MAX_MESSAGE_CHARS, Outbox, TelegramDispatcher, escape_link  # noqa: E402
+
+TOKEN = "123:stub"
+CHAT_ID = "-100123"
+
+
+class TelegramStub:
+    """Telegram Bot API stand-in on 127.0.0.1; `messages` holds the sendMessage payloads it accepted."""
+
+    def __init__(self):
+        self.messages: List[Dict] = []
+        self.requests = 0
+        self._replies: List[tuple] = []  # queued (status, body) answers for the next requests
+        self._lock = threading.Lock()
+        self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def base(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self):
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def rate_limit(self, retry_after: int, times: int = 1):
+        """Answer the next `times` requests with 429 Too Many Requests."""
+        body = {"ok": False, "error_code": 429, "description": f"Too Many Requests: retry after {retry_after}",
+                "parameters": {"retry_after": retry_after}}
+        self._replies += [(429, body)] * times
+
+    def fail(self, status: int, times: int = 1):
+        """Answer the next `times` requests with an error status."""
+        self._replies += [(status, {"ok": False, "error_code": status, "description": "stub error"})] * times
+
+    def reset(self):
+        self.messages, self._replies, self.requests = [], [], 0
+
+    def _answer(self, path: str, payload: Dict):
+        with self._lock:
+            self.requests += 1
+            if path != f"/bot{TOKEN}/sendMessage":
+                return 404, {"ok": False, "error_code": 404, "description": "Not Found"}
+            if self._replies:
+                return self._replies.pop(0)
+            if not payload.get("chat_id") or not payload.get("text"):
+                return 400, {"ok": False, "error_code": 400, "description": "Bad Request: message text is empty"}
+            if len(payload["text"]) > MAX_MESSAGE_CHARS:
+                return 400, {"ok": False, "error_code": 400, "description": "Bad Request: message is too long"}
+            self.messages.append(payload)
+            return 200, {"ok": True, "result": {"message_id": len(self.messages), "text": payload["text"]}}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    payload = {}
+                status, body = stub._answer(self.path, payload)
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+class SimulatedClock:
+    """monotonic() / sleep() pair for the dispatcher: sleeping only advances the clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def jobs(start: int, count: int, title: str = "Junior Engineer (Civil) Recruitment") -> List[tuple]:
+    return [
+        (f"job-{n}", {"title": f"{title} {n}", "last_date": "2030-12-31",
+                      "summary": "Selection by written test and interview.",
+                      "apply_link": f"https://example.gov.in/advt/{n}.pdf"})
+        for n in range(start, start + count)
+    ]
+
+
+class Checks:
+    def __init__(self, stub: TelegramStub, folder: str):
+        self.stub = stub
+        self.folder = folder
+        self.failures = 0
+
+    def dispatcher(self, outbox_name: str = "outbox.json"):
+        clock = SimulatedClock()
+        dispatcher = TelegramDispatcher(TOKEN, CHAT_ID, Outbox(os.path.join(self.folder, outbox_name)),
+                                        api_base=self.stub.base, sleep=clock.sleep, clock=clock.time)
+        return dispatcher, clock
+
+    def expect(self, name: str, ok: bool, detail: str = ""):
+        print(f"  {'ok  ' if ok else 'FAIL'} {name}{'' if ok else ': ' + detail}")
+        self.failures += not ok
+
+    def digests(self):
+        print("digests")
+        self.stub.reset()
+        dispatcher, _ = self.dispatcher("digests.json")
+        sent = dispatcher.notify(jobs(0, 40))
+        texts = [m["text"] for m in self.stub.messages]
+        self.expect("40 jobs sent in 3 messages", sent == 40 and len(texts) == 3, f"{sent} jobs, {len(texts)} messages")
+        self.expect("every job appears once", all(sum(f"advt/{n}.pdf" in t for t in texts) == 1 for n in range(40)))
+        self.expect("MarkdownV2 to the configured chat",
+                    all(m["parse_mode"] == "MarkdownV2" and m["chat_id"] == CHAT_ID for m in self.stub.messages))
+        dispatcher.close()
+        self.stub.reset()
+        dispatcher, _ = self.dispatcher("long.json")
+        sent = dispatcher.notify(jobs(100, 15, title="Recruitment of Assistant Professors in various departments " * 8))
+        longest = max((len(m["text"]) for m in self.stub.messages), default=0)
+        self.expect("long jobs split under the 4096-character limit",
+                    sent == 15 and len(self.stub.messages) > 1 and longest <= MAX_MESSAGE_CHARS,
+                    f"{sent} jobs, {len(self.stub.messages)} messages, longest {longest}")
+        dispatcher.close()
+        self.stub.reset()
+        dispatcher, _ = self.dispatcher("escapes.json")
+        link = "https://example.gov.in/advt/(2025)/notice.pdf"
+        huge = {"title": "Post.No.1-(A)_" * 600, "summary": "[*]!" * 2000, "tags": ["a.b-c" * 50] * 6,
+                "last_date": "2030-12-31", "apply_link": link}
+        sent = dispatcher.notify([("job-huge", huge)])
+        text = self.stub.messages[0]["text"] if self.stub.messages else ""
+        self.expect("huge fields clipped before escaping",
+                    sent == 1 and len(text) <= MAX_MESSAGE_CHARS and f"[Apply Here]({escape_link(link)})" in text
+                    and all(line.count("*") % 2 == 0 for line in text.replace("\\*", "").split("\n")),
+                    f"{sent} jobs, {len(text)} characters")
+        dispatcher.close()
+
+    def retry_after(self):
+        print("retry_after")
+        self.stub.reset()
+        self.stub.rate_limit(retry_after=7)
+        dispatcher, clock = self.dispatcher("retry.json")
+        sent = dispatcher.notify(jobs(200, 3))
+        self.expect("message delivered after the 429", sent == 3 and len(self.stub.messages) == 1,
+                    f"{sent} jobs, {len(self.stub.messages)} messages")
+        self.expect("waited the server's retry_after", 7 in clock.sleeps and dispatcher.retries == 1,
+                    f"sleeps {clock.sleeps}, retries {dispatcher.retries}")
+        dispatcher.close()
+
+    def errors(self):
+        print("errors")
+        self.stub.reset()
+        self.stub.fail(502, times=2)
+        dispatcher, _ = self.dispatcher("errors.json")
+        sent = dispatcher.notify(jobs(300, 2))
+        self.expect("5xx retried with back-off", sent == 2 and dispatcher.retries == 2,
+                    f"{sent} jobs, {dispatcher.retries} retries")
+        dispatcher.close()
+        self.stub.reset()
+        self.stub.fail(400)
+        dispatcher, _ = self.dispatcher("bad.json")
+        sent = dispatcher.notify(jobs(400, 2))
+        self.expect("400 given up without retrying", sent == 0 and self.stub.requests == 1,
+                    f"{sent} jobs, {self.stub.requests} requests")
+        self.expect("unsent jobs stay out of the outbox", "job-400" not in dispatcher.outbox)
+        dispatcher.close()
+
+    def outbox(self):
+        print("outbox")
+        self.stub.reset()
+        dispatcher, _ = self.dispatcher("dedupe.json")
+        first = dispatcher.notify(jobs(500, 5) + jobs(500, 5))
+        again = dispatcher.notify(jobs(500, 7))
+        self.expect("duplicates in one batch sent once", first == 5, f"{first} jobs")
+        self.expect("announced jobs skipped in the same run", again == 2, f"{again} jobs")
+        dispatcher.close()
+        dispatcher, _ = self.dispatcher("dedupe.json")
+        later = dispatcher.notify(jobs(500, 8))
+        self.expect("announced jobs skipped after reloading the outbox", later == 1, f"{later} jobs")
+        self.expect("every job reached the chat exactly once",
+                    sum(len(m["text"].split("[Apply Here]")) - 1 for m in self.stub.messages) == 8)
+        dispatcher.close()
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("command", nargs="?", choices=("check", "serve"), default="check",
+                        help="run the checks against the stub (default) or serve it until interrupted")
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        with TelegramStub() as stub:
+            print(f"TELEGRAM_API_BASE={stub.base} TELEGRAM_BOT_TOKEN={TOKEN}")
+            try:
+                threading.Event().wait()
+            except KeyboardInterrupt:
+                pass
+            print(f"{len(stub.messages)} messages received")
+        return 0
+    logging.getLogger().setLevel(logging.CRITICAL)  # the checks print what matters
+    folder = tempfile.mkdtemp(prefix="telegram-stub-")
+    try:
+        with TelegramStub() as stub:
+            checks = Checks(stub, folder)
+            checks.digests()
+            checks.retry_after()
+            checks.errors()
+            checks.outbox()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    print(f"\n{checks.failures} check(s) failed" if checks.failures else "\nAll checks passed.")
+    return 1 if checks.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,376 @@
+# categorizer.py
+# Job category and state inference for scraped titles, a whole batch at a time.
+# Two layers:
+#   - rules: one compiled regex holding the keywords of every category
+#     (UPSC, state PSCs and selection boards, SSC, banks, railways, defence,
+#     ...); when several categories match, the one listed first in
+#     CATEGORIES wins, so "UPSC ... Nursing Officer" is UPSC, not Medical;
+#   - a linear (softmax) classifier over hashed word and word-pair features
+#     for titles no rule matches. It is trained on the hand-labelled titles
+#     in benchmarks/fixtures/categories.json and the jobs/*.json records
+#     (labelled by the rules where no hand label exists), with each title
+#     also seen with its matched keywords removed so the model learns the
+#     words around them ("Head Constable", "Loco Pilot"). Feature hashing
+#     keeps the model a small sparse table with no vocabulary to maintain.
+# The rules were written with categories.json in view, so the benchmark
+# scores rules and model on benchmarks/fixtures/categories_test.json
+# instead: hand-labelled job titles used neither to write the rules nor to
+# train the model (`train` leaves them out).
+# The state comes from state and city names or a state commission's acronym
+# in the title (BPSC -> Bihar), else "All India" for national recruiters.
+# State PSC jobs are published per state ("Bihar PSC") once it is known.
+#
+# Retrain after the job set has grown:  python categorizer.py train
+
+import argparse
+import glob
+import json
+import logging
+import math
+import os
+import random
+import re
+import sys
+import zlib
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+MODEL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "category_model.json")
+LABELS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "fixtures", "categories.json")
+TEST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "fixtures", "categories_test.json")
+GENERAL = "General"
+STATE_PSC = "State PSC"
+NO_STATE = "N/A"
+ALL_INDIA = "All India"
+BUCKETS = 2 ** 18          # hashed feature space
+MIN_CONFIDENCE = 0.5       # below this the classifier answers GENERAL
+EPOCHS = 12
+LEARNING_RATE = 0.3
+
+# Category -> keyword patterns (lowercase regex fragments), highest priority first
+CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    "UPSC": ("upsc", r"union public service commission"),
+    STATE_PSC: (
+        r"[a-z]{0,5}psc", r"public service commission", r"subordinate services? selection",
+        "dsssb", "rsmssb", "rssb", "upsssc", "uksssc", "hssc", "jssc", "ossc", "osssc", "bssc",
+        "gsssb", "psssb", "hpsssb", "jkssb", "mpesb", "vyapam",
+        # "<state> staff selection commission" is added below, once the state names are known
+    ),
+    "SSC": ("ssc", r"staff selection commission"),
+    "Banking": (
+        r"banks?", "banking", "ibps", "sbi", "rbi", "nabard", "sidbi", "bob", r"probationary officers?",
+        "बैंक",
+    ),
+    "Railway": (
+        r"railways?", "rail", "rrb", "rrc", "dfccil", "ircon", "rvnl", "irctc", r"loco pilots?",
+        "रेलवे",
+    ),
+    "Defence": (
+        "army", "navy", "naval", r"air ?force", "iaf", r"defen[cs]e", "drdo", "bsf", "crpf", "cisf", "itbp",
+        "ssb", r"assam rifles", r"coast guard", r"agniveer\w*", "agnipath", "nda", "cds", r"airm[ae]n",
+        "havildar", r"naib subedar", "ordnance", "capf", "सेना",
+    ),
+    "Police": (r"police", r"constables?", r"sub[ -]inspectors?", r"home guards?", "पुलिस"),
+    "Postal": (r"india post", "postal", "gds", r"gramin dak sevaks?", r"department of posts?", "postman",
+               r"mail guard"),
+    "Judiciary": (r"courts?", "judicial", "judiciary", r"judges?"),
+    "Medical": (
+        r"aiims", "esic", "jipmer", "pgimer", "nhm", "dmer", "nursing", r"nurses?", "medical", r"hospitals?",
+        "health", r"pharmacists?", r"doctors?", r"senior residents?", "cho", "anm", "gnm", "paramedical",
+    ),
+    "Education": (
+        r"teachers?", "teaching", r"schools?", "education", r"professors?", r"lecturers?", r"facult(?:y|ies)",
+        r"universit(?:y|ies)", r"colleges?", "principal", r"[a-z]?tet", "kvs", "nvs", r"vice[ -]chancellor",
+        "iit", "iiit", "nit", r"librarians?", "pgt", "tgt", "prt", "slst", "dsc", "शिक्षक",
+    ),
+    "Research": (
+        "isro", "csir", "icmr", "icar", "barc", r"scientists?", "scientific", "research", r"researchers?",
+    ),
+    "PSU": (
+        "limited", "ltd", r"psus?", "bhel", "ntpc", "ongc", "iocl", "gail", "sail", "hal", "bel", "nmdc",
+        r"coal india", r"(?:management|executive|engineer|graduate) trainees?", "aai", "powergrid",
+        "bpcl", "hpcl", "nhpc",
+    ),
+    GENERAL: (),
+}
+# Recruiters that hire nationwide: their jobs are "All India" unless a state is named
+NATIONAL = {"UPSC", "SSC", "Banking", "Railway", "Defence", "Postal", "PSU"}
+
+# State -> names, cities and state commission / board acronyms (lowercase)
+STATES: Dict[str, Tuple[str, ...]] = {
+    "Andhra Pradesh": ("andhra pradesh", "andhra", "visakhapatnam", "vizag", "vijayawada", "guntur",
+                       "tirupati", "appsc"),
+    "Arunachal Pradesh": ("arunachal pradesh", "arunachal", "itanagar"),
+    "Assam": ("assam", "guwahati", "gauhati", "dibrugarh", "silchar", "apsc"),
+    "Bihar": ("bihar", "patna", "gaya", "muzaffarpur", "bhagalpur", "bpsc", "bssc", "बिहार"),
+    "Chhattisgarh": ("chhattisgarh", "chattisgarh", "raipur", "bilaspur", "cgpsc", "vyapam"),
+    "Goa": ("goa", "panaji"),
+    "Gujarat": ("gujarat", "ahmedabad", "surat", "vadodara", "rajkot", "gandhinagar", "gpsc", "gsssb"),
+    "Haryana": ("haryana", "gurugram", "gurgaon", "faridabad", "panipat", "hisar", "hpsc", "hssc", "हरियाणा"),
+    "Himachal Pradesh": ("himachal pradesh", "himachal", "shimla", "dharamshala", "hppsc", "hpsssb"),
+    "Jharkhand": ("jharkhand", "ranchi", "jamshedpur", "dhanbad", "jpsc", "jssc"),
+    "Karnataka": ("karnataka", "bengaluru", "bangalore", "mysuru", "mysore", "hubli",
+                  "mangaluru", "mangalore", "kpsc"),
+    "Kerala": ("kerala", "thiruvananthapuram", "trivandrum", "kochi", "cochin", "kozhikode", "calicut"),
+    "Madhya Pradesh": ("madhya pradesh", "bhopal", "indore", "gwalior", "jabalpur", "mppsc", "mpesb",
+                       "मध्य प्रदेश"),
+    "Maharashtra": ("maharashtra", "mumbai", "bombay", "pune", "nagpur", "nashik", "thane", "aurangabad", "mpsc"),
+    "Manipur": ("manipur", "imphal"),
+    "Meghalaya": ("meghalaya", "shillong"),
+    "Mizoram": ("mizoram", "aizawl"),
+    "Nagaland": ("nagaland", "kohima"),
+    "Odisha": ("odisha", "orissa", "bhubaneswar", "cuttack", "opsc", "ossc", "osssc"),
+    "Punjab": ("punjab", "ludhiana", "amritsar", "jalandhar", "patiala", "ppsc", "psssb"),
+    "Rajasthan": ("rajasthan", "jaipur", "jodhpur", "udaipur", "kota", "ajmer", "bikaner", "alwar",
+                  "rpsc", "rsmssb", "rssb", "राजस्थान"),
+    "Sikkim": ("sikkim", "gangtok"),
+    "Tamil Nadu": ("tamil nadu", "tamilnadu", "chennai", "madras", "coimbatore", "madurai", "tnpsc", "tnusrb"),
+    "Telangana": ("telangana", "hyderabad", "warangal", "tspsc", "tgpsc"),
+    "Tripura": ("tripura", "agartala"),
+    "Uttar Pradesh": ("uttar pradesh", "lucknow", "kanpur", "varanasi", "prayagraj", "allahabad", "agra",
+                      "noida", "ghaziabad", "meerut", "bareilly", "gorakhpur", "aligarh",
+                      "uppsc", "upsssc", "उत्तर प्रदेश"),
+    "Uttarakhand": ("uttarakhand", "uttaranchal", "dehradun", "haridwar", "nainital", "ukpsc", "uksssc"),
+    "West Bengal": ("west bengal", "bengal", "kolkata", "calcutta", "howrah", "durgapur", "siliguri",
+                    "wbpsc", "wbssc", "wbprb"),
+    "Delhi": ("delhi", "new delhi", "dsssb", "दिल्ली"),
+    "Chandigarh": ("chandigarh",),
+    "Jammu and Kashmir": ("jammu and kashmir", "jammu", "kashmir", "srinagar", "j&k", "jkpsc", "jkssb"),
+    "Ladakh": ("ladakh", "leh"),
+    "Puducherry": ("puducherry", "pondicherry"),
+    "Andaman and Nicobar Islands": ("andaman",),
+}
+# Upper-case abbreviations, matched case-sensitively ("UP Police", not "up to")
+STATE_ABBREVIATIONS = {
+    "UP": "Uttar Pradesh", "MP": "Madhya Pradesh", "HP": "Himachal Pradesh", "AP": "Andhra Pradesh",
+    "CG": "Chhattisgarh", "WB": "West Bengal", "TN": "Tamil Nadu", "J&K": "Jammu and Kashmir",
+}
+
+
+def _alternation(patterns: Iterable[str]) -> str:
+    # Longest first, so "new delhi" is preferred over "delhi" at the same position
+    return "|".join(sorted(patterns, key=len, reverse=True))
+
+
+def _words(pattern: str) -> str:
+    # Keyword boundaries on ASCII letters and digits only: \b does not work
+    # after Devanagari vowel signs
+    return r"(?<![a-z0-9])(?:" + pattern + r")(?![a-z0-9])"
+
+
+_STATE_NAMES = [re.escape(name) for aliases in STATES.values() for name in aliases if name.isascii()]
+_RULE_GROUPS = []
+for _index, (_category, _patterns) in enumerate(CATEGORIES.items()):
+    if _category == STATE_PSC:
+        _patterns += (r"(?:" + _alternation(_STATE_NAMES) + r")\s+(?:staff|services?)\s+selection",)
+    if _patterns:
+        _RULE_GROUPS.append(f"(?P<c{_index}>" + _alternation(_patterns) + ")")
+_RULES_RE = re.compile(_words("|".join(_RULE_GROUPS)))
+_CATEGORY_NAMES = list(CATEGORIES)
+
+_STATE_OF = {name: state for state, aliases in STATES.items() for name in aliases}
+_STATE_RE = re.compile(_words(_alternation(re.escape(name) for name in _STATE_OF)))
+_STATE_ABBREVIATION_RE = re.compile(
+    r"(?<![A-Za-z0-9])(" + "|".join(re.escape(a) for a in STATE_ABBREVIATIONS) + r")(?![A-Za-z0-9])"
+)
+
+_TOKEN_RE = re.compile(r"[a-z]+|[ऀ-ॿ]+")
+
+
+def rule_category(title: str) -> Tuple[Optional[str], List[Tuple[int, int]]]:
+    """Highest-priority category whose keywords occur in title (None if none) and the matched spans."""
+    best, spans = None, []
+    for match in _RULES_RE.finditer(title.lower()):
+        index = int(match.lastgroup[1:])
+        best = index if best is None else min(best, index)
+        spans.append(match.span())
+    return (_CATEGORY_NAMES[best] if best is not None else None), spans
+
+
+def published_category(category: str, state: str) -> str:
+    """The category shown for a job: State PSC becomes "<state> PSC" when the state is known."""
+    if category == STATE_PSC and state not in (NO_STATE, ALL_INDIA):
+        return f"{state} PSC"
+    return category
+
+
+def infer_state(title: str) -> Optional[str]:
+    """First state named in title (by name, city, commission acronym or abbreviation), or None."""
+    match = _STATE_RE.search(title.lower())
+    abbreviation = _STATE_ABBREVIATION_RE.search(title)
+    if abbreviation and (match is None or abbreviation.start() < match.start()):
+        return STATE_ABBREVIATIONS[abbreviation.group(1)]
+    return _STATE_OF[match.group(0)] if match else None
+
+
+@lru_cache(maxsize=65536)
+def _bucket(feature: str) -> int:
+    return zlib.crc32(feature.encode("utf-8")) & (BUCKETS - 1)
+
+
+def features(title: str) -> List[int]:
+    """Hashed features of a title: its words and adjacent word pairs."""
+    tokens = _TOKEN_RE.findall(title.lower())
+    return [_bucket(t) for t in tokens] + [_bucket(a + " " + b) for a, b in zip(tokens, tokens[1:])]
+
+
+def _without(text: str, spans: List[Tuple[int, int]]) -> str:
+    """text with the (sorted, non-overlapping) spans cut out."""
+    parts, last = [], 0
+    for start, end in spans:
+        parts.append(text[last:start])
+        last = end
+    parts.append(text[last:])
+    return " ".join(parts)
+
+
+def _softmax(scores: Sequence[float]) -> List[float]:
+    top = max(scores)
+    exps = [math.exp(s - top) for s in scores]
+    total = sum(exps)
+    return [e / total for e in exps]
+
+
+class Categorizer:
+    """Rules plus the trained classifier; classify() labels a batch of titles."""
+
+    def __init__(self, model_path: Optional[str] = MODEL_FILE):
+        self.categories = _CATEGORY_NAMES
+        self.bias: List[float] = [0.0] * len(self.categories)
+        self.weights: Dict[int, Tuple[float, ...]] = {}
+        if model_path:
+            self.load(model_path)
+
+    def load(self, path: str):
+        try:
+            with open(path, encoding="utf-8") as f:
+                model = json.load(f)
+        except FileNotFoundError:
+            logging.info(f"🏷️ No category model at {path}; categorizing by keyword rules only")
+            return
+        if model["categories"] != self.categories or model["buckets"] != BUCKETS:
+            logging.warning(f"⚠️ Category model {path} was trained for other categories; retrain it")
+            return
+        self.bias = model["bias"]
+        self.weights = {int(b): tuple(w) for b, w in model["weights"].items()}
+
+    def predict(self, title: str) -> Tuple[str, float]:
+        """Classifier category for title and its probability."""
+        vectors = [w for w in map(self.weights.get, features(title)) if w is not None]
+        if not vectors:
+            return GENERAL, 0.0
+        probs = _softmax([sum(column) for column in zip(self.bias, *vectors)])
+        best = max(range(len(probs)), key=probs.__getitem__)
+        return self.categories[best], probs[best]
+
+    def classify_one(self, title: str) -> Tuple[str, str]:
+        category = rule_category(title)[0]
+        if category is None:
+            category, confidence = self.predict(title)
+            if confidence < MIN_CONFIDENCE:
+                category = GENERAL
+        state = infer_state(title) or (ALL_INDIA if category in NATIONAL else NO_STATE)
+        return published_category(category, state), state
+
+    def classify(self, titles: Sequence[str]) -> List[Tuple[str, str]]:
+        """(published category, state) for every title; repeated titles are classified once."""
+        labels = {title: self.classify_one(title) for title in dict.fromkeys(titles)}
+        return [labels[title] for title in titles]
+
+    # ---------- training ----------
+    def train(self, titles: Iterable[str], labels: Optional[Dict[str, str]] = None, epochs: int = EPOCHS,
+              learning_rate: float = LEARNING_RATE, seed: int = 0) -> int:
+        """
+        Fit the classifier on titles, labelled by `labels` (title -> category)
+        where given and by the rules otherwise; returns the number of examples.
+        """
+        labels = labels or {}
+        examples = []
+        for title in dict.fromkeys(titles):
+            category, spans = rule_category(title)
+            label = self.categories.index(labels.get(title) or category or GENERAL)
+            examples.append((features(title), label))
+            masked = _without(title.lower(), spans)
+            if spans and _TOKEN_RE.search(masked):
+                examples.append((features(masked), label))
+        k = len(self.categories)
+        bias, weights = [0.0] * k, {}
+        rng = random.Random(seed)
+        for epoch in range(epochs):
+            rng.shuffle(examples)
+            rate = learning_rate / (1 + epoch)
+            for feats, label in examples:
+                vectors = [weights.setdefault(b, [0.0] * k) for b in feats]
+                probs = _softmax([sum(column) for column in zip(bias, *vectors)])
+                for c in range(k):
+                    step = rate * (probs[c] - (c == label))
+                    if not step:
+                        continue
+                    bias[c] -= step
+                    for w in vectors:
+                        w[c] -= step
+        self.bias = bias
+        self.weights = {b: tuple(w) for b, w in weights.items()}
+        return len(examples)
+
+    def save(self, path: str):
+        model = {
+            "categories": self.categories,
+            "buckets": BUCKETS,
+            "bias": [round(v, 4) for v in self.bias],
+            "weights": {str(b): [round(v, 4) for v in w] for b, w in sorted(self.weights.items())},
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(model, f, separators=(",", ":"))
+            f.write("\n")
+        os.replace(tmp, path)
+
+
+def job_titles(jobs_dir: str = "jobs") -> List[str]:
+    """Titles of the job records in jobs_dir."""
+    titles = []
+    for path in sorted(glob.glob(os.path.join(jobs_dir, "*.json"))):
+        try:
+            with open(path, encoding="utf-8") as f:
+                job = json.load(f)
+        except Exception:
+            continue
+        if isinstance(job, dict) and job.get("title"):
+            titles.append(job["title"])
+    return titles
+
+
+def load_labelled(path: str) -> List[Dict[str, str]]:
+    """A hand-labelled [{"title", "category", "state"}, ...] file, or [] if it is missing."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Train the job category classifier.")
+    parser.add_argument("command", choices=("train",))
+    parser.add_argument("--jobs-dir", default="jobs")
+    parser.add_argument("--model", default=MODEL_FILE)
+    parser.add_argument("--labels", default=LABELS_FILE, help="hand-labelled titles to train on")
+    parser.add_argument("--holdout", default=TEST_FILE,
+                        help="labelled titles to leave out of training (the benchmark's test set)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    held_out = {entry["title"] for entry in load_labelled(args.holdout)} if args.holdout else set()
+    labels = {entry["title"]: entry["category"] for entry in load_labelled(args.labels)}
+    titles = [title for title in list(labels) + job_titles(args.jobs_dir) if title not in held_out]
+    logging.info(f"🏷️ {len(labels)} hand-labelled titles, {len(held_out)} held out of training")
+    categorizer = Categorizer(model_path=None)
+    examples = categorizer.train(titles, labels)
+    categorizer.save(args.model)
+    logging.info(f"🏷️ Trained on {len(titles)} titles ({examples} examples), {len(categorizer.weights)} "
+                 f"features -> {args.model}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,104 @@
+# crawl_state.py
+# Persistent crawl-state index for incremental runs.
+# Keyed by fetch_jobs.job_hash(title, link); records when each job was first
+# and last seen, when its detail page was last fetched, a fingerprint of that
+# page and the job record built from it. Known, recently fetched jobs can be
+# reused as-is instead of being deep-crawled again.
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+
+def fingerprint(content: bytes) -> str:
+    """Content fingerprint of a fetched detail page."""
+    return hashlib.sha256(content).hexdigest()
+
+
+class CrawlState:
+    """
+    `refresh_after` is how long (seconds) a job's detail page is trusted before
+    it is fetched again; `retention` is how long a job that no longer appears
+    on any listing page is remembered.
+    """
+
+    def __init__(self, path, refresh_after=3 * 86400, retention=90 * 86400):
+        self.path = path
+        self.refresh_after = refresh_after
+        self.retention = retention
+        self.reused = 0
+        self.unchanged = 0
+        self.processed = 0
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.warning(f"⚠️ Crawl state unreadable, starting fresh: {e}")
+            return {}
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def needs_fetch(self, job_id: str) -> bool:
+        """True if the job is new or its detail page is due for a refresh."""
+        entry = self._entries.get(job_id)
+        if entry is None or entry.get("job") is None:
+            return True
+        return time.time() - entry["last_fetched"] > self.refresh_after
+
+    def reuse(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Mark a known job as seen this run and return its stored record."""
+        entry = self._entries[job_id]
+        entry["last_seen"] = time.time()
+        self.reused += 1
+        return entry["job"]
+
+    def lookup_unchanged(self, job_id: str, fp: str) -> Optional[Dict[str, Any]]:
+        """Return the stored record if the refetched page has the same fingerprint."""
+        entry = self._entries.get(job_id)
+        if entry is None or entry.get("job") is None or entry["fingerprint"] != fp:
+            return None
+        now = time.time()
+        entry["last_fetched"] = now
+        entry["last_seen"] = now
+        self.unchanged += 1
+        return entry["job"]
+
+    def record(self, job_id: str, job: Dict[str, Any], fp: Optional[str]):
+        """Store a freshly processed job."""
+        now = time.time()
+        entry = self._entries.setdefault(job_id, {"first_seen": now})
+        entry.update(last_seen=now, last_fetched=now, fingerprint=fp, job=job)
+        self.processed += 1
+
+    def first_seen(self, job_id: str) -> Optional[float]:
+        entry = self._entries.get(job_id)
+        return entry["first_seen"] if entry else None
+
+    def close(self):
+        """Forget jobs not seen within `retention` and write the state file."""
+        cutoff = time.time() - self.retention
+        for job_id in [k for k, e in self._entries.items() if e["last_seen"] < cutoff]:
+            del self._entries[job_id]
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def report(self) -> str:
+        return (
+            f"Crawl state: {self.reused} reused without fetch, {self.unchanged} unchanged after refetch, "
+            f"{self.processed} processed, {len(self._entries)} tracked"
+        )
@@ -0,0 +1,313 @@
+# crawler.py
+# Concurrent asyncio crawl engine used by fetch_jobs.py.
+# Bounded global concurrency, per-host limits, pooled keep-alive connections
+# and a round-robin scheduler so one slow portal can't starve the others.
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+
+from host_health import ROBOTS_TIMEOUT
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a single GET request."""
+    url: str
+    status: int = 0
+    content: bytes = b""
+    encoding: str = "utf-8"
+    headers: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    from_cache: bool = False    # body served from the HTTP response cache
+    not_modified: bool = False  # server confirmed the cached body with a 304
+    elapsed: float = 0.0        # seconds spent on the network request (all attempts)
+    attempts: int = 1           # network attempts made (retries + 1)
+    skipped: bool = False       # not requested: the host's circuit breaker is open
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+def host_of(url: str) -> str:
+    """Return the lowercase host of a URL (used as the scheduling key)."""
+    return urlsplit(url).netloc.lower()
+
+
+def _cached_result(cache, meta, not_modified=False) -> FetchResult:
+    return FetchResult(
+        url=meta["url"],
+        status=200,
+        content=cache.read_body(meta),
+        encoding=meta.get("encoding") or "utf-8",
+        from_cache=True,
+        not_modified=not_modified,
+    )
+
+
+def _lookup(cache, url):
+    """Return (meta, cached FetchResult if still fresh) for url."""
+    if cache is None:
+        return None, None
+    meta = cache.get(url)
+    if meta is not None and cache.is_fresh(meta):
+        cache.record_hit(meta)
+        return meta, _cached_result(cache, meta)
+    return meta, None
+
+
+def _finish(cache, meta, result: FetchResult, store_body=True) -> FetchResult:
+    """Apply cache bookkeeping to a result that came from the network."""
+    if result.status == 304 and (cache is None or meta is None):
+        # Nothing cached to revalidate: an empty body must not pass for the page
+        result.error = "HTTP 304 without a cached copy"
+        return result
+    if cache is None or (result.error and result.status != 304):
+        return result
+    if result.status == 304:
+        cache.revalidated(meta, result.headers)
+        return _cached_result(cache, meta, not_modified=True)
+    cache.record_miss()
+    if result.status == 200:
+        cache.store(result.url, result.content, result.headers, result.encoding, keep_body=store_body)
+    return result
+
+
+def _skipped(url: str, health) -> FetchResult:
+    host = host_of(url)
+    return FetchResult(url=url, error=f"circuit open: {health.open_circuits[host]}", skipped=True)
+
+
+class AsyncCrawler:
+    """
+    Fetch many URLs concurrently.
+    `max_concurrency` bounds the total number of in-flight requests and
+    `per_host` bounds how many of those may target the same host. With a
+    HostHealth (`health`), connect / first-byte timeouts adapt per host,
+    transient failures are retried, failing hosts are skipped and robots.txt
+    crawl delays are kept.
+    """
+
+    def __init__(self, headers=None, timeout=15, max_concurrency=16, per_host=2, verify_ssl=True, cache=None,
+                 health=None):
+        self.headers = headers or {}
+        self.cache = cache
+        self.health = health
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_host = max(1, per_host)
+        self.verify_ssl = verify_ssl
+
+    def fetch_all(self, urls: Iterable[str]) -> Dict[str, FetchResult]:
+        """Blocking entry point: fetch every URL and return {url: FetchResult}."""
+        return asyncio.run(self.fetch_all_async(urls))
+
+    async def fetch_all_async(self, urls: Iterable[str]) -> Dict[str, FetchResult]:
+        """Fetch every URL, spreading requests fairly across hosts."""
+        queues: "OrderedDict[str, deque]" = OrderedDict()
+        seen = set()
+        for url in urls:
+            if url in seen:
+                continue
+            seen.add(url)
+            queues.setdefault(host_of(url), deque()).append(url)
+
+        results: Dict[str, FetchResult] = {}
+        if not queues:
+            return results
+
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency,
+            limit_per_host=self.per_host,
+            ssl=None if self.verify_ssl else False,
+            keepalive_timeout=30,
+        )
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        in_flight: Dict[str, int] = {host: 0 for host in queues}
+        next_start: Dict[str, float] = {host: 0.0 for host in queues}  # crawl-delay spacing
+        running: Dict[asyncio.Task, str] = {}
+
+        async with aiohttp.ClientSession(headers=self.headers, timeout=timeout, connector=connector) as session:
+            if self.health is not None:
+                origins = self.health.robots_needed(q[0] for q in queues.values())
+                await asyncio.gather(*(self._fetch_robots(session, origin) for origin in origins))
+            while queues or running:
+                # Round-robin over hosts: hand out at most one slot per host per
+                # pass until either the global limit is hit or no host is ready.
+                dispatched = True
+                while dispatched and len(running) < self.max_concurrency:
+                    dispatched = False
+                    now = time.monotonic()
+                    for host in list(queues):
+                        if len(running) >= self.max_concurrency:
+                            break
+                        if in_flight[host] >= self.per_host or now < next_start[host]:
+                            continue
+                        url = queues[host].popleft()
+                        if not queues[host]:
+                            del queues[host]
+                        else:
+                            queues.move_to_end(host)
+                        if self.health is not None and not self.health.allow(host):
+                            results[url] = _skipped(url, self.health)
+                            dispatched = True
+                            continue
+                        if self.health is not None:
+                            next_start[host] = now + self.health.crawl_delay(host)
+                        in_flight[host] += 1
+                        running[asyncio.ensure_future(self._fetch(session, url))] = host
+                        dispatched = True
+
+                # Hosts with a free slot that are only waiting out their crawl delay
+                now = time.monotonic()
+                delayed = [next_start[h] - now for h in queues if in_flight[h] < self.per_host and next_start[h] > now]
+                wake = max(0.01, min(delayed)) if delayed else None
+                if not running:
+                    if wake is None:
+                        break
+                    await asyncio.sleep(wake)
+                    continue
+                done, _ = await asyncio.wait(running, timeout=wake, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    in_flight[running.pop(task)] -= 1
+                    result = task.result()
+                    results[result.url] = result
+        return results
+
+    async def _fetch_robots(self, session: aiohttp.ClientSession, origin: str):
+        try:
+            async with session.get(origin + "/robots.txt", timeout=aiohttp.ClientTimeout(total=ROBOTS_TIMEOUT)) as resp:
+                text = await resp.text(errors="replace") if resp.status == 200 else ""
+                self.health.set_robots(origin, resp.status, text)
+        except Exception as e:
+            logging.debug(f"robots.txt unavailable for {origin}: {e!r}")
+            self.health.set_robots(origin, 0, "")
+
+    async def _fetch(self, session: aiohttp.ClientSession, url: str) -> FetchResult:
+        meta, cached = _lookup(self.cache, url)
+        if cached is not None:
+            return cached
+        extra = self.cache.validators(meta) if meta else {}
+        host = host_of(url)
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt_start = time.perf_counter()
+            kwargs = {}
+            if self.health is not None:
+                # Only the wait for the server adapts; the download keeps the full total
+                wait = self.health.first_byte_timeout(host)
+                kwargs["timeout"] = aiohttp.ClientTimeout(total=self.timeout, sock_connect=wait, sock_read=wait)
+            first_byte = None
+            try:
+                async with session.get(url, headers=extra, **kwargs) as resp:
+                    first_byte = time.perf_counter() - attempt_start
+                    content = await resp.read()
+                    result = FetchResult(
+                        url=url,
+                        status=resp.status,
+                        content=content,
+                        encoding=resp.get_encoding() if content else "utf-8",
+                        headers={k.lower(): v for k, v in resp.headers.items()},
+                        error=None if resp.status < 400 else f"HTTP {resp.status}",
+                    )
+            except Exception as e:
+                logging.debug(f"Async fetch failed for {url}: {e!r}")
+                result = FetchResult(url=url, error=str(e) or type(e).__name__)
+            if self.health is None:
+                break
+            latency = first_byte if first_byte is not None else time.perf_counter() - attempt_start
+            self.health.record(host, result.status, latency, result.error)
+            if not result.error or not self.health.should_retry(host, result.status, attempt):
+                break
+            await asyncio.sleep(self.health.backoff(host, attempt, result.headers.get("retry-after")))
+            attempt += 1
+        result = _finish(self.cache, meta, result)
+        result.attempts = attempt + 1
+        result.elapsed = time.perf_counter() - start
+        return result
+
+
+def fetch_sequential(urls: Iterable[str], headers=None, timeout=15, verify_ssl=True, cache=None,
+                     health=None, store_body=True) -> Dict[str, FetchResult]:
+    """
+    Fallback path: fetch URLs one at a time with blocking requests.
+    With store_body=False the cache keeps only validators, and a cache hit
+    or 304 comes back with an empty body (the caller has it elsewhere).
+    """
+    results: Dict[str, FetchResult] = {}
+    urls = list(urls)
+    last_start: Dict[str, float] = {}
+    if health is not None:
+        for origin in health.robots_needed(urls):
+            try:
+                resp = requests.get(origin + "/robots.txt", headers=headers, timeout=ROBOTS_TIMEOUT, verify=verify_ssl)
+                health.set_robots(origin, resp.status_code, resp.text if resp.ok else "")
+            except Exception:
+                health.set_robots(origin, 0, "")
+    for url in urls:
+        if url in results:
+            continue
+        meta, cached = _lookup(cache, url)
+        if cached is not None:
+            results[url] = cached
+            continue
+        host = host_of(url)
+        if health is not None and not health.allow(host):
+            results[url] = _skipped(url, health)
+            continue
+        request_headers = dict(headers or {})
+        if meta:
+            request_headers.update(cache.validators(meta))
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            if health is not None:
+                # Keep the robots.txt crawl delay between requests to the same host
+                wait = last_start.get(host, 0.0) + health.crawl_delay(host) - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                last_start[host] = time.monotonic()
+            attempt_start = time.perf_counter()
+            latency = None
+            try:
+                # (connect, read) timeouts bound each wait for the server, not the whole download
+                wait = health.first_byte_timeout(host) if health else timeout
+                resp = requests.get(url, headers=request_headers, verify=verify_ssl, timeout=(wait, wait))
+                latency = resp.elapsed.total_seconds()
+                result = FetchResult(
+                    url=url,
+                    status=resp.status_code,
+                    content=resp.content,
+                    encoding=resp.encoding or resp.apparent_encoding or "utf-8",
+                    headers={k.lower(): v for k, v in resp.headers.items()},
+                    error=None if resp.ok else f"HTTP {resp.status_code}",
+                )
+            except Exception as e:
+                result = FetchResult(url=url, error=str(e) or type(e).__name__)
+            if health is None:
+                break
+            if latency is None:
+                latency = time.perf_counter() - attempt_start
+            health.record(host, result.status, latency, result.error)
+            if not result.error or not health.should_retry(host, result.status, attempt):
+                break
+            time.sleep(health.backoff(host, attempt, result.headers.get("retry-after")))
+            attempt += 1
+        result = _finish(cache, meta, result, store_body)
+        result.attempts = attempt + 1
+        result.elapsed = time.perf_counter() - start
+        results[url] = result
+    return results
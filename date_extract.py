@@ -0,0 +1,145 @@
+# date_extract.py
+# Fast "last date" extraction for job pages and notification PDFs.
+# All patterns are compiled once, the document is scanned in a single pass,
+# and parsed date strings are memoized. Understands numeric dates
+# (25/12/2025, 25-12-25, ISO 2025-12-25), English month names
+# (December 25, 2025 / 25 Dec 2025) and Hindi month names (25 दिसंबर 2025).
+# Dotted numeric dates (25.12.2025) count only next to a deadline keyword:
+# on their own they are too often notice, section or version numbers
+# ("Notice No. 1.2.2024", "Ref 12.05.23").
+
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Optional, Tuple
+
+NOT_SPECIFIED = "Not Specified"
+BEST_RANK = 0  # keyword + numeric date
+NO_DATE = 4
+
+MONTHS = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9, "oct": 10, "october": 10,
+    "nov": 11, "november": 11, "dec": 12, "december": 12,
+    # Hindi
+    "जनवरी": 1, "फरवरी": 2, "फ़रवरी": 2, "मार्च": 3, "अप्रैल": 4, "अप्रेल": 4, "मई": 5,
+    "जून": 6, "जुलाई": 7, "अगस्त": 8, "सितंबर": 9, "सितम्बर": 9, "अक्टूबर": 10,
+    "अक्तूबर": 10, "नवंबर": 11, "नवम्बर": 11, "दिसंबर": 12, "दिसम्बर": 12,
+}
+# Every branch starts at the day digits (the century digits for ISO dates),
+# so the regex engine can skip straight to digit positions instead of trying
+# month names at every letter.
+# Month words are matched generically (Latin or Devanagari letters) and
+# checked against MONTHS in parse_date.
+_WORD = r"[A-Za-z\u0900-\u097F]"
+_SUFFIX = r"(?:st|nd|rd|th)?"
+_DATE_RE = re.compile(
+    r"\d{1,2}(?:"
+    r"(?P<num>[/\-.]\d{1,2}[/\-.](?:\d{4}|\d{2})(?!\d))"                    # 25/12/2025
+    r"|(?P<dmy>" + _SUFFIX + r"[\s\-]+" + _WORD + r"{3,12}\.?,?[\s\-]+\d{4})"  # 25 Dec 2025
+    r"|(?P<dy>" + _SUFFIX + r",?\s+\d{4})"                                     # (December) 25, 2025
+    r"|(?P<iso>\d{2}[/\-]\d{1,2}[/\-]\d{1,2}(?!\d))"                             # 2025-12-25
+    r")",
+    re.IGNORECASE,
+)
+# Month word directly before a "DD, YYYY" match
+_MONTH_BEFORE_RE = re.compile(_WORD + r"{3,12}\.?\s+$")
+_KEYWORD_RE = re.compile(
+    r"last\s*date|apply\s*before|closing\s*date|last\s*day|deadline"
+    r"|अंतिम\s*तिथि|अन्तिम\s*तिथि|अंतिम\s*तारीख|आखिरी\s*तारीख|अंतिम\s*दिनांक",
+    re.IGNORECASE,
+)
+_NUM_SPLIT_RE = re.compile(r"[/\-.]")
+_MONTH_WORD_RE = re.compile(_WORD + "+")
+_DIGITS_RE = re.compile(r"\d+")
+_KEYWORD_WINDOW = 80  # chars before a date (same line) searched for a keyword
+
+
+@lru_cache(maxsize=4096)
+def parse_date(raw: str) -> Optional[date]:
+    """Parse one matched date string (day-first for numeric dates, unless ISO); memoized."""
+    try:
+        if raw[0].isdigit() and _NUM_SPLIT_RE.search(raw) and not any(c.isalpha() for c in raw):
+            parts = _NUM_SPLIT_RE.split(raw)
+            if len(parts[0]) == 4:  # ISO, e.g. 2025-12-25
+                year, month, day = (int(p) for p in parts)
+            else:
+                day, month, year = (int(p) for p in parts)
+            if month > 12 and day <= 12:  # month-first date, e.g. 12/25/2025
+                day, month = month, day
+        else:
+            month = next((MONTHS[w] for w in _MONTH_WORD_RE.findall(raw.lower()) if w in MONTHS), None)
+            numbers = _DIGITS_RE.findall(raw)
+            year = next((int(n) for n in numbers if len(n) == 4), None)
+            day = next((int(n) for n in numbers if len(n) <= 2), None)
+            if month is None or day is None or year is None:
+                return None
+        if year < 100:
+            year += 2000
+        return date(year, month, day)
+    except (ValueError, TypeError):
+        return None
+
+
+def _rank(start: int, numeric: bool, text: str, dotted: bool = False) -> int:
+    """
+    0 = keyword + numeric, 1 = numeric, 2 = keyword + month name, 3 = month
+    name; NO_DATE for a dotted numeric date without a keyword.
+    """
+    line_start = text.rfind("\n", 0, start) + 1
+    window = text[max(line_start, start - _KEYWORD_WINDOW):start]
+    has_keyword = _KEYWORD_RE.search(window) is not None
+    if dotted and not has_keyword:
+        return NO_DATE
+    return (0 if has_keyword else 1) if numeric else (2 if has_keyword else 3)
+
+
+def _candidates(text: str):
+    """Yield (start, raw date string, is_numeric) for every date-like span, in document order."""
+    for match in _DATE_RE.finditer(text):
+        start = match.start()
+        if start and text[start - 1].isdigit():
+            continue
+        kind = match.lastgroup
+        if kind == "dy":
+            month = _MONTH_BEFORE_RE.search(text, max(0, start - 14), start)
+            if month is None:
+                continue
+            yield month.start(), text[month.start():match.end()], False
+        else:
+            yield start, match.group(0), kind in ("num", "iso")
+
+
+def find_last_date(text: str, today: Optional[date] = None) -> Tuple[int, Optional[date]]:
+    """
+    (rank, date) of the most likely application deadline in text, see
+    _rank(); (NO_DATE, None) if there is none. A BEST_RANK date cannot be
+    beaten by anything later in the document.
+    """
+    if not text:
+        return NO_DATE, None
+    today = today or date.today()
+    best_rank, best = NO_DATE, None
+    for start, raw, numeric in _candidates(text):
+        rank = _rank(start, numeric, text, dotted=numeric and "." in raw)
+        if rank >= best_rank:
+            continue
+        parsed = parse_date(raw)
+        if parsed is None or parsed < today:
+            continue
+        best_rank, best = rank, parsed
+        if rank == BEST_RANK:
+            break
+    return best_rank, best
+
+
+def extract_last_date(text: str, today: Optional[date] = None) -> str:
+    """
+    Return the most likely application deadline in text as YYYY-MM-DD.
+    Dates next to phrases like 'Last Date' / 'अंतिम तिथि' win over bare
+    dates, numeric dates over month-name dates, earlier over later; dates
+    already in the past are ignored. Returns 'Not Specified' if none found.
+    """
+    best = find_last_date(text, today)[1]
+    return str(best) if best else NOT_SPECIFIED
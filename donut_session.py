@@ -0,0 +1,203 @@
+# donut_session.py
+# Load the Donut (OCR-free document understanding) model once per process
+# and run first-page inference over many PDFs in batches. DonutWorker moves
+# the model into a dedicated process so the crawler keeps fetching while
+# inference runs.
+
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+DEFAULT_MODEL = "naver-clova-ix/donut-base-finetuned-docvqa"
+TASK_PROMPT = "<s_docvqa><s_question>Extract job title, department, apply link, last date<sep/>"
+
+
+def first_page_image(pdf_path):
+    """Render the first page of a PDF as an RGB PIL image."""
+    import fitz  # PyMuPDF
+    from PIL import Image
+
+    doc = fitz.open(pdf_path)
+    try:
+        pix = doc[0].get_pixmap()
+        return Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    finally:
+        doc.close()
+
+
+class DonutSession:
+    """
+    Processor + model loaded once and reused for every document. A failed
+    load is remembered: the session then answers None for every document
+    instead of retrying the load.
+    """
+
+    def __init__(self, model_name=DEFAULT_MODEL, batch_size=4, max_length=512, device=None):
+        self.model_name = model_name
+        self.batch_size = max(1, batch_size)
+        self.max_length = max_length
+        self.device = device
+        self.load_seconds = None
+        self.load_error = None
+        self._processor = None
+        self._model = None
+
+    @property
+    def available(self) -> bool:
+        """Load weights on first use; False once a load has failed."""
+        if self._model is None and self.load_error is None:
+            try:
+                self.load()
+            except Exception as e:
+                self.load_error = str(e) or type(e).__name__
+                logging.warning(f"⚠️ Donut model unavailable, PDFs fall back to regex: {self.load_error}")
+        return self._model is not None
+
+    def load(self):
+        """Load weights on first use (no-op afterwards)."""
+        if self._model is not None:
+            return
+        import torch
+        from transformers import DonutProcessor, VisionEncoderDecoderModel
+
+        start = time.perf_counter()
+        processor = DonutProcessor.from_pretrained(self.model_name)
+        model = VisionEncoderDecoderModel.from_pretrained(self.model_name)
+        self.device = self.device or ("cuda" if torch.cuda.is_available() else "cpu")
+        model.to(self.device)
+        model.eval()
+        self._processor, self._model = processor, model
+        self.load_seconds = time.perf_counter() - start
+        logging.info(f"🧠 Loaded {self.model_name} on {self.device} in {self.load_seconds:.1f}s")
+
+    def generate(self, images) -> List[str]:
+        """Run the job-info prompt over a list of page images, batch_size at a time."""
+        import torch
+
+        self.load()
+        processor, model = self._processor, self._model
+        prompt_ids = processor.tokenizer(TASK_PROMPT, add_special_tokens=False, return_tensors="pt").input_ids
+        results: List[str] = []
+        for i in range(0, len(images), self.batch_size):
+            batch = images[i:i + self.batch_size]
+            pixel_values = processor(batch, return_tensors="pt").pixel_values.to(self.device)
+            decoder_input_ids = prompt_ids.repeat(len(batch), 1).to(self.device)
+            with torch.inference_mode():
+                outputs = model.generate(
+                    pixel_values,
+                    decoder_input_ids=decoder_input_ids,
+                    max_length=self.max_length,
+                    pad_token_id=processor.tokenizer.pad_token_id,
+                    eos_token_id=processor.tokenizer.eos_token_id,
+                    bad_words_ids=[[processor.tokenizer.unk_token_id]],
+                )
+            results.extend(processor.batch_decode(outputs, skip_special_tokens=True))
+        return results
+
+    def infer_pdfs(self, pdf_paths) -> List[Optional[str]]:
+        """Raw model output for the first page of each PDF (None where rendering failed or no model)."""
+        if not self.available:
+            return [None] * len(pdf_paths)
+        images, index = [], []
+        for i, path in enumerate(pdf_paths):
+            try:
+                images.append(first_page_image(path))
+                index.append(i)
+            except Exception as e:
+                logging.warning(f"⚠️ Could not render first page of {path}: {e}")
+        results: List[Optional[str]] = [None] * len(pdf_paths)
+        for i, output in zip(index, self.generate(images) if images else []):
+            results[i] = output
+        return results
+
+
+# ---------- dedicated worker process ----------
+
+_worker_session: Optional[DonutSession] = None
+
+
+def _init_worker(model_name, batch_size, max_length):
+    global _worker_session
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    _worker_session = DonutSession(model_name, batch_size=batch_size, max_length=max_length)
+
+
+def _infer_in_worker(pdf_paths):
+    return _worker_session.infer_pdfs(pdf_paths)
+
+
+class DonutWorker:
+    """
+    Queue PDFs for batched inference.
+    submit() returns immediately; every `batch_size` PDFs are sent to the
+    model as one batch. With use_process=True the model lives in a separate
+    process, otherwise batches run inline in this process.
+    collect() flushes the remaining queue and returns {key: raw output}.
+    """
+
+    def __init__(self, model_name=DEFAULT_MODEL, batch_size=4, max_length=512, use_process=True):
+        self.batch_size = max(1, batch_size)
+        self._queue = []
+        self._queued_keys = set()
+        self._futures: list = []  # [(keys, Future)]
+        self._executor = None
+        self._session = None
+        if use_process:
+            self._executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(model_name, batch_size, max_length),
+            )
+        else:
+            self._session = DonutSession(model_name, batch_size=batch_size, max_length=max_length)
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue) + sum(len(keys) for keys, _ in self._futures)
+
+    def submit(self, key, pdf_path):
+        if key in self._queued_keys:
+            return
+        self._queued_keys.add(key)
+        self._queue.append((key, pdf_path))
+        if len(self._queue) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._queue:
+            return
+        keys = [key for key, _ in self._queue]
+        paths = [path for _, path in self._queue]
+        self._queue = []
+        if self._executor is not None:
+            future = self._executor.submit(_infer_in_worker, paths)
+        else:
+            future = Future()
+            try:
+                future.set_result(self._session.infer_pdfs(paths))
+            except Exception as e:
+                future.set_exception(e)
+        self._futures.append((keys, future))
+
+    def collect(self) -> Dict[str, Optional[str]]:
+        """Wait for every queued PDF and return {key: raw model output or None}."""
+        self._flush()
+        outputs: Dict[str, Optional[str]] = {}
+        for keys, future in self._futures:
+            try:
+                results = future.result()
+            except Exception as e:
+                logging.warning(f"⚠️ Donut inference batch failed: {e}")
+                results = [None] * len(keys)
+            outputs.update(zip(keys, results))
+        self._futures = []
+        self._queued_keys = set()
+        return outputs
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
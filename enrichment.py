@@ -0,0 +1,143 @@
+# enrichment.py
+# Batched AI enrichment stage, run once over all new jobs after scraping.
+# Summaries and Hindi translations go through the models in length-bucketed
+# batches (similar-length inputs share a batch, so little padding is wasted).
+# Skills and FAQs come from fast rule-based extractors, optionally extended
+# by the skill_extractor / faq_generator models when they are enabled.
+
+import logging
+import re
+import time
+from typing import Callable, Dict, List, Optional
+
+from metrics import METRICS
+
+SUMMARY_FALLBACK_CHARS = 180
+
+# Skills / qualifications commonly asked for in government notifications
+SKILL_KEYWORDS = [
+    "10th", "12th", "ITI", "Diploma", "Graduate", "Post Graduate", "B.Tech", "B.E", "M.Tech",
+    "MBA", "MBBS", "B.Sc", "M.Sc", "B.Com", "CA", "LLB", "B.Ed", "CTET", "TET", "Nursing",
+    "Pharmacy", "Typing", "Shorthand", "Stenography", "Computer", "MS Office", "Tally",
+    "Data Entry", "Driving", "Physical Fitness", "Accounting", "Teaching", "Engineering",
+    "English", "Hindi",
+]
+_SKILL_RE = re.compile(
+    r"(?<![\w.])(" + "|".join(re.escape(k) for k in sorted(SKILL_KEYWORDS, key=len, reverse=True)) + r")(?![\w])",
+    re.IGNORECASE,
+)
+_CANONICAL_SKILL = {k.lower(): k for k in SKILL_KEYWORDS}
+
+_AGE_RE = re.compile(r"age\s*limit[^\n.]{0,40}?(\d{2})\s*(?:to|-|–)\s*(\d{2})\s*years", re.IGNORECASE)
+_FEE_RE = re.compile(r"(?:application\s*)?fee[^\n.]{0,40}?(?:rs\.?|₹|inr)\s*([\d,]+)", re.IGNORECASE)
+
+SKILL_PROMPT = "List the skills and qualifications required for this job, comma separated.\n\n{}"
+ELIGIBILITY_PROMPT = "Answer the question based on the notice.\nQuestion: Who is eligible to apply?\nNotice: {}"
+
+
+def extract_skills(text: str) -> List[str]:
+    """Return known skills/qualifications mentioned in the text, in order of appearance."""
+    skills = []
+    for match in _SKILL_RE.finditer(text or ""):
+        skill = _CANONICAL_SKILL[match.group(1).lower()]
+        if skill not in skills:
+            skills.append(skill)
+    return skills
+
+
+def generate_faqs(job: Dict) -> List[Dict[str, str]]:
+    """Build FAQ entries from the job's scraped fields and description."""
+    faqs = []
+    last_date = job.get("last_date")
+    if last_date and last_date != "Not Specified":
+        faqs.append({"q": "What is the last date to apply?", "a": f"The last date to apply is {last_date}."})
+    if job.get("apply_link"):
+        where = "the official website" if job.get("is_gov") else "the link provided"
+        faqs.append({"q": "How can I apply?", "a": f"Apply online through {where}: {job['apply_link']}"})
+    description = job.get("description") or ""
+    age = _AGE_RE.search(description)
+    if age:
+        faqs.append({"q": "What is the age limit?", "a": f"{age.group(1)} to {age.group(2)} years (relaxation as per rules)."})
+    fee = _FEE_RE.search(description)
+    if fee:
+        faqs.append({"q": "What is the application fee?", "a": f"Rs. {fee.group(1)} (see notification for category-wise fees)."})
+    if job.get("pdf_url"):
+        faqs.append({"q": "Where is the official notification?", "a": job["pdf_url"]})
+    return faqs
+
+
+def length_buckets(texts: List[str], batch_size: int) -> List[List[int]]:
+    """Group indices of texts into batches of similar length."""
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def run_batched(model, texts: List[str], batch_size: int, output_key: str, **kwargs) -> List[Optional[str]]:
+    """Run a pipeline over texts in length-bucketed batches; failed batches yield None."""
+    results: List[Optional[str]] = [None] * len(texts)
+    for bucket in length_buckets(texts, batch_size):
+        batch = [texts[i] for i in bucket]
+        start = time.perf_counter()
+        try:
+            outputs = model(batch, batch_size=len(batch), truncation=True, **kwargs)
+        except Exception as e:
+            logging.warning(f"⚠️ Batched {output_key} failed for {len(batch)} inputs: {e}")
+            METRICS.inc("model_batch_failures_total", model=output_key)
+            continue
+        METRICS.observe("model_batch_seconds", time.perf_counter() - start, model=output_key)
+        METRICS.inc("model_inputs_total", len(batch), model=output_key)
+        for i, out in zip(bucket, outputs):
+            if isinstance(out, list):  # some pipelines wrap each result in a list
+                out = out[0]
+            results[i] = out[output_key].strip()
+    return results
+
+
+def enrich_jobs(jobs: List[Dict], get_model: Callable[[str], object], batch_size: int = 8) -> int:
+    """
+    Add summary, skills, faqs and summary_hi to jobs that don't have them yet.
+    `get_model(name)` returns a loaded pipeline or None if that model is disabled.
+    Returns the number of jobs enriched.
+    """
+    todo = [job for job in jobs if job.get("description") and "summary" not in job]
+    if not todo:
+        return 0
+    descriptions = [job["description"] for job in todo]
+
+    # --- Summaries ---
+    summarizer = get_model("summarizer")
+    summaries = (
+        run_batched(summarizer, descriptions, batch_size, "summary_text", max_length=60, min_length=15, do_sample=False)
+        if summarizer else [None] * len(todo)
+    )
+    for job, summary in zip(todo, summaries):
+        job["summary"] = summary or job["description"][:SUMMARY_FALLBACK_CHARS]
+
+    # --- Skills and FAQs ---
+    for job in todo:
+        job["skills"] = extract_skills(job["title"] + "\n" + job["description"])
+        job["faqs"] = generate_faqs(job)
+    skill_model = get_model("skill_extractor")
+    if skill_model:
+        prompts = [SKILL_PROMPT.format(d) for d in descriptions]
+        for job, answer in zip(todo, run_batched(skill_model, prompts, batch_size, "generated_text", max_length=64)):
+            for skill in (answer or "").split(","):
+                skill = skill.strip()
+                if skill and skill not in job["skills"]:
+                    job["skills"].append(skill)
+    faq_model = get_model("faq_generator")
+    if faq_model:
+        prompts = [ELIGIBILITY_PROMPT.format(d) for d in descriptions]
+        for job, answer in zip(todo, run_batched(faq_model, prompts, batch_size, "generated_text", max_length=96)):
+            if answer:
+                job["faqs"].append({"q": "Who is eligible to apply?", "a": answer})
+
+    # --- Hindi summaries ---
+    translator = get_model("translator")
+    if translator:
+        translations = run_batched(translator, [job["summary"] for job in todo], batch_size, "translation_text")
+        for job, summary_hi in zip(todo, translations):
+            job["summary_hi"] = summary_hi or ""
+
+    logging.info(f"✨ Enriched {len(todo)} jobs")
+    return len(todo)
@@ -0,0 +1,123 @@
+# expiry_index.py
+# Sorted last_date -> job file index for the jobs/ folder.
+# Kept up to date by JobWriter as jobs are saved, renamed and removed, so
+# finding expired jobs is a range query over the sorted dates instead of
+# opening and date-parsing every job file on every run. Only files the
+# index has never seen (first run, hand-edited folders) are read from disk.
+#
+# Stored in jobs/expiry/index.json:
+#   {"dates": {"2025-07-31": ["job-a.json", ...], ...}, "undated": [...]}
+
+import bisect
+import json
+import logging
+import os
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dateutil import parser as dateparser
+
+EXPIRY_DIR = "expiry"
+EXPIRY_FILE = "index.json"
+NOT_SPECIFIED = "Not Specified"
+
+
+def parse_last_date(value: Optional[str]) -> Optional[str]:
+    """Normalize a job's last_date to YYYY-MM-DD, or None if missing/unparseable."""
+    if not value or value == NOT_SPECIFIED:
+        return None
+    try:
+        return date.fromisoformat(value).isoformat()  # what extract_last_date emits
+    except ValueError:
+        pass
+    try:
+        return dateparser.parse(value, dayfirst=True).date().isoformat()
+    except Exception:
+        logging.warning(f"❌ Invalid last_date '{value}', treating job as undated")
+        return None
+
+
+class ExpiryIndex:
+    """Job files keyed by last date, with a sorted date list for range queries."""
+
+    def __init__(self, jobs_dir: str):
+        self.path = os.path.join(jobs_dir, EXPIRY_DIR, EXPIRY_FILE)
+        self._files: Dict[str, Optional[str]] = {}  # filename -> ISO date or None
+        self._dates: List[Tuple[str, str]] = []     # sorted (ISO date, filename)
+        self.dirty = False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            for day, files in data.get("dates", {}).items():
+                for filename in files:
+                    self._files[filename] = day
+                    self._dates.append((day, filename))
+            for filename in data.get("undated", []):
+                self._files[filename] = None
+            self._dates.sort()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"⚠️ Could not load expiry index, rebuilding: {e}")
+            self._files, self._dates = {}, []
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self._files
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def files(self) -> List[str]:
+        return sorted(self._files)
+
+    def set(self, filename: str, last_date: Optional[str]):
+        day = parse_last_date(last_date)
+        if filename in self._files:
+            if self._files[filename] == day:
+                return
+            self.discard(filename)
+        self._files[filename] = day
+        if day:
+            bisect.insort(self._dates, (day, filename))
+        self.dirty = True
+
+    def discard(self, filename: str):
+        if filename not in self._files:
+            return
+        day = self._files.pop(filename)
+        if day:
+            i = bisect.bisect_left(self._dates, (day, filename))
+            if i < len(self._dates) and self._dates[i] == (day, filename):
+                del self._dates[i]
+        self.dirty = True
+
+    def expired(self, today: date) -> List[Tuple[str, str]]:
+        """(filename, last date) of every job whose last date is before today."""
+        end = bisect.bisect_left(self._dates, (today.isoformat(), ""))
+        return [(filename, day) for day, filename in self._dates[:end]]
+
+    def sync(self, on_disk: Iterable[str], load_job):
+        """Reconcile with the job files actually present; only unseen files are loaded."""
+        on_disk = set(on_disk)
+        for filename in [f for f in self._files if f not in on_disk]:
+            self.discard(filename)
+        for filename in sorted(on_disk - self._files.keys()):
+            try:
+                self.set(filename, load_job(filename).get("last_date"))
+            except Exception as e:
+                logging.warning(f"❌ Error indexing expiry for {filename}: {e}")
+
+    def save(self):
+        if not self.dirty:
+            return
+        dates: Dict[str, List[str]] = {}
+        for day, filename in self._dates:
+            dates.setdefault(day, []).append(filename)
+        undated = sorted(f for f, day in self._files.items() if day is None)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"dates": dates, "undated": undated}, f, indent=1, ensure_ascii=False)
+            f.write("\n")
+        os.replace(tmp, self.path)
+        self.dirty = False
@@ -1,19 +1,36 @@
 from dotenv import load_dotenv
 load_dotenv()
-from dotenv import load_dotenv
-load_dotenv()
 import os
 import json
 import logging
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, date
-from dateutil import parser as dateparser
 import hashlib
+import itertools
 import re
+import sys
+
+from crawler import AsyncCrawler, fetch_sequential
+from http_cache import ResponseCache
+from crawl_state import CrawlState, fingerprint
+from pdf_store import PdfStore
+from pdf_text import JobInfoExtractor, open_buffer, read_pdf
+from categorizer import Categorizer
+from html_workers import ParsePool, decode_html, default_workers, resolve_parser
+from donut_session import DonutSession, DonutWorker
 
-from transformers import pipeline
-summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+from ai_models import ModelRegistry
+from enrichment import enrich_jobs
+from date_extract import extract_last_date
+from job_writer import JobWriter
+from expiry_index import parse_last_date
+from job_store import SqliteJobStore, export_static, import_files
+from near_dupes import NearDupFilter, NearDupIndex
+from telegram_dispatch import Outbox, TelegramDispatcher
+from metrics import METRICS
+from crawler import host_of
+from host_health import HostHealth
+from pipeline import Checkpoint, chunked, prefetch
 
 # =======================
 # CONFIGURATION SECTION
@@ -42,14 +59,83 @@ HEADERS = {
 }
 REQUEST_TIMEOUT = 15  # seconds
 DEEP_CRAWL = True     # Toggle deep crawling for official links
+# Async crawl engine (set ASYNC_CRAWL=0 to fall back to sequential requests)
+ASYNC_CRAWL = os.environ.get("ASYNC_CRAWL", "1") != "0"
+MAX_CONCURRENCY = 16       # Max in-flight requests across all hosts
+PER_HOST_CONCURRENCY = 2   # Max in-flight requests to a single host
+# Host health: adaptive connect / first-byte timeouts, retries, circuit breaker and robots.txt crawl-delay
+HOST_HEALTH = os.environ.get("HOST_HEALTH", "1") != "0"
+HOST_HEALTH_FILE = os.path.join(".cache", "host_health.json")
+MAX_RETRIES = 2            # Retries of a timed-out / 429 / 5xx request
+BREAKER_THRESHOLD = 5      # Consecutive failed attempts before a host is skipped for the run
+BOT_NAME = "SarkariSarthiBot"  # User agent matched against robots.txt
+# On-disk HTTP response cache (conditional revalidation with ETag/Last-Modified)
+ENABLE_HTTP_CACHE = True
+HTTP_CACHE_DIR = os.path.join(".cache", "http")
+HTTP_CACHE_TTL = 30 * 86400                 # Drop entries not revalidated for 30 days
+HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024    # Disk budget for cached bodies
+HTTP_CACHE_FRESH_SECONDS = 6 * 3600         # Serve without revalidating within this window
+# Incremental crawl: reuse known jobs instead of deep-crawling them again
+# (set INCREMENTAL_CRAWL=0 to force a full re-crawl)
+INCREMENTAL_CRAWL = os.environ.get("INCREMENTAL_CRAWL", "1") != "0"
+CRAWL_STATE_FILE = os.path.join(".cache", "crawl_state.json")
+CRAWL_REFRESH_AFTER = 3 * 86400     # Refetch a known job's detail page after 3 days
+CRAWL_STATE_RETENTION = 90 * 86400  # Forget jobs not listed anywhere for 90 days
+# Content-addressed PDF store (PDF bytes + extracted text + parse results)
+PDF_STORE_DIR = os.path.join(".cache", "pdfs")
+PDF_STORE_MAX_BYTES = 1024 * 1024 * 1024  # LRU disk budget
+# PDF text extraction budget: stop after this many pages / characters of text
+# (and as soon as title, department, apply link and last date are all found)
+PDF_MAX_PAGES = 10
+PDF_MAX_TEXT_CHARS = 200_000
+# Donut model for PDF first-page understanding (loaded once, batched)
+ENABLE_DONUT = os.environ.get("ENABLE_DONUT", "1") != "0"
+DONUT_MODEL = "naver-clova-ix/donut-base-finetuned-docvqa"
+DONUT_BATCH_SIZE = 4
+DONUT_WORKER_PROCESS = True  # Run inference in a dedicated process
+# AI enrichment models, created lazily on first use.
+# Choices: summarizer, translator, skill_extractor, faq_generator.
+# Override with e.g. AI_MODELS="summarizer" (an empty value disables all).
+AI_MODELS = ["summarizer", "translator"]
+if "AI_MODELS" in os.environ:
+    AI_MODELS = [m.strip() for m in os.environ["AI_MODELS"].split(",") if m.strip()]
+# HTML parsing / extraction worker pool
+HTML_PARSER = "lxml"        # BeautifulSoup backend; falls back to html.parser if lxml is missing
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", default_workers()))  # 0 = parse inline
+PARSE_POOL_MIN_PAGES = 32   # Smaller batches are parsed inline: the pool's start-up costs more than it saves
+ENRICH_BATCH_SIZE = 8        # Inputs per model call in the enrichment stage
+DESCRIPTION_MAX_CHARS = 1500 # Page text kept as the job description
+# Category / state classifier weights (retrain with: python categorizer.py train)
+CATEGORY_MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "category_model.json")
+# Near-duplicate merging of the same notification listed by several aggregators
+# (MinHash over normalized titles + shared PDF/official links; NEAR_DUPES=0 disables)
+NEAR_DUPES = os.environ.get("NEAR_DUPES", "1") != "0"
+NEAR_DUP_THRESHOLD = 0.7
+# Streaming pipeline: jobs are crawled, enriched and saved chunk by chunk
+PIPELINE_CHUNK_SIZE = 50     # Detail pages per chunk
+PIPELINE_BUFFER = 2          # Crawled chunks waiting for enrichment before the crawler pauses
+CHECKPOINT_FILE = os.path.join(".cache", "pipeline_checkpoint.jsonl")  # lets an interrupted run resume
+CHECKPOINT_MAX_AGE = 12 * 3600   # Older checkpoints are ignored (start a fresh run)
+# Expired jobs are deleted, or moved to jobs/archive/<YYYY-MM>/ with ARCHIVE_EXPIRED=1
+ARCHIVE_EXPIRED = os.environ.get("ARCHIVE_EXPIRED", "0") != "0"
+ARCHIVE_DIR = "archive"
+# Job storage backend: "files" (the jobs/ JSON folder is the store) or "sqlite"
+# (records kept in JOB_DB_PATH; jobs/ and its indexes are exported from it)
+JOB_STORE = os.environ.get("JOB_STORE", "files")
+JOB_DB_PATH = os.path.join(".cache", "jobs.db")
 # Set your Telegram Bot Token as an environment variable before running this script:
 #   export TELEGRAM_BOT_TOKEN='your-telegram-bot-token' (Linux/macOS)
 #   set TELEGRAM_BOT_TOKEN=your-telegram-bot-token (Windows)
 TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN")
-if not TELEGRAM_BOT_TOKEN:
-    logging.error("TELEGRAM_BOT_TOKEN environment variable not set! Telegram notifications will not work.")
-
-TELEGRAM_CHAT_ID = "-1002642236931"
+TELEGRAM_CHAT_ID = os.environ.get("TELEGRAM_CHAT_ID") or "-1002642236931"
+# Point at a local stand-in server for testing, e.g. http://127.0.0.1:8081
+TELEGRAM_API_BASE = os.environ.get("TELEGRAM_API_BASE", "https://api.telegram.org")
+TELEGRAM_OUTBOX = os.path.join(".cache", "telegram_outbox.json")  # job keys already announced
+# Run metrics: JSON report always, Prometheus text format if METRICS_PROM is set.
+# `python fetch_jobs.py --profile` also writes cProfile stats to PROFILE_FILE.
+RUN_REPORT = os.environ.get("RUN_REPORT", os.path.join(".cache", "run_report.json"))
+METRICS_PROM = os.environ.get("METRICS_PROM")  # e.g. .cache/metrics.prom
+PROFILE_FILE = os.path.join(".cache", "profile.pstats")
 
 # =======================
 # LOGGING SETUP
@@ -58,6 +144,8 @@ logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(message)s",
 )
+if not TELEGRAM_BOT_TOKEN:
+    logging.warning("TELEGRAM_BOT_TOKEN environment variable not set! Telegram notifications will not work.")
 
 # =======================
 # UTILITY FUNCTIONS
@@ -86,147 +174,330 @@ def job_hash(title, link):
     """Create a hash for deduplication."""
     return hashlib.sha256((title + link).encode("utf-8")).hexdigest()
 
-def extract_last_date(text):
+def job_key(job):
     """
-    Extract the last date from text using regex and dateutil.
-    Looks for phrases like 'Last Date', 'Apply before', etc.
+    The job's stable ID: the listing key job_hash(title[:80], listing link)
+    stored on the record as "listing_key" when it was built. Deep crawls and
+    PDFs may replace the title and apply_link later, but not the key. Records
+    saved before the key was stored fall back to their title + apply_link hash.
     """
-    # Common patterns and phrases
-    patterns = [
-        r"(?:last\s*date|apply\s*before|closing\s*date|last\s*day|deadline)[^\n:]*[:\-]?\s*([\d]{1,2}[\/\-][\d]{1,2}[\/\-][\d]{2,4})",
-        r"([\d]{1,2}[\/\-][\d]{1,2}[\/\-][\d]{2,4})",
-        r"(?:last\s*date|apply\s*before|closing\s*date|last\s*day|deadline)[^\n:]*[:\-]?\s*([A-Za-z]{3,9}\s+\d{1,2},?\s+\d{4})",
-        r"([A-Za-z]{3,9}\s+\d{1,2},?\s+\d{4})"
-    ]
-    for pattern in patterns:
-        for match in re.findall(pattern, text, re.IGNORECASE):
-            try:
-                dt = dateparser.parse(match, dayfirst=True, fuzzy=True)
-                if dt and dt.date() >= date.today():
-                    return str(dt.date())
-            except Exception:
-                continue
-    return "Not Specified"
+    return job.get("listing_key") or job_hash(job['title'], job.get('apply_link', ''))
+
+JOB_FILE_ID_RE = re.compile(r"-([0-9a-f]{12})\.json$")
+
+def job_filename(job):
+    """New record's filename: readable title slug plus the job's ID, so similar titles never collide."""
+    slug = slugify(job["title"])[:-len(".json")][:48].rstrip("-")
+    return f"{slug}-{job_key(job)[:12]}.json"
+
+def saved_filename(job, saved):
+    """
+    Filename of the job's saved record if there is one, else job_filename().
+    `saved` maps ID prefixes to existing filenames, so a job keeps its file
+    when its title changes; files named by the older title + apply_link hash
+    are found the same way.
+    """
+    for key in (job_key(job), job_hash(job['title'], job.get('apply_link', ''))):
+        if key[:12] in saved:
+            return saved[key[:12]]
+    return job_filename(job)
+
+def files_by_id(filenames):
+    """{ID prefix: filename} for job filenames ending in an ID."""
+    found = {}
+    for name in filenames:
+        match = JOB_FILE_ID_RE.search(name)
+        if match:
+            found[match.group(1)] = name
+    return found
+
+_http_cache = None
+
+def get_http_cache():
+    """Return the shared response cache (created on first use), or None if disabled."""
+    global _http_cache
+    if ENABLE_HTTP_CACHE and _http_cache is None:
+        _http_cache = ResponseCache(
+            HTTP_CACHE_DIR,
+            ttl=HTTP_CACHE_TTL,
+            max_bytes=HTTP_CACHE_MAX_BYTES,
+            fresh_for=HTTP_CACHE_FRESH_SECONDS,
+        )
+    return _http_cache
+
+def close_http_cache():
+    """Persist the response cache and log its hit/revalidation stats."""
+    if _http_cache is not None:
+        _http_cache.close()
+        for name, value in vars(_http_cache.stats).items():
+            METRICS.set(f"http_cache_{name}", value)
+        logging.info(f"📦 {_http_cache.stats.report()}")
+
+_host_health = None
+
+def get_host_health():
+    """Return the per-host health tracker (loaded on first use), or None if disabled."""
+    global _host_health
+    if HOST_HEALTH and _host_health is None:
+        _host_health = HostHealth(
+            HOST_HEALTH_FILE,
+            base_timeout=REQUEST_TIMEOUT,
+            max_retries=MAX_RETRIES,
+            breaker_threshold=BREAKER_THRESHOLD,
+            user_agent=BOT_NAME,
+        )
+    return _host_health
+
+def close_host_health():
+    """Persist host latency/error stats and log retries and skipped hosts."""
+    global _host_health
+    if _host_health is not None:
+        _host_health.close()
+        METRICS.set("hosts_circuit_open", len(_host_health.open_circuits))
+        logging.info(f"🩺 {_host_health.report()}")
+        _host_health = None
+
+_crawl_state = None
+
+def get_crawl_state():
+    """Return the shared crawl-state index (loaded on first use), or None if disabled."""
+    global _crawl_state
+    if INCREMENTAL_CRAWL and _crawl_state is None:
+        _crawl_state = CrawlState(
+            CRAWL_STATE_FILE,
+            refresh_after=CRAWL_REFRESH_AFTER,
+            retention=CRAWL_STATE_RETENTION,
+        )
+    return _crawl_state
+
+def close_crawl_state():
+    """Persist the crawl-state index and log how much work it saved."""
+    if _crawl_state is not None:
+        _crawl_state.close()
+        logging.info(f"🧭 {_crawl_state.report()}")
+
+_pdf_store = None
+
+def get_pdf_store():
+    """Return the shared content-addressed PDF store (opened on first use)."""
+    global _pdf_store
+    if _pdf_store is None:
+        _pdf_store = PdfStore(PDF_STORE_DIR, max_bytes=PDF_STORE_MAX_BYTES)
+    return _pdf_store
+
+def close_pdf_store():
+    """Persist the PDF store index after LRU eviction."""
+    if _pdf_store is not None:
+        _pdf_store.close()
+        logging.info(f"📄 {_pdf_store.report()}")
+
+_model_registry = None
+
+def get_model(name):
+    """Return an enabled AI enrichment model (loaded on first use), or None."""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry(AI_MODELS)
+    return _model_registry.get(name)
+
+def report_model_loads():
+    """Log how long each lazily loaded model took to load."""
+    if _model_registry is not None:
+        for name, seconds in _model_registry.load_seconds.items():
+            METRICS.set("model_load_seconds", seconds, model=name)
+        logging.info(f"🧠 {_model_registry.report()}")
+
+_parse_pool = None
+
+def get_parse_pool():
+    """Return the shared HTML parsing pool (processes start on first batch)."""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ParsePool(PARSE_WORKERS, min_batch=PARSE_POOL_MIN_PAGES)
+    return _parse_pool
+
+def close_parse_pool():
+    """Stop the HTML parsing worker processes."""
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.close()
+        _parse_pool = None
+
+_donut_session = None
+_donut_worker = None
+
+def get_donut_session():
+    """Return the in-process Donut session (weights load on first inference)."""
+    global _donut_session
+    if _donut_session is None:
+        _donut_session = DonutSession(DONUT_MODEL, batch_size=DONUT_BATCH_SIZE)
+    return _donut_session
+
+def get_donut_worker():
+    """Return the shared batched-inference worker, or None if Donut is disabled."""
+    global _donut_worker
+    if ENABLE_DONUT and _donut_worker is None:
+        _donut_worker = DonutWorker(
+            DONUT_MODEL, batch_size=DONUT_BATCH_SIZE, use_process=DONUT_WORKER_PROCESS
+        )
+    return _donut_worker
+
+def close_donut_worker():
+    """Shut down the inference worker process."""
+    global _donut_worker
+    if _donut_worker is not None:
+        _donut_worker.close()
+        _donut_worker = None
+
+def fetch_pages(urls, verify_ssl=True):
+    """
+    Fetch a batch of URLs and return {url: FetchResult}.
+    Uses the async crawl engine unless ASYNC_CRAWL is disabled.
+    """
+    urls = list(urls)
+    if not urls:
+        return {}
+    if ASYNC_CRAWL:
+        crawler = AsyncCrawler(
+            headers=HEADERS,
+            timeout=REQUEST_TIMEOUT,
+            max_concurrency=MAX_CONCURRENCY,
+            per_host=PER_HOST_CONCURRENCY,
+            verify_ssl=verify_ssl,
+            cache=get_http_cache(),
+            health=get_host_health(),
+        )
+        results = crawler.fetch_all(urls)
+    else:
+        results = fetch_sequential(
+            urls, headers=HEADERS, timeout=REQUEST_TIMEOUT, verify_ssl=verify_ssl, cache=get_http_cache(),
+            health=get_host_health(),
+        )
+    record_fetch_metrics(results.values())
+    return results
+
+def record_fetch_metrics(results):
+    """Per-host request counts, retries, bytes and latency for a batch of FetchResults."""
+    for res in results:
+        host = host_of(res.url)
+        if res.skipped:
+            outcome = "skipped"
+        elif res.not_modified:
+            outcome = "not_modified"
+        elif res.from_cache:
+            outcome = "cache_hit"
+        else:
+            outcome = "ok" if res.ok else "error"
+        METRICS.inc("http_requests_total", host=host, outcome=outcome)
+        if res.attempts > 1:
+            METRICS.inc("http_retries_total", res.attempts - 1, host=host)
+        if not res.from_cache:
+            METRICS.inc("http_bytes_total", len(res.content), host=host)
+        if res.elapsed:
+            METRICS.observe("http_request_seconds", res.elapsed, host=host)
+
+def page_description(text, limit=None):
+    """Condense page text into a description: keep sentence-like lines, skip menus and short labels."""
+    limit = limit or DESCRIPTION_MAX_CHARS
+    parts, size = [], 0
+    for line in text.splitlines():
+        line = " ".join(line.split())
+        if len(line) < 40:
+            continue
+        parts.append(line)
+        size += len(line) + 1
+        if size >= limit:
+            break
+    return " ".join(parts)[:limit]
 
 def is_pdf_link(href):
     """Check if a link is a PDF."""
     return href.lower().endswith('.pdf')
 
-def download_pdf(url, dest):
-    """Download PDF from URL to destination path."""
+def download_pdf(url):
+    """
+    Fetch a PDF, revalidating the copy in the PDF store with the HTTP cache
+    validators. Returns (sha, bytes), with bytes None when the stored copy is
+    unchanged, or (None, None) on failure. Bodies live only in the PDF store.
+    """
+    store = get_pdf_store()
+    cache = get_http_cache()
+    sha = store.sha_for_url(url)
+    if sha is None and cache:
+        cache.forget(url)  # validators are useless without the stored body
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT, stream=True, verify=False)
-        resp.raise_for_status()
-        with open(dest, 'wb') as f:
-            for chunk in resp.iter_content(1024):
-                f.write(chunk)
-        return True
+        resp = fetch_sequential(
+            [url], headers=HEADERS, timeout=REQUEST_TIMEOUT, verify_ssl=False, cache=cache,
+            health=get_host_health(), store_body=False,
+        )[url]
+        record_fetch_metrics([resp])
+        if not resp.ok:
+            raise RuntimeError(resp.error)
     except Exception as e:
         logging.warning(f"Failed to download PDF {url}: {e}")
-        return False
+        return None, None
+    if resp.from_cache:
+        return sha, None
+    return store.put(url, resp.content), resp.content
 
-def extract_pdf_text(pdf_path):
-    """Extract text from PDF using PyMuPDF or pdfplumber."""
+def extract_pdf_text(source):
+    """
+    Extract PDF text with PyMuPDF or pdfplumber, page by page, from the PDF
+    bytes or a file path (read through mmap). Stops within the
+    PDF_MAX_PAGES / PDF_MAX_TEXT_CHARS budget, and once the job info is complete.
+    Returns (text, regex job info found while reading), or (None, None).
+    """
     try:
-        import fitz  # PyMuPDF
-        doc = fitz.open(pdf_path)
-        text = "\n".join(page.get_text() for page in doc)
-        doc.close()
-        return text
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return read_pdf(source, PDF_MAX_PAGES, PDF_MAX_TEXT_CHARS)
+        with open_buffer(source) as data:
+            return read_pdf(data, PDF_MAX_PAGES, PDF_MAX_TEXT_CHARS)
     except Exception as e:
-        try:
-            import pdfplumber
-            with pdfplumber.open(pdf_path) as pdf:
-                text = "\n".join(page.extract_text() or '' for page in pdf.pages)
-            return text
-        except Exception as ex:
-            logging.warning(f"PDF parsing failed ({pdf_path}): {e}, {ex}")
-            return None
+        logging.warning(f"PDF parsing failed ({source if isinstance(source, str) else 'download'}): {e}")
+        return None, None
+
+_categorizer = None
+
+def get_categorizer():
+    """Return the job categorizer (keyword rules + trained classifier), loaded on first use."""
+    global _categorizer
+    if _categorizer is None:
+        _categorizer = Categorizer(CATEGORY_MODEL)
+    return _categorizer
 
 def categorize(title: str) -> str:
-    """Categorize job based on keywords in the title."""
-    title_l = title.lower()
-    if any(k in title_l for k in ["police", "constable"]):
-        return "Police"
-    if any(k in title_l for k in ["bank", "ibps", "sbi"]):
-        return "Banking"
-    if any(k in title_l for k in ["railway", "rrb"]):
-        return "Railway"
-    if any(k in title_l for k in ["teacher", "school", "education"]):
-        return "Education"
-    return "General"
+    """Categorize a single job title; see categorize_jobs for batches."""
+    return get_categorizer().classify([title])[0][0]
+
+def categorize_jobs(jobs):
+    """Set the category of a batch of jobs, and the state where the source did not give one."""
+    labels = get_categorizer().classify([job['title'] for job in jobs])
+    for job, (category, state) in zip(jobs, labels):
+        job['category'] = category
+        if job.get('state') in (None, '', 'N/A'):
+            job['state'] = state
 
 # --- Advanced PDF parsing using Hugging Face transformer (Donut/LayoutLM) ---
-def parse_pdf_for_job_info(text, pdf_path=None):
-    """
-    Extract job info using a transformer-based model (Donut/LayoutLM) if possible.
-    Fallback to regex if model or inference fails.
-    """
-    try:
-        # Attempt to use Donut (OCR+NLP) if available
-        from transformers import DonutProcessor, VisionEncoderDecoderModel
-        from PIL import Image
-        import torch
-        import fitz
-        # Extract images from PDF (first page)
-        if pdf_path:
-            doc = fitz.open(pdf_path)
-            pix = doc[0].get_pixmap()
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-            doc.close()
-            processor = DonutProcessor.from_pretrained("naver-clova-ix/donut-base-finetuned-docvqa")
-            model = VisionEncoderDecoderModel.from_pretrained("naver-clova-ix/donut-base-finetuned-docvqa")
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-            model.to(device)
-            task_prompt = "<s_docvqa><s_question>Extract job title, department, apply link, last date<sep/>"
-            inputs = processor(img, task_prompt, return_tensors="pt").to(device)
-            outputs = model.generate(**inputs, max_length=512)
-            result = processor.batch_decode(outputs, skip_special_tokens=True)[0]
-            # Try to extract fields from result string (very basic, can be improved)
-            job_title, department, apply_link, last_date = "", "", "", "Not Specified"
-            for line in result.split("\n"):
-                if "title" in line.lower():
-                    job_title = line.split(":",1)[-1].strip()[:80]
-                if "department" in line.lower():
-                    department = line.split(":",1)[-1].strip()
-                if "apply" in line.lower() and "http" in line:
-                    match = re.search(r'(https?://\S+)', line)
-                    if match:
-                        apply_link = match.group(1)
-                if "last date" in line.lower():
-                    date_match = extract_last_date(line)
-                    if date_match != "Not Specified":
-                        last_date = date_match
-            # If any field missing, fallback to regex
-            if not job_title or not last_date:
-                raise ValueError("Model extraction incomplete, fallback to regex")
-            return {
-                "title": job_title,
-                "last_date": last_date,
-                "department": department,
-                "apply_link": apply_link
-            }
-    except Exception as e:
-        logging.warning(f"⚠️ Donut/LayoutLM model failed or unavailable: {e}. Falling back to regex.")
-    # --- Fallback: Regex-based extraction ---
-    job_title = ""
-    last_date = "Not Specified"
-    department = ""
-    apply_link = ""
-    lines = text.splitlines()
-    for line in lines:
-        if not job_title and any(w in line.lower() for w in ["recruitment", "job", "vacancy", "post"]):
-            job_title = line.strip()[:80]
-        if not last_date or last_date == "Not Specified":
-            date_match = extract_last_date(line)
-            if date_match != "Not Specified":
-                last_date = date_match
-        if not department and any(w in line.lower() for w in ["department", "ministry", "state", "organization"]):
-            department = line.strip()
-        if not apply_link and "http" in line:
+def job_info_from_model_output(result):
+    """Pull job fields out of the raw Donut output; raise ValueError if incomplete."""
+    # Try to extract fields from result string (very basic, can be improved)
+    job_title, department, apply_link, last_date = "", "", "", "Not Specified"
+    for line in result.split("\n"):
+        if "title" in line.lower():
+            job_title = line.split(":",1)[-1].strip()[:80]
+        if "department" in line.lower():
+            department = line.split(":",1)[-1].strip()
+        if "apply" in line.lower() and "http" in line:
             match = re.search(r'(https?://\S+)', line)
             if match:
                 apply_link = match.group(1)
+        if "last date" in line.lower():
+            date_match = extract_last_date(line)
+            if date_match != "Not Specified":
+                last_date = date_match
+    # If any field missing, fallback to regex
+    if not job_title or not last_date:
+        raise ValueError("Model extraction incomplete, fallback to regex")
     return {
         "title": job_title,
         "last_date": last_date,
@@ -234,6 +505,27 @@ def parse_pdf_for_job_info(text, pdf_path=None):
         "apply_link": apply_link
     }
 
+def parse_pdf_for_job_info(text, pdf_path=None, model_output=None, regex_info=None):
+    """
+    Extract job info using a transformer-based model (Donut/LayoutLM) if possible.
+    `model_output` is a precomputed (batched) Donut result; otherwise the
+    shared session runs on `pdf_path`. Fallback to regex if model or inference
+    fails; `regex_info` is the regex result read_pdf already found in `text`.
+    """
+    try:
+        if model_output is None and pdf_path and ENABLE_DONUT:
+            model_output = get_donut_session().infer_pdfs([pdf_path])[0]
+        if model_output:
+            return job_info_from_model_output(model_output)
+    except Exception as e:
+        logging.warning(f"⚠️ Donut/LayoutLM model failed or unavailable: {e}. Falling back to regex.")
+    # --- Fallback: Regex-based extraction ---
+    if regex_info is not None:
+        return dict(regex_info)
+    extractor = JobInfoExtractor()
+    extractor.feed(text)
+    return extractor.result()
+
 def find_official_link(soup, fallback_link):
     """
     Prefer official .gov.in or .nic.in links.
@@ -250,253 +542,618 @@ def find_official_link(soup, fallback_link):
 # =======================
 
 from portals import PORTALS
+from portal_plugins import has_plugin, run_plugin
+
+def process_pdf(pdf_url, worker=None):
+    """
+    Download (or revalidate) and parse a notification PDF. Returns (sha, pdf_info).
+    PDFs are kept in the content-addressed store, so the same notification
+    linked from several aggregators is only extracted and parsed once, and a
+    PDF replaced at the same URL is parsed again.
+    With a DonutWorker the PDF is queued for batched model inference and
+    pdf_info is None until resolve_pdf_info() runs.
+    """
+    sha, content = download_pdf(pdf_url)
+    if not sha:
+        return None, None
+    store = get_pdf_store()
+    if store.is_parsed(sha):
+        return sha, store.info(sha)
+    pdf_text, regex_info = store.text(sha), store.regex_info(sha)
+    if pdf_text is None:
+        with METRICS.timer("pdf_text_seconds"):
+            pdf_text, regex_info = extract_pdf_text(content if content else store.path(sha))
+        if pdf_text:
+            store.set_text(sha, pdf_text, regex_info)
+    if worker is not None:
+        worker.submit(sha, store.path(sha))
+        return sha, None
+    with METRICS.timer("pdf_parse_seconds"):
+        pdf_info = parse_pdf_for_job_info(pdf_text, store.path(sha), regex_info=regex_info) if pdf_text else None
+    store.set_info(sha, pdf_info)
+    return sha, pdf_info
+
+def resolve_pdf_info(sha, model_output):
+    """Finish parsing a PDF queued for batched inference and cache the result."""
+    store = get_pdf_store()
+    pdf_text = store.text(sha)
+    pdf_info = None
+    if model_output or pdf_text:
+        pdf_info = parse_pdf_for_job_info(pdf_text or "", model_output=model_output,
+                                          regex_info=store.regex_info(sha))
+    store.set_info(sha, pdf_info)
+    return pdf_info
+
+def apply_pdf_info(job, pdf_info):
+    """Prefer fields parsed from the notification PDF over the scraped ones."""
+    if not pdf_info:
+        return
+    for field in ("title", "last_date", "apply_link"):
+        if pdf_info.get(field):
+            job[field] = pdf_info[field]
+    job["pdf_parsed"] = True
+
+JOB_LINK_WORDS = ["job", "vacancy", "recruitment", "post", "opening"]
+
+def parse_listing_page(site, content, encoding, parser):
+    """Worker-side: return [(title, full_link)] for every job-like link on a listing page."""
+    soup = BeautifulSoup(decode_html(content, encoding), parser)
+    found = []
+    for link in soup.find_all("a", href=True):
+        title = link.get_text(strip=True)
+        href = link.get("href")
+
+        if not title or not href:
+            continue
+        # Only consider job-like links
+        if not any(word in title.lower() for word in JOB_LINK_WORDS):
+            continue
+
+        # Normalize
+        full_link = href if href.startswith("http") else site.rstrip("/") + "/" + href.lstrip("/")
+        found.append((title, full_link))
+    return found
+
+def parse_detail_page(site, full_link, content, encoding, parser):
+    """Worker-side: extract description, last date, official link and PDF links from a detail page."""
+    page = BeautifulSoup(decode_html(content, encoding), parser)
+    text = page.get_text(separator="\n")
+    official_link, is_gov = find_official_link(page, full_link)
+    pdf_links = []
+    for tag in page.find_all("a", href=True):
+        href = tag["href"]
+        if is_pdf_link(href):
+            pdf_links.append(href if href.startswith("http") else site.rstrip("/") + "/" + href.lstrip("/"))
+    return {
+        "description": page_description(text),
+        "last_date": extract_last_date(text),
+        "official_link": official_link,
+        "is_gov": is_gov,
+        "pdf_links": pdf_links,
+    }
+
+def finish_deep_crawl(full_link, details, worker=None):
+    """Pick the notification PDF for extracted page details and attach its parsed info."""
+    details = dict(details)
+    if "pdf_links" in details:
+        # Fresh extraction: remember it on the cached page so an unchanged
+        # page (cache hit or 304) isn't re-parsed on the next run
+        pdf_links = details.pop("pdf_links")
+        details["pdf_url"] = pdf_links[0] if ENABLE_PDF_PARSING and pdf_links else None
+        cache = get_http_cache()
+        if cache:
+            cache.annotate(full_link, "deep_crawl", details)
+    details["pdf_sha"], details["pdf_info"] = None, None
+    if details.get("pdf_url"):
+        # Revalidated on every deep crawl: an unchanged PDF (304) reuses its stored parse
+        details["pdf_sha"], details["pdf_info"] = process_pdf(details["pdf_url"], worker)
+    return details
+
+def portal_stub_job(portal):
+    """The portal's own "See official site" record, pointing at its home page."""
+    title = f"{portal['name']} - See official site for latest jobs"
+    return {
+        'listing_key': job_hash(title, portal['url']),
+        'title': title,
+        'apply_link': portal['url'],
+        'category': None,  # set by categorize_jobs()
+        'state': portal.get('state', 'N/A'),
+        'source': portal['name'],
+        'last_date': 'Not Specified',
+        'description': f"Visit {portal['url']} for the latest official notifications.",
+        'summary': f"Official portal for {portal['name']} government jobs.",
+        'skills': [],
+        'faq': [],
+        'is_gov': True,
+        'is_official': True,
+    }
 
 def fetch_govt_portal_jobs():
     """
     Scrape jobs from official central and state government portals listed in portals.py.
-    Each portal can have its own scraping logic based on its structure.
+    Each portal is handled by the extractor plugin registered for its "type"
+    (see portal_plugins.py); portals without a plugin are skipped unfetched.
+    Until a portal's plugin is marked "verified" against its live notice
+    board, its "See official site" record is kept next to whatever the
+    plugin found, so the portal never drops off the site.
     Returns a list of job dicts.
     """
     jobs = []
+    portals = [portal for portal in PORTALS if has_plugin(portal)]
     for portal in PORTALS:
-        try:
-            resp = requests.get(portal['url'], headers=HEADERS, timeout=REQUEST_TIMEOUT)
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            # --- Each portal may need custom parsing logic below ---
-            # For demonstration, just create a stub entry:
+        if not has_plugin(portal):
+            logging.info(f"⏭️ No extractor for {portal['name']} (type {portal.get('type')!r}), skipped")
+    with METRICS.stage("govt.fetch"):
+        pages = fetch_pages(portal['url'] for portal in portals)
+    fetched = []
+    for portal in portals:
+        resp = pages[portal['url']]
+        if resp.ok:
+            fetched.append(portal)
+        else:
+            logging.warning(f"Failed to fetch {portal['name']}: {resp.error}")
+    parser = resolve_parser(HTML_PARSER)
+    with METRICS.stage("govt.parse"):
+        results = get_parse_pool().map(
+            run_plugin,
+            [(portal, pages[portal['url']].content, pages[portal['url']].encoding, parser) for portal in fetched],
+        )
+    for portal, (ok, notifications) in zip(fetched, results):
+        if not portal.get('verified'):
+            jobs.append(portal_stub_job(portal))
+        if not ok:
+            logging.warning(f"Failed to parse {portal['name']}: {notifications}")
+            continue
+        logging.info(f"🏛️ {portal['name']}: {len(notifications)} notifications")
+        for item in notifications:
+            title = item['title'][:80]
             jobs.append({
-                'title': f"{portal['name']} - See official site for latest jobs",
-                'apply_link': portal['url'],
-                'category': 'Govt',
+                'listing_key': job_hash(title, item['link']),
+                'title': title,
+                'apply_link': item['link'],
+                'category': None,  # set by categorize_jobs()
+                'state': portal.get('state', 'N/A'),
                 'source': portal['name'],
-                'last_date': 'Not Specified',
-                'description': f"Visit {portal['url']} for the latest official notifications.",
-                'summary': f"Official portal for {portal['name']} government jobs.",
-                'skills': [],
-                'faq': [],
-                'is_official': True
+                'last_date': extract_last_date(item['text']),
+                'is_gov': True,
+                'is_official': True,
+                'pdf_url': item['link'] if is_pdf_link(item['link']) else None,
             })
-        except Exception as e:
-            logging.warning(f"Failed to fetch {portal['name']}: {e}")
+    categorize_jobs(jobs)
     return jobs
 
-def fetch_private_portal_jobs():
-    """Scrape jobs from private portals with deduplication and deep crawl."""
-    jobs = []
-    seen = set()
+def discover_private_candidates():
+    """
+    Fetch and parse every private listing page. Returns the job-like links
+    as [(site, title, full_link, job_id)], de-duplicated by hash and, with
+    NEAR_DUPES, by near-duplicate title across aggregators.
+    """
+    seen_hashes = set()
+    parser = resolve_parser(HTML_PARSER)
+    candidates = []
+    near = NearDupIndex(NEAR_DUP_THRESHOLD) if NEAR_DUPES else None
+    near_dupes = 0
+    with METRICS.stage("private.listing_fetch"):
+        listing_pages = fetch_pages(PRIVATE_SOURCES, verify_ssl=False)
+    fetched_sites = []
     for site in PRIVATE_SOURCES:
-        try:
-            logging.info(f"🔍 Fetching {site}")
-            res = requests.get(site, headers=HEADERS, timeout=REQUEST_TIMEOUT, verify=False)
-            res.raise_for_status()
-            soup = BeautifulSoup(res.text, "html.parser")
-            links = soup.find_all("a", href=True)
+        res = listing_pages[site]
+        if res.ok:
+            fetched_sites.append(site)
+        else:
+            logging.warning(f" Failed to fetch from {site}: {res.error}")
+    with METRICS.stage("private.listing_parse"):
+        listings = get_parse_pool().map(
+            parse_listing_page,
+            [(site, listing_pages[site].content, listing_pages[site].encoding, parser) for site in fetched_sites],
+        )
+    for site, (ok, links) in zip(fetched_sites, listings):
+        if not ok:
+            logging.warning(f" Failed to parse {site}: {links}")
+            continue
+        logging.info(f"🔍 {site}: {len(links)} job links")
+        for title, full_link in links:
+            # Deduplicate
+            job_id = job_hash(title[:80], full_link)
+            if job_id in seen_hashes:
+                continue
+            seen_hashes.add(job_id)
+            # Same notification already listed by another aggregator: skip its deep crawl
+            if near is not None:
+                dup, sig = near.match(title)
+                if dup is not None:
+                    near_dupes += 1
+                    continue
+                near.add(job_id, title, sig=sig)
+            candidates.append((site, title, full_link, job_id))
+    if near_dupes:
+        logging.info(f"🧬 Skipped {near_dupes} near-duplicate listings")
+    return candidates
 
-            for link in links:
-                title = link.get_text(strip=True)
-                href = link.get("href")
+def crawl_private_jobs(candidates, checkpoint=None, chunk_size=None):
+    """
+    Deep crawl candidates chunk by chunk. Yields (candidate job_ids, jobs)
+    per chunk, so callers can save each chunk before the next is crawled.
+    Candidates saved by an interrupted run are taken from the `checkpoint`
+    records without a deep crawl (with or without incremental mode).
+    """
+    # Incremental mode: known, recently fetched jobs are reused without a deep crawl
+    state = get_crawl_state()
+    reused, pending = [], []
+    for candidate in candidates:
+        job_id = candidate[3]
+        saved = checkpoint.record(job_id) if checkpoint is not None else None
+        if saved is not None:
+            reused.append((job_id, saved))
+        elif state is not None and not state.needs_fetch(job_id):
+            reused.append((job_id, dict(state.reuse(job_id), listing_key=job_id)))
+        else:
+            pending.append(candidate)
+    if state is not None:
+        logging.info(f"🧭 {len(reused)} known jobs reused, {len(pending)} new or stale")
+    chunk_size = chunk_size or PIPELINE_CHUNK_SIZE
+    for chunk in chunked(reused, chunk_size):
+        yield [job_id for job_id, _ in chunk], [job for _, job in chunk]
+    # Interleave sites so every chunk keeps many hosts busy within the per-host limit
+    by_site = {}
+    for candidate in pending:
+        by_site.setdefault(candidate[0], []).append(candidate)
+    pending = [c for group in itertools.zip_longest(*by_site.values()) for c in group if c is not None]
+    for chunk in chunked(pending, chunk_size):
+        with METRICS.stage("private_portals"):
+            jobs = crawl_detail_pages(chunk, state)
+        yield [c[3] for c in chunk], jobs
 
-                if not title or not href:
-                    continue
-                # Only consider job-like links
-                if not any(word in title.lower() for word in ["job", "vacancy", "recruitment", "post", "opening"]):
-                    continue
+def crawl_detail_pages(pending, state):
+    """Fetch, parse and build jobs for one chunk of candidates (including PDFs)."""
+    jobs = []
+    pool = get_parse_pool()
+    parser = resolve_parser(HTML_PARSER)
 
-                # Normalize and deduplicate
-                full_link = href if href.startswith("http") else site.rstrip("/") + "/" + href.lstrip("/")
-                job_id = job_hash(title[:80], full_link)
-                if job_id in seen_hashes:
-                    continue
-                seen_hashes.add(job_id)
+    # Deep crawl the chunk's detail pages concurrently
+    with METRICS.stage("private.detail_fetch"):
+        detail_pages = fetch_pages((c[2] for c in pending), verify_ssl=False) if DEEP_CRAWL else {}
+    extracted = {}   # full_link -> page details
+    page_fps = {}    # full_link -> fingerprint of the fetched page
+    to_parse = []
+    cache = get_http_cache()
+    for site, title, full_link, job_id in pending:
+        detail = detail_pages.get(full_link)
+        if detail is None or full_link in page_fps:
+            continue
+        if not detail.ok:
+            if not detail.skipped:  # hosts with an open circuit are reported once by HostHealth
+                logging.warning(f"❌ Deep crawl failed on {full_link}: {detail.error}")
+            continue
+        page_fps[full_link] = fingerprint(detail.content)
+        # Unchanged page (cache hit or 304): reuse last run's extraction
+        parsed = cache.annotation(full_link, "deep_crawl") if cache else None
+        if parsed is not None:
+            extracted[full_link] = parsed
+        else:
+            to_parse.append((site, full_link, detail.content, detail.encoding, parser))
+    with METRICS.stage("private.detail_parse"):
+        parsed_pages = pool.map(parse_detail_page, to_parse)
+    for args, (ok, result) in zip(to_parse, parsed_pages):
+        if ok:
+            extracted[args[1]] = result
+        else:
+            logging.warning(f"❌ Deep crawl failed on {args[1]}: {result}")
+
+    # PDFs queued for batched Donut inference: [(job, job_id, page_fp, pdf_sha)]
+    worker = get_donut_worker() if DEEP_CRAWL and ENABLE_PDF_PARSING else None
+    awaiting_pdf = []
 
+    with METRICS.stage("private.build_jobs"):  # includes PDF download and parsing
+        for site, title, full_link, job_id in pending:
+            try:
                 # Limit job title length
                 job_title = title.strip()[:80]
 
-                # Deep crawl for details
-                last_date = "Not Specified"
-                official_link = full_link
-                is_gov = False
-                pdf_info = None
-                pdf_url = None
-                if DEEP_CRAWL:
-                    try:
-                        detail = requests.get(full_link, headers=HEADERS, timeout=REQUEST_TIMEOUT, verify=False)
-                        detail.raise_for_status()
-                        page = BeautifulSoup(detail.text, "html.parser")
-                        text = page.get_text(separator="\n")
-                        last_date = extract_last_date(text)
-                        official_link, is_gov = find_official_link(page, full_link)
-                        # PDF detection and parsing
-                        if ENABLE_PDF_PARSING:
-                            for tag in page.find_all("a", href=True):
-                                href = tag["href"]
-                                if is_pdf_link(href):
-                                    pdf_url = href if href.startswith("http") else site.rstrip("/") + "/" + href.lstrip("/")
-                                    pdf_name = os.path.join(JOBS_DIR, "_tmp.pdf")
-                                    if download_pdf(pdf_url, pdf_name):
-                                        pdf_text = extract_pdf_text(pdf_name)
-                                        if pdf_text:
-                                            pdf_info = parse_pdf_for_job_info(pdf_text)
-                                        os.remove(pdf_name)
-                                    break
-                    except Exception as e:
-                        logging.warning(f"❌ Deep crawl failed on {full_link}: {e}")
+                page_fp = page_fps.get(full_link)
+                # Stale but unchanged page: keep the stored record, skip PDF and model work
+                known = state.lookup_unchanged(job_id, page_fp) if state is not None and page_fp else None
+                if known is not None:
+                    jobs.append(dict(known, listing_key=job_id))
+                    continue
+
+                details = {
+                    "last_date": "Not Specified",
+                    "official_link": full_link,
+                    "is_gov": False,
+                    "pdf_url": None,
+                    "pdf_sha": None,
+                    "pdf_info": None,
+                }
+                if full_link in extracted:
+                    details = finish_deep_crawl(full_link, extracted[full_link], worker)
+                is_gov = details["is_gov"]
+                pdf_info = details["pdf_info"]
 
                 job = {
-                    "title": pdf_info["title"] if pdf_info and pdf_info["title"] else job_title,
-                    "category": categorize(job_title),
+                    "listing_key": job_id,
+                    "title": job_title,
+                    "category": None,  # set by categorize_jobs()
                     "state": "N/A",
-                    "last_date": pdf_info["last_date"] if pdf_info and pdf_info["last_date"] else last_date,
-                    "apply_link": pdf_info["apply_link"] if pdf_info and pdf_info["apply_link"] else official_link,
+                    "last_date": details["last_date"],
+                    "apply_link": details["official_link"],
                     "is_gov": is_gov,
-                    "pdf_url": pdf_url,
-                    "pdf_parsed": bool(pdf_info)
+                    "pdf_url": details["pdf_url"],
+                    "pdf_parsed": False
                 }
-                if 'description' in locals():
-                    job['description'] = description
-                if summarizer and job.get('description'):
-                    try:
-                        summary = summarizer(job['description'], max_length=60, min_length=15, do_sample=False)[0]['summary_text']
-                        job['summary'] = summary.strip()
-                    except Exception as e:
-                        logging.warning(f"Summarization failed: {e}")
-                        job['summary'] = job.get('description', '')[:180]
-
-                # --- AI Skill Extraction ---
-                if job.get('description'):
-                    job['skills'] = extract_skills(job['description'])
-
-                # --- AI FAQ Generation ---
-                if job.get('description'):
-                    job['faqs'] = generate_faqs(job['description'])
-
-                # --- Hindi Summary Generation ---
-                if translator and job.get('summary'):
-                    try:
-                        summary_hi = translator(job['summary'])[0]['translation_text']
-                        job['summary_hi'] = summary_hi.strip()
-                    except Exception as e:
-                        logging.warning(f"Hindi summary translation failed: {e}")
-                        job['summary_hi'] = ''
+                apply_pdf_info(job, pdf_info)
+                if details.get("description"):
+                    job["description"] = details["description"]
 
                 jobs.append(job)
+                pdf_sha = details["pdf_sha"]
+                if worker is not None and pdf_sha and not get_pdf_store().is_parsed(pdf_sha):
+                    awaiting_pdf.append((job, job_id, page_fp, pdf_sha))
+                elif state is not None and full_link in extracted:
+                    # A failed deep crawl is not remembered, so the next run fetches the page again
+                    state.record(job_id, job, page_fp)
                 logging.info(f" Scraped: {job['title']} ({' GOV' if is_gov else ' NON-GOV'}){' [PDF]' if pdf_info else ''}")
 
-        except Exception as e:
-            logging.warning(f" Failed to fetch from {site}: {e}")
+            except Exception as e:
+                logging.warning(f" Failed to process {full_link}: {e}")
 
+    # Merge batched Donut results into the jobs that were waiting on their PDFs
+    if awaiting_pdf:
+        logging.info(f"🧠 Waiting for model inference on {worker.pending} PDFs")
+        with METRICS.stage("private.donut_inference"):
+            outputs = worker.collect()
+        store = get_pdf_store()
+        for job, job_id, page_fp, pdf_sha in awaiting_pdf:
+            if store.is_parsed(pdf_sha):
+                pdf_info = store.info(pdf_sha)
+            else:
+                pdf_info = resolve_pdf_info(pdf_sha, outputs.get(pdf_sha))
+            apply_pdf_info(job, pdf_info)
+            if state is not None:
+                state.record(job_id, job, page_fp)
+
+    categorize_jobs(jobs)
     return jobs
 
+def fetch_private_portal_jobs():
+    """Scrape jobs from private portals with deduplication and deep crawl."""
+    return [job for _, jobs in crawl_private_jobs(discover_private_candidates()) for job in jobs]
+
+def stream_jobs(checkpoint=None):
+    """
+    Discover, fetch and extract jobs as a stream of (keys, jobs) chunks:
+    the government portals first, then the private aggregators chunk by
+    chunk. Keys are the private candidates' job ids, for the checkpoint.
+    """
+    with METRICS.stage("govt_portals"):
+        gov_jobs = fetch_govt_portal_jobs()
+    yield [], gov_jobs
+    with METRICS.stage("private_portals"):
+        candidates = discover_private_candidates()
+    resumed = sum(1 for c in candidates if checkpoint is not None and c[3] in checkpoint)
+    if resumed:
+        logging.info(f"⏯️ {resumed} listings were saved by the interrupted run and are not crawled again")
+    yield from crawl_private_jobs(candidates, checkpoint)
+
+_job_writer = None
+
+def get_job_writer():
+    """Return this run's diff-based job writer (created on first use)."""
+    global _job_writer
+    if _job_writer is None:
+        ensure_jobs_dir()
+        _job_writer = JobWriter(JOBS_DIR, skip=(JOB_MANIFEST,))
+    return _job_writer
+
+def close_job_writer(force=False):
+    """If anything changed (or `force`): refresh the manifest and indexes and write the run's changelog."""
+    global _job_writer
+    if _job_writer is not None:
+        _job_writer.publish(JOB_MANIFEST, force=force)
+        _job_writer = None
+
+_job_store = None
+
+def get_job_store():
+    """Return the SQLite job store (seeded from jobs/ on first use), or None with the file backend."""
+    global _job_store
+    if JOB_STORE == "sqlite" and _job_store is None:
+        _job_store = SqliteJobStore(JOB_DB_PATH)
+        if not len(_job_store):
+            ensure_jobs_dir()
+            import_files(_job_store, JOBS_DIR, skip=(JOB_MANIFEST,))  # under their current filenames
+    return _job_store
+
+def export_job_store():
+    """Regenerate jobs/ from the store (only changed files are written)."""
+    store = get_job_store()
+    if store is not None:
+        export_static(store, get_job_writer())
+
+def close_job_store():
+    global _job_store
+    if _job_store is not None:
+        _job_store.close()
+        _job_store = None
+
 def save_jobs(jobs):
-    """Save jobs to files and generate job_manifest.json."""
-    ensure_jobs_dir()
-    manifest = []
+    """Write new or changed jobs under stable filenames (see job_key); unchanged files are left untouched."""
+    store = get_job_store()
+    if store is not None:
+        ids = set(store.ids())
+        saved = files_by_id(ids)
+        legacy = set(ids) - set(saved.values())
+        records = {}
+        for job in jobs:
+            fname = saved_filename(job, saved)
+            old = slugify(job["title"])
+            if fname not in ids and old in legacy:
+                # A record imported under its title-only name keeps it (and its public URL)
+                stored = store.get(old) or {}
+                if stored.get("title") == job["title"] and stored.get("apply_link") == job.get("apply_link"):
+                    fname = old
+            records[fname] = job
+        changed = store.upsert_many(records)
+        logging.info(f"🗄️ Upserted {len(jobs)} jobs into {JOB_DB_PATH} ({changed} new or changed)")
+        return
+    writer = get_job_writer()
+    saved = files_by_id(writer.job_files())
     for job in jobs:
-        fname = slugify(job["title"])
+        fname = saved_filename(job, saved)
+        saved[job_key(job)[:12]] = fname
         try:
-            with open(os.path.join(JOBS_DIR, fname), "w", encoding="utf-8") as f:
-                json.dump(job, f, indent=2, ensure_ascii=False)
-            manifest.append(fname)
-            logging.info(f"🗂️ Saved: {fname}")
+            legacy = slugify(job["title"])
+            if not os.path.exists(writer.path(fname)) and os.path.exists(writer.path(legacy)):
+                with open(writer.path(legacy), encoding="utf-8") as f:
+                    old = json.load(f)
+                if old.get("title") == job["title"] and old.get("apply_link") == job.get("apply_link"):
+                    writer.rename(legacy, fname)
+            change = writer.save(fname, job)
+            if change:
+                logging.info(f"🗂️ {change.capitalize()}: {fname}")
         except Exception as e:
             logging.error(f"❌ Could not save job '{job['title']}': {e}")
 
-    # Write manifest
-    try:
-        with open(os.path.join(JOBS_DIR, JOB_MANIFEST), "w", encoding="utf-8") as f:
-            json.dump(manifest, f, indent=2, ensure_ascii=False)
-        logging.info(f"🗂️ Updated {JOB_MANIFEST} with {len(manifest)} jobs.")
-    except Exception as e:
-        logging.error(f"❌ Could not write job manifest: {e}")
-
 def delete_expired_jobs():
-    """Delete jobs whose last_date has passed."""
-    ensure_jobs_dir()
-    today = date.today()
-    deleted = 0
-    for file in os.listdir(JOBS_DIR):
-        if not file.endswith(".json") or file == JOB_MANIFEST:
-            continue
-        path = os.path.join(JOBS_DIR, file)
+    """Delete (or archive) jobs whose last_date has passed, found by a range query on the expiry index."""
+    writer = get_job_writer()
+    store = get_job_store()
+    expired = store.expired(date.today()) if store is not None else writer.expiry.expired(date.today())
+    if store is not None:
+        store.remove(file for file, _ in expired)
+    for file, last_date in expired:
         try:
-            with open(path, encoding="utf-8") as f:
-                job = json.load(f)
-            last_date_str = job.get("last_date")
-            if last_date_str and last_date_str != "Not Specified":
-                try:
-                    last_date = dateparser.parse(last_date_str, dayfirst=True).date()
-                    if last_date < today:
-                        os.remove(path)
-                        deleted += 1
-                        logging.info(f"🗑️ Deleted expired job: {file}")
-                except Exception as e:
-                    logging.warning(f"❌ Invalid date in {file}: {last_date_str} ({e})")
+            archive_dir = os.path.join(JOBS_DIR, ARCHIVE_DIR, last_date[:7]) if ARCHIVE_EXPIRED else None
+            writer.remove(file, f"expired {last_date}", archive_dir=archive_dir)
+            logging.info(f"🗑️ {'Archived' if ARCHIVE_EXPIRED else 'Deleted'} expired job: {file}")
         except Exception as e:
-            logging.warning(f"❌ Error checking expiry for {file}: {e}")
-    if deleted:
-        logging.info(f"🧹 Deleted {deleted} expired jobs.")
-
-def escape_markdown(text):
-    # Escape Telegram Markdown special characters
-    if not text:
-        return ''
-    for ch in ('_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!'):
-        text = text.replace(ch, f'\\{ch}')
-    return text
+            logging.warning(f"❌ Error removing expired job {file}: {e}")
+    if expired:
+        logging.info(f"🧹 {'Archived' if ARCHIVE_EXPIRED else 'Deleted'} {len(expired)} expired jobs.")
+
+_telegram = None
+
+def get_telegram_dispatcher():
+    """Return this run's Telegram dispatcher (created on first use), or None without a bot token."""
+    global _telegram
+    if TELEGRAM_BOT_TOKEN and _telegram is None:
+        _telegram = TelegramDispatcher(
+            TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, Outbox(TELEGRAM_OUTBOX), api_base=TELEGRAM_API_BASE
+        )
+    return _telegram
+
+def close_telegram_dispatcher():
+    global _telegram
+    if _telegram is not None:
+        _telegram.close()
+        _telegram = None
 
 def send_telegram_notification(jobs):
-    """Send top 5 new jobs to Telegram group using Markdown. Includes title, deadline, summary, tags, and apply link."""
-    if not jobs:
-        logging.info("No jobs to notify on Telegram.")
-        return
-    top_jobs = jobs[:5]
-    for job in top_jobs:
-        title = escape_markdown(job.get('title', 'New Job'))
-        deadline = job.get('last_date') or job.get('deadline') or ''
-        summary = escape_markdown(job.get('summary') or job.get('description', '')[:180])
-        tags = job.get('tags') or job.get('skills') or []
-        tags_str = ''
-        if tags and isinstance(tags, list):
-            tags_str = ' | '.join([escape_markdown(str(t)) for t in tags])
-        link = job.get('apply_link') or job.get('url') or ''
-        message = f"*{title}*"
-        if deadline:
-            message += f"\n🗓️ Deadline: {escape_markdown(deadline)}"
-        if summary:
-            message += f"\n{summary}"
-        if tags_str:
-            message += f"\n🏷️ {tags_str}"
-        if link:
-            message += f"\n[Apply Here]({link})"
-        payload = {
-            "chat_id": TELEGRAM_CHAT_ID,
-            "text": message,
-            "parse_mode": "MarkdownV2"
-        }
-        try:
-            resp = requests.post(f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage", json=payload, timeout=10)
-            if resp.status_code == 200:
-                logging.info(f"Telegram notification sent for: {title}")
-            else:
-                logging.warning(f"Failed to send Telegram notification: {resp.text}")
-        except Exception as e:
-            logging.error(f"Telegram notification error: {e}")
+    """
+    Announce new jobs on Telegram as digest messages. Jobs are keyed by
+    job_key(), so a corrected title or link doesn't announce a job again.
+    Jobs already in the outbox are skipped; with no outbox yet (first run or
+    lost cache) the run's jobs are recorded without sending, so the channel
+    isn't flooded.
+    """
+    dispatcher = get_telegram_dispatcher()
+    if dispatcher is None:
+        return 0
+    outbox = dispatcher.outbox
+    today = date.today().isoformat()
+    keyed = [
+        (job_key(job), job) for job in jobs
+        if (parse_last_date(job.get('last_date')) or today) >= today
+    ]
+    # Outboxes written before the switch hold title + apply_link hashes
+    outbox.mark(job_id for job_id, job in keyed
+                if job_id not in outbox and job_hash(job['title'], job.get('apply_link', '')) in outbox)
+    if outbox.new:
+        outbox.mark(job_id for job_id, _ in keyed)
+        outbox.save()
+        logging.info(f"📨 Telegram outbox created with {len(keyed)} existing jobs; new jobs are sent from the next run")
+        return 0
+    return dispatcher.notify(keyed)
 
-# =======================
-# MAIN EXECUTION BLOCK
-# =======================
+def dedupe_jobs(jobs, seen, near):
+    """Drop jobs already seen this run (by title+link hash) and merge near-duplicates."""
+    unique = []
+    for job in jobs:
+        job_id = job_hash(job['title'], job.get('apply_link', ''))
+        if job_id not in seen:
+            seen.add(job_id)
+            unique.append(job)
+    return near.filter(unique) if near is not None else unique
 
-if __name__ == "__main__":
+def main():
     logging.info("🔄 Starting job scraping...")
     ensure_jobs_dir()
-    # Scrape official government portals
-    gov_jobs = fetch_govt_portal_jobs()
-    # Scrape private aggregator portals
-    private_jobs = fetch_private_portal_jobs()
-    # Combine and deduplicate jobs (by title+link hash)
-    all_jobs = {job_hash(j['title'], j.get('apply_link','')): j for j in gov_jobs + private_jobs}
-    jobs = list(all_jobs.values())
-    save_jobs(jobs)
-    delete_expired_jobs()
-    logging.info(f"✅ {len(jobs)} jobs scraped, saved, and cleaned.")
+    checkpoint = Checkpoint(CHECKPOINT_FILE, max_age=CHECKPOINT_MAX_AGE)
+    seen = set()
+    near = NearDupFilter(NEAR_DUP_THRESHOLD) if NEAR_DUPES else None
+    total = enriched = 0
+    try:
+        # Crawl in a background thread, at most PIPELINE_BUFFER chunks ahead of enrichment
+        for keys, jobs in prefetch(stream_jobs(checkpoint), depth=PIPELINE_BUFFER, name="crawl"):
+            # Merge the same notification picked up from several sources before enrichment
+            with METRICS.stage("near_dupes"):
+                jobs = dedupe_jobs(jobs, seen, near)
+            # Batched AI enrichment for new jobs (summaries, skills, FAQs, Hindi)
+            with METRICS.stage("enrichment"):
+                enriched += enrich_jobs(jobs, get_model, batch_size=ENRICH_BATCH_SIZE)
+            with METRICS.stage("save"):
+                save_jobs(jobs)
+            with METRICS.stage("telegram"):
+                send_telegram_notification(jobs)
+            # The saved records go into the checkpoint, so a resumed run needs no other cache
+            saved = set(keys)
+            checkpoint.mark(keys, {job["listing_key"]: job for job in jobs if job.get("listing_key") in saved})
+            total += len(jobs)
+        with METRICS.stage("save"):
+            delete_expired_jobs()
+        with METRICS.stage("publish"):
+            export_job_store()
+            close_job_writer(force=checkpoint.resumed)
+        checkpoint.clear()
+    finally:
+        # Also done if the run fails: what was saved gets indexed and the next run resumes with warm caches
+        close_job_writer(force=checkpoint.resumed)
+        close_job_store()
+        close_telegram_dispatcher()
+        close_http_cache()
+        close_host_health()
+        close_crawl_state()
+        close_pdf_store()
+        close_donut_worker()
+        close_parse_pool()
+    report_model_loads()
+    if near is not None:
+        logging.info(f"🧬 Merged {near.merged} near-duplicate jobs")
+    METRICS.set("jobs_scraped", total)
+    METRICS.set("jobs_enriched", enriched)
+    METRICS.write(RUN_REPORT, METRICS_PROM)
+    logging.info(f"⏱️ {METRICS.summary()}")
+    logging.info(f"📊 Run report written to {RUN_REPORT}")
+    logging.info(f"✅ {total} jobs scraped, saved, and cleaned.")
+
+def profile_main():
+    """Run main() under cProfile, save the stats and log the top functions."""
+    import cProfile
+    import io
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(main)
+    finally:
+        os.makedirs(os.path.dirname(PROFILE_FILE), exist_ok=True)
+        profiler.dump_stats(PROFILE_FILE)
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(30)
+        logging.info(f"🔬 Profile saved to {PROFILE_FILE}\n{out.getvalue()}")
+
+if __name__ == "__main__":
+    if "--profile" in sys.argv[1:]:
+        profile_main()
+    else:
+        main()
@@ -0,0 +1,187 @@
+# host_health.py
+# Per-host health for the crawl engine, kept across runs.
+# Records each host's recent request latencies and its error history, and
+# from them derives:
+#   - an adaptive connect / first-byte timeout (a multiple of the host's p95
+#     time to response headers, bounded by REQUEST_TIMEOUT), so a
+#     slow-but-alive host keeps its long timeout and a fast one fails fast
+#     when it hangs. Only waiting for the server adapts: the total for a
+#     request stays REQUEST_TIMEOUT, so a multi-MB PDF from a fast host can
+#     still finish downloading;
+#   - retries with jittered exponential backoff for transient failures
+#     (timeouts, connection errors, 429 and 5xx);
+#   - a circuit breaker: after `breaker_threshold` consecutive failed
+#     attempts the host is skipped for the rest of the run. A host that
+#     ended the previous run broken gets one attempt before it is skipped.
+# robots.txt is fetched at most once a day per host and only its parsed
+# crawl-delay is stored; requests to that host are then spaced out by it.
+#
+# Stored in .cache/host_health.json: {host: {"latencies": [...], "ok": n,
+# "errors": n, "consecutive_failures": n, "last_seen": ts, "last_error": str,
+# "robots": {"fetched": ts, "crawl_delay": seconds or null}}}
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from urllib import robotparser
+from urllib.parse import urlsplit
+
+LATENCY_SAMPLES = 50          # recent latencies (time to response headers) kept per host
+MIN_SAMPLES = 5               # latencies needed before the timeout adapts
+TIMEOUT_FACTOR = 4            # first-byte timeout = p95 latency x this ...
+MIN_TIMEOUT = 4.0             # ... but never below this many seconds
+ROBOTS_TTL = 86400            # refetch robots.txt once a day
+ROBOTS_TIMEOUT = 5
+MAX_CRAWL_DELAY = 10.0        # cap on a robots.txt crawl-delay, in seconds
+RETENTION = 90 * 86400        # forget hosts not contacted for 90 days
+TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+
+
+def origin_of(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def parse_crawl_delay(text: str, user_agent: str) -> Optional[float]:
+    """Crawl-delay (or 1/request-rate) for user_agent from a robots.txt body, or None."""
+    parser = robotparser.RobotFileParser()
+    parser.parse(text.splitlines())
+    parser.modified()  # crawl_delay() answers None for a parser that was never "read"
+    delay = parser.crawl_delay(user_agent)
+    if delay is None:
+        rate = parser.request_rate(user_agent)
+        if rate and rate.requests:
+            delay = rate.seconds / rate.requests
+    return min(float(delay), MAX_CRAWL_DELAY) if delay else None
+
+
+class HostHealth:
+    def __init__(self, path: str, base_timeout: float = 15, max_retries: int = 2,
+                 breaker_threshold: int = 5, backoff_base: float = 1.0, user_agent: str = "*"):
+        self.path = path
+        self.base_timeout = base_timeout
+        self.max_retries = max_retries
+        self.breaker_threshold = breaker_threshold
+        self.backoff_base = backoff_base
+        self.user_agent = user_agent
+        self.open_circuits: Dict[str, str] = {}  # host -> error that tripped the breaker
+        self.retries = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict] = self._load()
+        # Hosts that were failing when the last run ended get a single attempt
+        self._probation = {h for h, s in self._hosts.items() if s.get("consecutive_failures", 0) >= breaker_threshold}
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.warning(f"⚠️ Host health file unreadable, starting fresh: {e}")
+            return {}
+
+    def _stats(self, host: str) -> Dict:
+        return self._hosts.setdefault(host, {
+            "latencies": [], "ok": 0, "errors": 0, "consecutive_failures": 0,
+        })
+
+    # ---------- timeouts, retries, breaker ----------
+    def first_byte_timeout(self, host: str) -> float:
+        """
+        Adaptive connect / read timeout: p95 of recent latencies x
+        TIMEOUT_FACTOR, within [MIN_TIMEOUT, base_timeout]. Not meant as a
+        total: the body download is bounded by base_timeout alone.
+        """
+        latencies = sorted(self._hosts.get(host, {}).get("latencies", []))
+        if len(latencies) < MIN_SAMPLES:
+            return self.base_timeout
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return min(self.base_timeout, max(MIN_TIMEOUT, p95 * TIMEOUT_FACTOR))
+
+    def allow(self, host: str) -> bool:
+        """False once the host's circuit breaker has tripped this run."""
+        if host in self.open_circuits:
+            self.skipped += 1
+            return False
+        return True
+
+    @staticmethod
+    def is_transient(status: int) -> bool:
+        """Worth retrying: no response at all (timeout, connection error), 429 or 5xx."""
+        return status == 0 or status in TRANSIENT_STATUS
+
+    def should_retry(self, host: str, status: int, attempt: int) -> bool:
+        return attempt < self.max_retries and self.is_transient(status) and host not in self.open_circuits
+
+    def backoff(self, host: str, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before retry number `attempt + 1` (jittered, at least the crawl delay)."""
+        wait = self.backoff_base * (2 ** attempt) * (0.5 + random.random())
+        if retry_after and retry_after.isdigit():
+            wait = max(wait, min(float(retry_after), 30.0))
+        with self._lock:
+            self.retries += 1
+        return max(wait, self.crawl_delay(host))
+
+    def record(self, host: str, status: int, seconds: float, error: Optional[str] = None):
+        """Record one network attempt (status 0 = no response); seconds is the time to response headers."""
+        with self._lock:
+            stats = self._stats(host)
+            stats["last_seen"] = time.time()
+            if error is None or not self.is_transient(status):
+                # Any HTTP answer other than 429/5xx means the host is up
+                stats["ok"] += 1
+                stats["consecutive_failures"] = 0
+                stats["latencies"] = (stats["latencies"] + [round(seconds, 3)])[-LATENCY_SAMPLES:]
+                self._probation.discard(host)
+                return
+            stats["errors"] += 1
+            stats["consecutive_failures"] += 1
+            stats["last_error"] = error
+            threshold = 1 if host in self._probation else self.breaker_threshold
+            if stats["consecutive_failures"] >= threshold and host not in self.open_circuits:
+                self.open_circuits[host] = error
+                logging.warning(f"🚫 {host} is failing ({error}); skipping it for the rest of the run")
+
+    # ---------- robots.txt ----------
+    def robots_needed(self, urls: Iterable[str]) -> List[str]:
+        """Origins whose robots.txt is missing or older than ROBOTS_TTL."""
+        now, needed = time.time(), set()
+        for url in urls:
+            origin = origin_of(url)
+            host = urlsplit(origin).netloc.lower()
+            robots = self._hosts.get(host, {}).get("robots")
+            if host not in self.open_circuits and (robots is None or now - robots["fetched"] > ROBOTS_TTL):
+                needed.add(origin)
+        return sorted(needed)
+
+    def set_robots(self, origin: str, status: int, text: str):
+        """Store the crawl delay from a fetched robots.txt (missing or unreadable = no delay)."""
+        delay = parse_crawl_delay(text, self.user_agent) if status == 200 else None
+        with self._lock:
+            self._stats(urlsplit(origin).netloc.lower())["robots"] = {"fetched": time.time(), "crawl_delay": delay}
+        if delay:
+            logging.info(f"🤖 {origin} asks for a crawl delay of {delay:.1f}s")
+
+    def crawl_delay(self, host: str) -> float:
+        robots = self._hosts.get(host, {}).get("robots") or {}
+        return robots.get("crawl_delay") or 0.0
+
+    # ---------- persistence ----------
+    def close(self):
+        cutoff = time.time() - RETENTION
+        hosts = {h: s for h, s in self._hosts.items() if s.get("last_seen", time.time()) >= cutoff}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(hosts, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def report(self) -> str:
+        broken = ", ".join(sorted(self.open_circuits)) or "none"
+        return f"Host health: {self.retries} retries, {self.skipped} requests skipped, circuit open for: {broken}"
@@ -0,0 +1,69 @@
+# html_workers.py
+# Worker pool for CPU-bound HTML parsing and extraction.
+# BeautifulSoup parsing of large aggregator pages holds the GIL, so the
+# extraction functions in fetch_jobs.py are run in a process pool that takes
+# raw HTML bytes and returns plain job records.
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, List, Tuple
+
+
+def resolve_parser(preferred: str) -> str:
+    """Return `preferred` if its BeautifulSoup backend is installed, else the stdlib parser."""
+    if preferred == "lxml":
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            logging.info("lxml not installed, using html.parser")
+            return "html.parser"
+    return preferred
+
+
+def decode_html(content: bytes, encoding: str) -> str:
+    return content.decode(encoding or "utf-8", errors="replace")
+
+
+def _call(fn: Callable, args: Tuple) -> Tuple[bool, Any]:
+    """Run fn(*args) and return (ok, result or error message) so one bad page can't fail a batch."""
+    try:
+        return True, fn(*args)
+    except Exception as e:
+        return False, f"{type(e).__name__}: {e}"
+
+
+class ParsePool:
+    """
+    Map extraction functions over pages.
+    `workers` is the number of processes; 0 runs everything inline on the
+    calling thread (useful for debugging). Batches smaller than `min_batch`
+    are parsed inline too: for a handful of pages, starting the processes
+    and pickling the HTML costs more than the parsing it saves. Functions
+    and arguments must be picklable (module-level functions, bytes, str).
+    """
+
+    def __init__(self, workers: int = 0, min_batch: int = 2):
+        self.workers = max(0, workers)
+        self.min_batch = max(2, min_batch)
+        self._executor = None
+
+    def map(self, fn: Callable, arg_tuples: Iterable[Tuple]) -> List[Tuple[bool, Any]]:
+        arg_tuples = list(arg_tuples)
+        if self.workers == 0 or len(arg_tuples) < self.min_batch:
+            return [_call(fn, args) for args in arg_tuples]
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        chunksize = max(1, len(arg_tuples) // (self.workers * 4))
+        return list(self._executor.map(_call, [fn] * len(arg_tuples), arg_tuples, chunksize=chunksize))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def default_workers() -> int:
+    """One process per spare core; 0 (inline) when there is no spare core, since map() blocks the caller."""
+    spare = (os.cpu_count() or 1) - 1
+    return spare if spare >= 2 else 0
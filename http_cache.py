@@ -0,0 +1,222 @@
+# http_cache.py
+# Persistent on-disk HTTP response cache with conditional revalidation.
+# Bodies are stored next to their validators (ETag / Last-Modified) so the
+# next run can send If-None-Match / If-Modified-Since and reuse the cached
+# body on a 304. Parsed results can be attached to an entry with annotate();
+# they are dropped automatically whenever a new body is stored. Callers that
+# keep the body elsewhere (the PDF store) can store the validators only.
+
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+INDEX_FILE = "index.json"
+
+
+@dataclass
+class CacheStats:
+    """Counters reported at the end of a run."""
+    hits: int = 0            # served from cache without touching the network
+    revalidations: int = 0   # server answered 304 Not Modified
+    misses: int = 0          # no usable entry, full download
+    stores: int = 0          # bodies written to disk
+    evictions: int = 0       # entries removed by TTL or size budget
+    bytes_saved: int = 0     # body bytes not re-downloaded
+
+    def report(self) -> str:
+        return (
+            f"HTTP cache: {self.hits} hits, {self.revalidations} revalidated (304), "
+            f"{self.misses} misses, {self.stores} stored, {self.evictions} evicted, "
+            f"{self.bytes_saved / 1024:.1f} KiB saved"
+        )
+
+
+def cache_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    URL-keyed response cache.
+    `ttl` is the maximum age (seconds since the entry was last stored or
+    revalidated) before an entry is discarded; `fresh_for` is the window in
+    which an entry is served without revalidation; `max_bytes` caps the total
+    body size on disk, evicting least recently used entries first.
+    """
+
+    def __init__(self, cache_dir, ttl=30 * 86400, max_bytes=512 * 1024 * 1024, fresh_for=0):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.fresh_for = fresh_for
+        self.stats = CacheStats()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index: Dict[str, Dict[str, Any]] = self._load_index()
+
+    # ---------- index persistence ----------
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        path = os.path.join(self.cache_dir, INDEX_FILE)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.warning(f"⚠️ HTTP cache index unreadable, starting empty: {e}")
+            return {}
+
+    def close(self):
+        """Evict stale entries and persist the index."""
+        self.evict()
+        path = os.path.join(self.cache_dir, INDEX_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".bin")
+
+    # ---------- lookups ----------
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the entry metadata for url, or None if absent or expired."""
+        key = cache_key(url)
+        meta = self._index.get(key)
+        if meta is None:
+            return None
+        if time.time() - meta["stored_at"] > self.ttl or (
+                meta.get("body", True) and not os.path.exists(self._body_path(key))):
+            self._drop(key)
+            return None
+        return meta
+
+    def is_fresh(self, meta: Dict[str, Any]) -> bool:
+        return time.time() - meta["stored_at"] <= self.fresh_for
+
+    def read_body(self, meta: Dict[str, Any]) -> bytes:
+        """The cached body, or b"" for a validators-only entry."""
+        meta["last_access"] = time.time()
+        if not meta.get("body", True):
+            return b""
+        with open(self._body_path(meta["key"]), "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def validators(meta: Dict[str, Any]) -> Dict[str, str]:
+        """Conditional request headers for a cached entry."""
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    # ---------- updates ----------
+
+    def record_hit(self, meta: Dict[str, Any]):
+        self.stats.hits += 1
+        self.stats.bytes_saved += meta["size"]
+
+    def record_miss(self):
+        self.stats.misses += 1
+
+    def revalidated(self, meta: Dict[str, Any], headers: Dict[str, str]):
+        """Server returned 304: extend the entry's lifetime and refresh validators."""
+        meta["stored_at"] = time.time()
+        meta["etag"] = headers.get("etag") or meta.get("etag")
+        meta["last_modified"] = headers.get("last-modified") or meta.get("last_modified")
+        self.stats.revalidations += 1
+        self.stats.bytes_saved += meta["size"]
+
+    def store(self, url: str, content: bytes, headers: Dict[str, str], encoding: str = "utf-8",
+              keep_body: bool = True):
+        """
+        Store a fresh 200 response. Headers are expected with lowercase keys.
+        With keep_body=False only the validators are kept: the caller stores
+        the body itself and gets an empty body back on a hit or 304.
+        """
+        key = cache_key(url)
+        if "no-store" in headers.get("cache-control", "").lower():
+            # The old entry no longer describes this page: drop its body, validators and annotations
+            if key in self._index:
+                self._drop(key)
+            return
+        if keep_body:
+            tmp = self._body_path(key) + ".tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(content)
+                os.replace(tmp, self._body_path(key))
+            except OSError as e:
+                logging.warning(f"⚠️ Could not cache {url}: {e}")
+                return
+        else:
+            try:
+                os.remove(self._body_path(key))
+            except FileNotFoundError:
+                pass
+        now = time.time()
+        self._index[key] = {
+            "key": key,
+            "url": url,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "encoding": encoding,
+            "size": len(content),
+            "stored_at": now,
+            "last_access": now,
+            "annotations": {},
+            "body": keep_body,
+        }
+        self.stats.stores += 1
+
+    def forget(self, url: str):
+        """Drop the entry for url, if any."""
+        key = cache_key(url)
+        if key in self._index:
+            self._drop(key)
+
+    def annotate(self, url: str, name: str, value: Any):
+        """Attach a derived (JSON-serialisable) result to the cached body of url."""
+        meta = self._index.get(cache_key(url))
+        if meta is not None:
+            meta["annotations"][name] = value
+
+    def annotation(self, url: str, name: str) -> Any:
+        """Return a derived result for url if its body hasn't changed since it was attached."""
+        meta = self._index.get(cache_key(url))
+        if meta is None:
+            return None
+        return meta["annotations"].get(name)
+
+    # ---------- eviction ----------
+
+    def _drop(self, key: str):
+        self._index.pop(key, None)
+        try:
+            os.remove(self._body_path(key))
+        except FileNotFoundError:
+            pass
+        self.stats.evictions += 1
+
+    def evict(self):
+        """Drop entries older than ttl, then LRU entries until under max_bytes."""
+        now = time.time()
+        for key, meta in list(self._index.items()):
+            if now - meta["stored_at"] > self.ttl:
+                self._drop(key)
+        bodies = [meta for meta in self._index.values() if meta.get("body", True)]
+        total = sum(meta["size"] for meta in bodies)
+        if total <= self.max_bytes:
+            return
+        for meta in sorted(bodies, key=lambda m: m["last_access"]):
+            self._drop(meta["key"])
+            total -= meta["size"]
+            if total <= self.max_bytes:
+                break
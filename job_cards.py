@@ -0,0 +1,91 @@
+# job_cards.py
+# Card-sized copy of every job in the jobs/ folder.
+# Kept up to date by JobWriter next to the expiry index, so the list index
+# (job_index.py) and the search index (search_index.py) are rebuilt from
+# these few fields instead of opening and parsing every job file on every
+# run that changed something. Only files never seen before (first run,
+# hand-edited folders) are read from disk.
+#
+# Stored in jobs/expiry/cards.json:
+#   {"cards": {"job-a.json": {"title", "category", "state", ...}, ...}}
+
+import json
+import logging
+import os
+from typing import Dict, Iterable
+
+from expiry_index import EXPIRY_DIR
+from job_index import LIST_FIELDS
+from search_index import INDEXED_FIELDS
+
+CARDS_FILE = "cards.json"
+CARD_FIELDS = tuple(dict.fromkeys(LIST_FIELDS + INDEXED_FIELDS))
+
+
+def card(job: Dict) -> Dict:
+    """The fields of a job that the list and search indexes use."""
+    return {field: job[field] for field in CARD_FIELDS if job.get(field) not in (None, "")}
+
+
+class JobCards:
+    """{job filename: card} for every job file, persisted between runs."""
+
+    def __init__(self, jobs_dir: str):
+        self.path = os.path.join(jobs_dir, EXPIRY_DIR, CARDS_FILE)
+        self._cards: Dict[str, Dict] = {}
+        self.dirty = False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._cards = json.load(f).get("cards", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"⚠️ Could not load job cards, rebuilding: {e}")
+            self._cards = {}
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def jobs(self) -> Dict[str, Dict]:
+        """{filename: card}, in the shape build_index() and write_search_index() take."""
+        return dict(self._cards)
+
+    def set(self, filename: str, job: Dict):
+        entry = card(job)
+        if self._cards.get(filename) != entry:
+            self._cards[filename] = entry
+            self.dirty = True
+
+    def move(self, old: str, new: str):
+        if old in self._cards:
+            self._cards[new] = self._cards.pop(old)
+            self.dirty = True
+
+    def discard(self, filename: str):
+        if self._cards.pop(filename, None) is not None:
+            self.dirty = True
+
+    def sync(self, on_disk: Iterable[str], load_job):
+        """Reconcile with the job files actually present; only unseen files are loaded."""
+        on_disk = set(on_disk)
+        for filename in [f for f in self._cards if f not in on_disk]:
+            self.discard(filename)
+        for filename in sorted(on_disk - self._cards.keys()):
+            try:
+                job = load_job(filename)
+            except Exception as e:
+                logging.warning(f"⚠️ Skipping {filename} in index: {e}")
+                continue
+            if isinstance(job, dict):
+                self.set(filename, job)
+
+    def save(self):
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"cards": self._cards}, f, ensure_ascii=False, separators=(",", ":"))
+            f.write("\n")
+        os.replace(tmp, self.path)
+        self.dirty = False
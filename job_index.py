@@ -0,0 +1,136 @@
+# job_index.py
+# Consolidated, precompressed job index for the front end.
+# Instead of fetching job_manifest.json and then one file per job, the site
+# loads jobs/index/index.json plus one or two list chunks. Each chunk holds
+# only the fields a job card needs; the full job file is fetched when a card
+# is opened. Chunks are sharded by category ("all" holds every job) and
+# written as .json and .json.gz; script.js fetches the .gz and inflates it
+# with DecompressionStream. (No .br copies: browsers cannot inflate brotli
+# from script, so nothing would ever request them.)
+#
+# Layout:
+#   jobs/index/index.json        {"generated", "total", "chunk_size", "shards": {name: {...}}}
+#   jobs/index/<shard>-<n>.json  [{"id", "title", "category", ...}, ...]
+
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Dict, List
+
+INDEX_DIR = "index"
+INDEX_FILE = "index.json"
+CHUNK_SIZE = 200
+ALL_SHARD = "all"
+# Fields shown on a job card; everything else stays in the per-job file
+LIST_FIELDS = ("title", "category", "state", "last_date", "apply_link", "pdf_url", "is_gov")
+
+
+def shard_name(category: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", (category or "general").lower()).strip("-") or "general"
+
+
+def list_entry(job_id: str, job: Dict) -> Dict:
+    """Card-sized view of a job; `id` is the job's filename under jobs/."""
+    entry = {"id": job_id}
+    for field in LIST_FIELDS:
+        if job.get(field) not in (None, ""):
+            entry[field] = job[field]
+    return entry
+
+
+def _sort_key(entry: Dict):
+    # Upcoming deadlines first, then undated jobs, alphabetically
+    last_date = entry.get("last_date", "Not Specified")
+    return (last_date == "Not Specified", last_date, entry.get("title", ""))
+
+
+def _write(path: str, data: bytes) -> int:
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        with open(path, "rb") as f:
+            if f.read() == data:  # unchanged: keep the file (and its git/CDN state) as is
+                return len(data)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return len(data)
+
+
+def write_compressed(path: str, payload) -> Dict[str, int]:
+    """Write payload as compact JSON plus a gzipped sibling; returns bytes per encoding."""
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    sizes = {"json": _write(path, raw)}
+    sizes["gzip"] = _write(path + ".gz", gzip.compress(raw, compresslevel=9, mtime=0))
+    if os.path.exists(path + ".br"):  # left by versions that also wrote brotli copies
+        os.remove(path + ".br")
+    return sizes
+
+
+def load_jobs(jobs_folder: str, skip: tuple = ()) -> Dict[str, Dict]:
+    """Read every job JSON in jobs_folder (top level only), keyed by filename."""
+    jobs = {}
+    for filename in sorted(os.listdir(jobs_folder)):
+        if not filename.endswith(".json") or filename in skip:
+            continue
+        try:
+            with open(os.path.join(jobs_folder, filename), encoding="utf-8") as f:
+                job = json.load(f)
+        except Exception as e:
+            logging.warning(f"⚠️ Skipping {filename} in index: {e}")
+            continue
+        if isinstance(job, dict):
+            jobs[filename] = job
+    return jobs
+
+
+def build_index(jobs_folder: str, jobs: Dict[str, Dict], chunk_size: int = CHUNK_SIZE) -> Dict:
+    """Write the sharded, chunked list index for `jobs` ({filename: job}) and return index.json's content."""
+    index_dir = os.path.join(jobs_folder, INDEX_DIR)
+    os.makedirs(index_dir, exist_ok=True)
+
+    entries = sorted((list_entry(job_id, job) for job_id, job in jobs.items()), key=_sort_key)
+    shards: Dict[str, List[Dict]] = {ALL_SHARD: entries}
+    labels = {ALL_SHARD: "All"}
+    for entry in entries:
+        name = shard_name(entry.get("category"))
+        if name == ALL_SHARD:
+            name += "-jobs"
+        shards.setdefault(name, []).append(entry)
+        labels.setdefault(name, entry.get("category") or "General")
+
+    written, total_bytes = set(), {}
+    meta = {}
+    for name, items in shards.items():
+        chunks = []
+        for n, start in enumerate(range(0, max(len(items), 1), chunk_size)):
+            filename = f"{name}-{n}.json"
+            sizes = write_compressed(os.path.join(index_dir, filename), items[start:start + chunk_size])
+            for encoding, size in sizes.items():
+                total_bytes[encoding] = total_bytes.get(encoding, 0) + size
+            written.add(filename)
+            chunks.append(filename)
+        meta[name] = {"label": labels[name], "count": len(items), "chunks": chunks}
+
+    index = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "total": len(entries),
+        "chunk_size": chunk_size,
+        "encodings": ["gzip"],
+        "shards": meta,
+    }
+    write_compressed(os.path.join(index_dir, INDEX_FILE), index)
+    written.add(INDEX_FILE)
+
+    # Remove chunks left over from shards/pages that no longer exist
+    for filename in os.listdir(index_dir):
+        base = filename[:-3] if filename.endswith((".gz", ".br")) else filename
+        if base not in written:
+            os.remove(os.path.join(index_dir, filename))
+
+    sizes = ", ".join(f"{encoding} {size / 1024:.1f} KiB" for encoding, size in total_bytes.items())
+    logging.info(f"📇 Job index: {len(entries)} jobs in {len(shards)} shards ({sizes})")
+    return index
+
@@ -0,0 +1,211 @@
+# job_store.py
+# Pluggable job storage backends.
+# By default the jobs/ folder of JSON files is the store (JobWriter writes
+# it directly). With JOB_STORE=sqlite the records live in an embedded SQLite
+# database instead (WAL mode, indexed on category, state, last_date and
+# first_seen), which answers cross-job queries such as "jobs in Rajasthan",
+# "deadlines this week" or "new since yesterday" without loading every
+# file. The jobs/ folder, manifest and indexes the site needs are then
+# generated from the store by export_static().
+#
+# Export from the command line:
+#   python job_store.py [db_path] [jobs_dir]
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from expiry_index import parse_last_date
+from job_index import load_jobs
+from job_writer import JobWriter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           TEXT PRIMARY KEY,   -- job filename under jobs/
+    title        TEXT NOT NULL,
+    category     TEXT,
+    state        TEXT,
+    last_date    TEXT,               -- YYYY-MM-DD, NULL if not specified
+    first_seen   TEXT NOT NULL,      -- ISO timestamp of the first upsert
+    updated      TEXT NOT NULL,      -- ISO timestamp of the last content change
+    content_hash TEXT NOT NULL,
+    data         TEXT NOT NULL       -- full job record as JSON
+);
+CREATE INDEX IF NOT EXISTS jobs_category ON jobs (category);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state);
+CREATE INDEX IF NOT EXISTS jobs_last_date ON jobs (last_date);
+CREATE INDEX IF NOT EXISTS jobs_first_seen ON jobs (first_seen);
+"""
+
+UPSERT = """
+INSERT INTO jobs (id, title, category, state, last_date, first_seen, updated, content_hash, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    title = excluded.title, category = excluded.category, state = excluded.state,
+    last_date = excluded.last_date, updated = excluded.updated,
+    content_hash = excluded.content_hash, data = excluded.data
+WHERE jobs.content_hash != excluded.content_hash
+"""
+
+
+class JobStore(ABC):
+    """Interface shared by storage backends. Records are keyed by job filename."""
+
+    @abstractmethod
+    def upsert_many(self, jobs: Dict[str, Dict]) -> int:
+        """Insert or update {filename: job}; returns the number of new or changed records."""
+
+    @abstractmethod
+    def remove(self, ids: Iterable[str]) -> int:
+        """Delete records by filename; returns how many were removed."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict]:
+        """One record by filename, or None."""
+
+    @abstractmethod
+    def ids(self) -> List[str]:
+        """Every stored job filename."""
+
+    @abstractmethod
+    def query(self, category=None, state=None, deadline_from=None, deadline_to=None,
+              seen_since=None, limit=None) -> List[Tuple[str, Dict]]:
+        """(filename, job) pairs matching every given filter."""
+
+    def all_jobs(self) -> Iterable[Tuple[str, Dict]]:
+        return self.query()
+
+    @abstractmethod
+    def expired(self, today: date) -> List[Tuple[str, str]]:
+        """(filename, last date) of every job whose last date is before today."""
+
+    def close(self):
+        pass
+
+
+class SqliteJobStore(JobStore):
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def upsert_many(self, jobs: Dict[str, Dict]) -> int:
+        """Insert or update jobs in one transaction; unchanged records are left untouched."""
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = []
+        for job_id, job in jobs.items():
+            data = json.dumps(job, ensure_ascii=False)
+            rows.append((
+                job_id, job.get("title", ""), job.get("category"), job.get("state"),
+                parse_last_date(job.get("last_date")), now, now,
+                hashlib.sha1(data.encode("utf-8")).hexdigest(), data,
+            ))
+        with self.db:
+            before = self.db.total_changes
+            self.db.executemany(UPSERT, rows)
+            return self.db.total_changes - before
+
+    def remove(self, ids: Iterable[str]) -> int:
+        with self.db:
+            return self.db.executemany("DELETE FROM jobs WHERE id = ?", [(i,) for i in ids]).rowcount
+
+    def ids(self) -> List[str]:
+        return [row[0] for row in self.db.execute("SELECT id FROM jobs")]
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self.db.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def query(self, category=None, state=None, deadline_from=None, deadline_to=None,
+              seen_since=None, limit=None) -> List[Tuple[str, Dict]]:
+        """
+        Jobs matching all given filters, soonest deadline first.
+        Deadlines are dates (inclusive); seen_since is a datetime.
+        """
+        where, args = [], []
+        for column, value in (("category", category), ("state", state)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                args.append(value)
+        if deadline_from is not None:
+            where.append("last_date >= ?")
+            args.append(deadline_from.isoformat())
+        if deadline_to is not None:
+            where.append("last_date <= ?")
+            args.append(deadline_to.isoformat())
+        if seen_since is not None:
+            where.append("first_seen >= ?")
+            args.append(seen_since.isoformat(timespec="seconds"))
+        sql = "SELECT id, data FROM jobs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY last_date IS NULL, last_date, id"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [(job_id, json.loads(data)) for job_id, data in self.db.execute(sql, args)]
+
+    def deadlines_within(self, days: int, today: Optional[date] = None) -> List[Tuple[str, Dict]]:
+        today = today or date.today()
+        return self.query(deadline_from=today, deadline_to=today + timedelta(days=days))
+
+    def new_since(self, hours: int = 24) -> List[Tuple[str, Dict]]:
+        return self.query(seen_since=datetime.now() - timedelta(hours=hours))
+
+    def expired(self, today: date) -> List[Tuple[str, str]]:
+        """(id, last date) of jobs whose last date is before today (index range scan)."""
+        return self.db.execute(
+            "SELECT id, last_date FROM jobs WHERE last_date < ? ORDER BY last_date", (today.isoformat(),)
+        ).fetchall()
+
+    def close(self):
+        self.db.close()
+
+
+def import_files(store: JobStore, jobs_dir: str, skip: tuple = ()) -> int:
+    """
+    Seed an empty store from an existing jobs/ folder. Records keep their
+    filenames, so the first export renames or removes nothing and no job
+    URL changes.
+    """
+    jobs = load_jobs(jobs_dir, skip)
+    store.upsert_many(jobs)
+    logging.info(f"📥 Imported {len(jobs)} job files into the store")
+    return len(jobs)
+
+
+def export_static(store: JobStore, writer: JobWriter) -> None:
+    """
+    Make the jobs/ folder mirror the store through a JobWriter: changed
+    records are written, files no longer in the store are removed. Call
+    writer.publish(manifest) afterwards to refresh manifest and indexes.
+    """
+    exported = set()
+    for job_id, job in store.all_jobs():
+        writer.save(job_id, job)
+        exported.add(job_id)
+    for filename in writer.job_files():
+        if filename not in exported:
+            writer.remove(filename, "not in store")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    db_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(".cache", "jobs.db")
+    jobs_dir = sys.argv[2] if len(sys.argv) > 2 else "jobs"
+    store = SqliteJobStore(db_path)
+    writer = JobWriter(jobs_dir, skip=("job_manifest.json",))
+    export_static(store, writer)
+    writer.publish("job_manifest.json")
+    store.close()
@@ -0,0 +1,191 @@
+# job_writer.py
+# Diff-based writer for the jobs/ folder.
+# Each job is serialized exactly as it would be written and compared with
+# the bytes already on disk; only new or changed records are written, via a
+# temp file + rename so a crashed run never leaves a half-written job.
+# Everything the run added, updated or removed is recorded in a changelog
+# (jobs/changes/<run>.json), so git commits and CDN invalidations only
+# cover what actually changed. The writer also keeps the expiry index
+# (expiry_index.py) and the job cards the list and search indexes are built
+# from (job_cards.py) in step with every save, rename and removal.
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from expiry_index import ExpiryIndex
+from job_cards import JobCards
+from job_index import build_index
+from search_index import write_search_index
+
+CHANGELOG_DIR = "changes"
+CHANGELOG_KEEP = 30  # most recent run changelogs kept in the repo
+
+
+def serialize(payload) -> bytes:
+    return (json.dumps(payload, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def atomic_write(path: str, data: bytes):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _file_hash(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return content_hash(f.read())
+    except FileNotFoundError:
+        return None
+
+
+class JobWriter:
+    """Write job records into jobs_dir, touching only files whose content changed."""
+
+    def __init__(self, jobs_dir: str, skip: tuple = ()):
+        self.jobs_dir = jobs_dir
+        self.added: List[str] = []
+        self.updated: List[str] = []
+        self.removed: List[Dict[str, str]] = []
+        self.unchanged = 0
+        self.started = datetime.now()
+        self.expiry = ExpiryIndex(jobs_dir)
+        self.cards = JobCards(jobs_dir)
+        on_disk = [f for f in os.listdir(jobs_dir) if f.endswith(".json") and f not in skip]
+        unseen: Dict[str, Dict] = {}  # files read for one index are reused by the other
+
+        def load(filename):
+            if filename not in unseen:
+                unseen[filename] = self._load(filename)
+            return unseen[filename]
+
+        self.expiry.sync(on_disk, load)
+        self.cards.sync(on_disk, load)
+
+    def path(self, filename: str) -> str:
+        return os.path.join(self.jobs_dir, filename)
+
+    def _load(self, filename: str) -> Dict:
+        with open(self.path(filename), encoding="utf-8") as f:
+            return json.load(f)
+
+    def job_files(self) -> List[str]:
+        """All job filenames currently in the folder (from the expiry index, no directory scan)."""
+        return self.expiry.files()
+
+    def write(self, filename: str, payload) -> Optional[str]:
+        """Write payload if it differs from the file on disk; returns 'added', 'updated' or None."""
+        data = serialize(payload)
+        existing = _file_hash(self.path(filename))
+        if existing == content_hash(data):
+            return None
+        atomic_write(self.path(filename), data)
+        return "added" if existing is None else "updated"
+
+    def save(self, filename: str, job: Dict) -> Optional[str]:
+        """Save one job record and record it in the changelog."""
+        change = self.write(filename, job)
+        self.expiry.set(filename, job.get("last_date"))
+        self.cards.set(filename, job)
+        if filename in self.added:  # already counted when renamed this run
+            return change
+        if change == "added":
+            self.added.append(filename)
+        elif change == "updated":
+            self.updated.append(filename)
+        else:
+            self.unchanged += 1
+        return change
+
+    def rename(self, old: str, new: str):
+        """Move a record to a new filename (e.g. legacy title-only names to stable IDs)."""
+        os.replace(self.path(old), self.path(new))
+        self.expiry.discard(old)
+        self.cards.move(old, new)
+        self.removed.append({"file": old, "reason": f"renamed to {new}"})
+        self.added.append(new)
+
+    def remove(self, filename: str, reason: str, archive_dir: Optional[str] = None):
+        """Delete a record, or move it into archive_dir if given."""
+        try:
+            if archive_dir:
+                os.makedirs(archive_dir, exist_ok=True)
+                os.replace(self.path(filename), os.path.join(archive_dir, filename))
+            else:
+                os.remove(self.path(filename))
+        except FileNotFoundError:
+            self.expiry.discard(filename)
+            self.cards.discard(filename)
+            return
+        self.expiry.discard(filename)
+        self.cards.discard(filename)
+        if filename in self.added:  # never existed before this run
+            self.added.remove(filename)
+            return
+        if filename in self.updated:
+            self.updated.remove(filename)
+        self.removed.append({"file": filename, "reason": reason})
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+    def write_changelog(self) -> Optional[str]:
+        """Write this run's changelog (only if anything changed) and prune old ones."""
+        if not self.changed:
+            return None
+        log_dir = os.path.join(self.jobs_dir, CHANGELOG_DIR)
+        os.makedirs(log_dir, exist_ok=True)
+        filename = self.started.strftime("%Y%m%d-%H%M%S") + ".json"
+        atomic_write(os.path.join(log_dir, filename), serialize({
+            "run": self.started.isoformat(timespec="seconds"),
+            "added": sorted(self.added),
+            "updated": sorted(self.updated),
+            "removed": self.removed,
+            "unchanged": self.unchanged,
+        }))
+        for old in sorted(f for f in os.listdir(log_dir) if f.endswith(".json"))[:-CHANGELOG_KEEP]:
+            os.remove(os.path.join(log_dir, old))
+        return filename
+
+    def close(self):
+        self.expiry.save()
+        self.cards.save()
+
+    def publish(self, manifest: str, force: bool = False):
+        """
+        Finish the run: save the expiry index and, if any job changed (or
+        `force`, e.g. after an interrupted run), refresh the filename
+        manifest, the list and search indexes (from the job cards, without
+        reading the job files) and the changelog.
+        """
+        self.close()
+        logging.info(f"🗂️ Jobs: {self.report()}")
+        if not self.changed and not force:
+            return
+        files = self.job_files()
+        try:
+            if self.write(manifest, files):
+                logging.info(f"🗂️ Updated {manifest} with {len(files)} jobs.")
+        except Exception as e:
+            logging.error(f"❌ Could not write job manifest: {e}")
+        try:
+            jobs = self.cards.jobs()
+            build_index(self.jobs_dir, jobs)
+            write_search_index(self.jobs_dir, jobs)
+        except Exception as e:
+            logging.error(f"❌ Could not write job index: {e}")
+        logging.info(f"📝 Wrote changelog {self.write_changelog()}")
+
+    def report(self) -> str:
+        return (f"{len(self.added)} added, {len(self.updated)} updated, "
+                f"{len(self.removed)} removed, {self.unchanged} unchanged")
@@ -0,0 +1,178 @@
+# metrics.py
+# Run metrics for fetch_jobs.py: per-stage timers, labelled counters
+# (requests, bytes, cache hits per host), latency histograms (model calls,
+# PDF parsing) and peak RSS. Written at the end of a run as a JSON report
+# and, optionally, in Prometheus text exposition format.
+#
+# Usage:
+#   from metrics import METRICS
+#   with METRICS.stage("private_portals"): ...      # top-level stage
+#   with METRICS.stage("private.deep_crawl"): ...   # sub-stage (dotted name)
+#   METRICS.inc("http_requests_total", host="ssc.gov.in")
+#   METRICS.observe("model_batch_seconds", 0.8, model="summarizer")
+
+import json
+import os
+import platform
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, float("inf"))
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if platform.system() == "Darwin" else peak * 1024
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 4),
+            "mean": round(self.sum / self.count, 4) if self.count else 0.0,
+            "max": round(self.max, 4),
+            "buckets": {("+Inf" if b == float("inf") else str(b)): c for b, c in zip(BUCKETS, self.counts)},
+        }
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a pipeline stage; repeated stages accumulate."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                entry = self.stages.setdefault(name, {"seconds": 0.0, "runs": 0})
+                entry["seconds"] += elapsed
+                entry["runs"] += 1
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe the duration of the block in histogram `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            key = _key(labels)
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels):
+        with self._lock:
+            self.gauges.setdefault(name, {})[_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        with self._lock:
+            self.histograms.setdefault(name, {}).setdefault(_key(labels), Histogram()).observe(value)
+
+    # ---------- output ----------
+    def report(self) -> Dict:
+        self.set("peak_rss_bytes", peak_rss_bytes())
+        self.set("run_seconds", time.time() - self.started)
+
+        def series(values, fmt=lambda v: v):
+            return [{"labels": dict(k), "value": fmt(v)} for k, v in sorted(values.items())]
+
+        return {
+            "started": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "stages": {k: {"seconds": round(v["seconds"], 3), "runs": v["runs"]} for k, v in self.stages.items()},
+            "counters": {name: series(v) for name, v in sorted(self.counters.items())},
+            "gauges": {name: series(v) for name, v in sorted(self.gauges.items())},
+            "histograms": {name: series(v, Histogram.to_dict) for name, v in sorted(self.histograms.items())},
+        }
+
+    def to_prometheus(self, prefix: str = "sarkari_") -> str:
+        def labels(key: LabelKey, extra: List[Tuple[str, str]] = ()) -> str:
+            pairs = list(key) + list(extra)
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        lines = [f"# TYPE {prefix}stage_seconds gauge"]
+        for name, v in self.stages.items():
+            lines.append(f'{prefix}stage_seconds{{stage="{name}"}} {v["seconds"]:.6f}')
+        for name, values in sorted(self.counters.items()):
+            lines.append(f"# TYPE {prefix}{name} counter")
+            lines += [f"{prefix}{name}{labels(k)} {v}" for k, v in sorted(values.items())]
+        for name, values in sorted(self.gauges.items()):
+            lines.append(f"# TYPE {prefix}{name} gauge")
+            lines += [f"{prefix}{name}{labels(k)} {v}" for k, v in sorted(values.items())]
+        for name, values in sorted(self.histograms.items()):
+            lines.append(f"# TYPE {prefix}{name} histogram")
+            for k, h in sorted(values.items()):
+                cumulative = 0
+                for bound, count in zip(BUCKETS, h.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else str(bound)
+                    lines.append(f"{prefix}{name}_bucket{labels(k, [('le', le)])} {cumulative}")
+                lines.append(f"{prefix}{name}_sum{labels(k)} {h.sum:.6f}")
+                lines.append(f"{prefix}{name}_count{labels(k)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, json_path: str, prometheus_path: str = None) -> Dict:
+        """Write the JSON run report (and Prometheus text if a path is given)."""
+        report = self.report()
+        for path, data in ((json_path, json.dumps(report, indent=2)), (prometheus_path, None)):
+            if not path:
+                continue
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(data if data is not None else self.to_prometheus())
+            os.replace(tmp, path)
+        return report
+
+    def summary(self) -> str:
+        """Top-level stage timings, slowest first, as a single log line."""
+        top = {name: v for name, v in self.stages.items() if "." not in name}
+        total = sum(v["seconds"] for v in top.values()) or 1
+        return ", ".join(
+            f"{name} {v['seconds']:.1f}s ({v['seconds'] / total:.0%})"
+            for name, v in sorted(top.items(), key=lambda kv: -kv[1]["seconds"])
+        )
+
+
+METRICS = Metrics()
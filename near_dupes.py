@@ -0,0 +1,230 @@
+# near_dupes.py
+# Near-duplicate detection for jobs picked up from several aggregators.
+# The same SSC/RRB notification shows up on freejobalert, sarkarinaukri and
+# rojgarresult with slightly different titles ("SSC CGL 2025 Apply Online"
+# vs "SSC CGL Recruitment 2025 Notification Out"). Titles are normalized
+# and compared with MinHash signatures (character shingles) bucketed by LSH,
+# and records sharing a PDF URL or a specific official link are matched
+# directly. Each cluster is merged into one canonical job before the
+# expensive deep crawl / PDF / model stages.
+#
+# Memory is bounded: signatures are packed arrays, LSH buckets hold a few
+# ids each, and once max_items records are indexed the oldest are evicted.
+
+import hashlib
+import re
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+NUM_PERM = 64
+BANDS = 16                # 16 bands x 4 rows: candidates from ~50% similarity up
+TITLE_THRESHOLD = 0.7     # estimated Jaccard needed to merge on title alone
+WORD_THRESHOLD = 0.6      # ...plus this word overlap ("UPSC ESE 2025" is not "UPSC CSE 2025")
+LINK_THRESHOLD = 0.3      # ...when the records also share an official link
+                          # (a shared PDF URL needs no title similarity)
+MAX_ITEMS = 50000
+BUCKET_CAP = 8
+SHINGLE = 4
+
+# blake2b gives 8 x 64-bit values per call; 8 salts make the 64 hash functions
+_SALTS = [i.to_bytes(2, "big") * 8 for i in range(NUM_PERM // 8)]
+
+# Words aggregators add around the same notification
+NOISE_WORDS = {
+    "recruitment", "apply", "online", "offline", "form", "notification", "notice", "out", "released",
+    "vacancy", "vacancies", "post", "posts", "jobs", "job", "bharti", "advt", "advertisement",
+    "latest", "new", "for", "the", "of", "and", "in", "at", "to", "exam", "last", "date", "link",
+    "active", "started", "start", "short", "detailed", "official", "website", "govt",
+}
+# Words that tell different announcements for the same exam apart
+KIND_WORDS = {
+    "result", "results", "admit", "card", "answer", "key", "syllabus", "interview", "merit", "cutoff",
+    "cut", "off", "score", "marks", "dv", "document", "verification", "correction", "extended",
+}
+_WORD_RE = re.compile(r"[a-z0-9ऀ-ॿ]+")
+_NUMBER_RE = re.compile(r"\d+")
+_GENERIC_PATHS = {"", "/", "/index.html", "/index.php", "/home", "/en", "/hi"}
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(w for w in _WORD_RE.findall((title or "").lower()) if w not in NOISE_WORDS)
+
+
+def _markers(norm: str) -> frozenset:
+    """Numbers and announcement-kind words; near-duplicates must agree on them."""
+    words = norm.split()
+    return frozenset(w for w in words if w in KIND_WORDS or _NUMBER_RE.fullmatch(w))
+
+
+def _shingles(text: str) -> Iterable[bytes]:
+    text = f" {text} "
+    if len(text) <= SHINGLE:
+        return [text.encode()]
+    return {text[i:i + SHINGLE].encode() for i in range(len(text) - SHINGLE + 1)}
+
+
+def minhash(text: str) -> array:
+    """64-value MinHash signature of the text's character shingles."""
+    rows = [
+        array("Q", b"".join(hashlib.blake2b(sh, digest_size=64, salt=salt).digest() for salt in _SALTS))
+        for sh in _shingles(text)
+    ]
+    return array("Q", map(min, zip(*rows)))
+
+
+def similarity(sig_a: array, sig_b: array) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def specific_link(url: Optional[str]) -> Optional[str]:
+    """Normalized link if it points at a specific page (not a site's home page), else None."""
+    if not url:
+        return None
+    parsed = urlparse(url.strip().lower())
+    path = parsed.path.rstrip("/") or "/"
+    if not parsed.netloc or (path in _GENERIC_PATHS and not parsed.query):
+        return None
+    return parsed.netloc.removeprefix("www.") + path + ("?" + parsed.query if parsed.query else "")
+
+
+class NearDupIndex:
+    """Bounded MinHash-LSH + link index; match() finds the key a record duplicates."""
+
+    def __init__(self, threshold: float = TITLE_THRESHOLD, max_items: int = MAX_ITEMS):
+        self.threshold = threshold
+        self.max_items = max_items
+        self.rows = NUM_PERM // BANDS
+        # key -> (signature, markers, words, links)
+        self._items: "OrderedDict[str, Tuple[array, frozenset, frozenset, Tuple[str, ...]]]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, bytes], List[str]] = {}
+        self._links: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _band_keys(self, sig: array):
+        raw = sig.tobytes()
+        step = self.rows * sig.itemsize
+        return [(band, raw[band * step:(band + 1) * step]) for band in range(BANDS)]
+
+    def match(self, title: str, links: Iterable[Optional[str]] = ()) -> Tuple[Optional[str], array]:
+        """
+        Return (key of an indexed duplicate or None, signature of this title).
+        `links` is (pdf_url, official link); either may be None.
+        """
+        norm = normalize_title(title)
+        sig = minhash(norm)
+        markers = _markers(norm)
+        words = frozenset(norm.split())
+
+        def compatible(key):
+            other = self._items.get(key)
+            # Different years, post codes or announcement kinds mean different notifications
+            return other is not None and markers == other[1]
+
+        for link, needed in zip(map(specific_link, links), (0.0, LINK_THRESHOLD)):
+            key = self._links.get(link) if link else None
+            if key and compatible(key) and similarity(sig, self._items[key][0]) >= needed:
+                return key, sig
+        seen = set()
+        for band_key in self._band_keys(sig):
+            for key in self._buckets.get(band_key, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                if (compatible(key) and similarity(sig, self._items[key][0]) >= self.threshold
+                        and _jaccard(words, self._items[key][2]) >= WORD_THRESHOLD):
+                    return key, sig
+        return None, sig
+
+    def add(self, key: str, title: str, links: Iterable[Optional[str]] = (), sig: Optional[array] = None):
+        norm = normalize_title(title)
+        sig = sig if sig is not None else minhash(norm)
+        norm_links = tuple(filter(None, map(specific_link, links)))
+        self._items[key] = (sig, _markers(norm), frozenset(norm.split()), norm_links)
+        for band_key in self._band_keys(sig):
+            bucket = self._buckets.setdefault(band_key, [])
+            if len(bucket) < BUCKET_CAP:
+                bucket.append(key)
+        for link in norm_links:
+            self._links.setdefault(link, key)
+        while len(self._items) > self.max_items:
+            self._evict()
+
+    def _evict(self):
+        key, (sig, _, _, links) = self._items.popitem(last=False)
+        for band_key in self._band_keys(sig):
+            bucket = self._buckets.get(band_key)
+            if bucket and key in bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[band_key]
+        for link in links:
+            if self._links.get(link) == key:
+                del self._links[link]
+
+
+def completeness(job: Dict) -> Tuple:
+    """Sort key: the most useful record of a cluster becomes the canonical job."""
+    return (
+        bool(job.get("is_gov")),
+        bool(job.get("pdf_url")),
+        job.get("last_date", "Not Specified") != "Not Specified",
+        len(job.get("description") or ""),
+    )
+
+
+def merge_into(canonical: Dict, duplicate: Dict):
+    """Fill fields the canonical job lacks from a duplicate."""
+    for field, value in duplicate.items():
+        if value in (None, "", "N/A", "Not Specified", False, [], {}):
+            continue
+        if canonical.get(field) in (None, "", "N/A", "Not Specified", False, [], {}):
+            canonical[field] = value
+
+
+class NearDupFilter:
+    """
+    Streaming form of cluster_jobs for jobs arriving in batches. Within a
+    batch the most complete record of a cluster is kept and the others are
+    merged into it; a record duplicating one from an earlier (already
+    saved) batch is dropped.
+    """
+
+    def __init__(self, threshold: float = TITLE_THRESHOLD, max_items: int = MAX_ITEMS):
+        self.index = NearDupIndex(threshold, max_items)
+        self.count = 0
+        self.merged = 0
+
+    def filter(self, jobs: List[Dict]) -> List[Dict]:
+        """Return the batch's canonical jobs, in input order."""
+        canonical: Dict[str, Dict] = {}
+        order = sorted(range(len(jobs)), key=lambda i: completeness(jobs[i]), reverse=True)
+        kept = []
+        for i in order:
+            job = jobs[i]
+            links = (job.get("pdf_url"), job.get("apply_link"))
+            key, sig = self.index.match(job.get("title", ""), links)
+            if key is not None:
+                self.merged += 1
+                if key in canonical:
+                    merge_into(canonical[key], job)
+                continue
+            key = str(self.count)
+            self.count += 1
+            canonical[key] = job
+            self.index.add(key, job.get("title", ""), links, sig)
+            kept.append(i)
+        return [jobs[i] for i in sorted(kept)]
+
+
+def cluster_jobs(jobs: List[Dict], threshold: float = TITLE_THRESHOLD, max_items: int = MAX_ITEMS) -> List[Dict]:
+    """Merge near-duplicate jobs; returns one canonical job per cluster, in input order."""
+    return NearDupFilter(threshold, max_items).filter(jobs)
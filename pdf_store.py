@@ -0,0 +1,161 @@
+# pdf_store.py
+# Content-addressed store for notification PDFs.
+# Each PDF is saved once under the SHA-256 of its bytes, however many URLs
+# or aggregators link to it. The extracted text (with the regex job info
+# read_pdf found while extracting it) and the parse_pdf_for_job_info result
+# are cached next to the blob, so a known PDF is never parsed twice.
+# Blobs are evicted least-recently-used first under a disk budget.
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+INDEX_FILE = "index.json"
+
+
+class PdfStore:
+    """Content-addressed PDF blobs plus their extracted text and parse results."""
+
+    def __init__(self, root, max_bytes=1024 * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.parse_hits = 0
+        self.text_hits = 0
+        os.makedirs(root, exist_ok=True)
+        index = self._load_index()
+        self._urls: Dict[str, str] = index.get("urls", {})
+        self._blobs: Dict[str, Dict[str, Any]] = index.get("blobs", {})
+
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.root, INDEX_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.warning(f"⚠️ PDF store index unreadable, starting empty: {e}")
+            return {}
+
+    def _file(self, sha: str, suffix: str) -> str:
+        return os.path.join(self.root, sha[:2], sha + suffix)
+
+    def _write(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return len(data)
+
+    # ---------- blobs ----------
+
+    def put(self, url: str, content: bytes) -> str:
+        """Store PDF bytes (once per distinct content) and map url to them. Returns the SHA-256."""
+        sha = hashlib.sha256(content).hexdigest()
+        self._urls[url] = sha
+        blob = self._blobs.get(sha)
+        if blob is None or not os.path.exists(self._file(sha, ".pdf")):
+            size = self._write(self._file(sha, ".pdf"), content)
+            blob = self._blobs[sha] = {"size": size, "parsed": False, "has_text": False}
+        blob["last_access"] = time.time()
+        return sha
+
+    def sha_for_url(self, url: str) -> Optional[str]:
+        sha = self._urls.get(url)
+        return sha if sha in self._blobs else None
+
+    def path(self, sha: str) -> str:
+        """Filesystem path of the stored PDF (safe for concurrent readers)."""
+        return self._file(sha, ".pdf")
+
+    # ---------- derived data ----------
+
+    def text(self, sha: str) -> Optional[str]:
+        blob = self._blobs.get(sha)
+        if not blob or not blob.get("has_text"):
+            return None
+        try:
+            with open(self._file(sha, ".txt"), encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            blob["has_text"] = False
+            return None
+        blob["last_access"] = time.time()
+        self.text_hits += 1
+        return text
+
+    def set_text(self, sha: str, text: str, regex_info: Optional[Dict[str, str]] = None):
+        blob = self._blobs.get(sha)
+        if blob is None:
+            return
+        blob["size"] += self._write(self._file(sha, ".txt"), text.encode("utf-8"))
+        blob["has_text"] = True
+        if regex_info is not None:
+            blob["regex_info"] = regex_info
+
+    def regex_info(self, sha: str) -> Optional[Dict[str, str]]:
+        """Job info the regex rules found while the text was extracted, if it was kept."""
+        blob = self._blobs.get(sha)
+        return blob.get("regex_info") if blob and blob.get("has_text") else None
+
+    def is_parsed(self, sha: str) -> bool:
+        blob = self._blobs.get(sha)
+        return bool(blob and blob.get("parsed"))
+
+    def info(self, sha: str) -> Optional[Dict[str, Any]]:
+        """Cached parse_pdf_for_job_info result for this PDF, if any."""
+        blob = self._blobs.get(sha)
+        if not blob or not blob.get("parsed"):
+            return None
+        blob["last_access"] = time.time()
+        self.parse_hits += 1
+        return blob.get("info")
+
+    def set_info(self, sha: str, info: Optional[Dict[str, Any]]):
+        blob = self._blobs.get(sha)
+        if blob is not None:
+            blob["info"] = info
+            blob["parsed"] = True
+
+    # ---------- eviction / persistence ----------
+
+    def _drop(self, sha: str):
+        self._blobs.pop(sha, None)
+        for suffix in (".pdf", ".txt"):
+            try:
+                os.remove(self._file(sha, suffix))
+            except FileNotFoundError:
+                pass
+
+    def evict(self) -> int:
+        """Drop least recently used blobs until the store fits in max_bytes."""
+        total = sum(b["size"] for b in self._blobs.values())
+        evicted = 0
+        for sha, blob in sorted(self._blobs.items(), key=lambda kv: kv[1].get("last_access", 0)):
+            if total <= self.max_bytes:
+                break
+            self._drop(sha)
+            total -= blob["size"]
+            evicted += 1
+        if evicted:
+            self._urls = {url: sha for url, sha in self._urls.items() if sha in self._blobs}
+        return evicted
+
+    def close(self):
+        """Evict over-budget blobs and persist the index."""
+        self.evict()
+        path = os.path.join(self.root, INDEX_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"urls": self._urls, "blobs": self._blobs}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def report(self) -> str:
+        total = sum(b["size"] for b in self._blobs.values())
+        return (
+            f"PDF store: {len(self._blobs)} PDFs ({total / 1024 / 1024:.1f} MiB), "
+            f"{self.parse_hits} parse results reused, {self.text_hits} texts reused"
+        )
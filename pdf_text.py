@@ -0,0 +1,155 @@
+# pdf_text.py
+# Streaming text extraction for notification PDFs.
+# Pages are opened from an in-memory buffer (the downloaded bytes, or an
+# mmap of a stored file) and their text is produced one page at a time, so
+# a 100-page notification with annexures and syllabus is never held in
+# memory as a whole. Reading stops at a page / text budget, and read_pdf()
+# stops as soon as JobInfoExtractor has found every field it looks for:
+# the title, department, apply link and deadline are almost always on the
+# first page or two.
+
+import io
+import logging
+import mmap
+import re
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from date_extract import BEST_RANK, NO_DATE, NOT_SPECIFIED, find_last_date
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+TITLE_WORDS = ("recruitment", "job", "vacancy", "post")
+DEPARTMENT_WORDS = ("department", "ministry", "state", "organization")
+_LINK_RE = re.compile(r"(https?://\S+)")
+
+
+@contextmanager
+def open_buffer(path: str) -> Iterator[memoryview]:
+    """A read-only mmap of the file at path, as a memoryview (no copy into the heap)."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        try:
+            yield view
+        finally:
+            view.release()  # the mmap cannot close while a view of it is exported
+
+
+def _fitz_pages(data: Buffer) -> Iterator[str]:
+    import fitz  # PyMuPDF
+
+    doc = fitz.open(stream=data, filetype="pdf")
+    try:
+        for page in doc:
+            yield page.get_text()
+    finally:
+        doc.close()
+
+
+def _pdfplumber_pages(data: Buffer) -> Iterator[str]:
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        for page in pdf.pages:
+            yield page.extract_text() or ""
+            page.close()  # drop the page's parsed layout objects
+
+
+def iter_page_texts(data: Buffer, max_pages: Optional[int] = None,
+                    max_chars: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield the text of each page of the PDF in data, lazily, with PyMuPDF or
+    pdfplumber. Stops after max_pages pages or once max_chars characters of
+    text were produced (the last page is cut to fit). Raises if neither
+    library can read the document.
+    """
+    errors = []
+    for backend in (_fitz_pages, _pdfplumber_pages):
+        pages = backend(data)
+        number = produced = 0
+        try:
+            for number, text in enumerate(pages, 1):
+                if max_chars is not None and produced + len(text) > max_chars:
+                    text = text[:max_chars - produced]
+                produced += len(text)
+                yield text
+                if (max_pages is not None and number >= max_pages) or \
+                        (max_chars is not None and produced >= max_chars):
+                    break
+            return
+        except Exception as e:
+            if number:  # a later page is unreadable: keep what we have
+                logging.warning(f"⚠️ PDF text stopped early: {e}")
+                return
+            errors.append(e)
+        finally:
+            pages.close()
+    raise ValueError("; ".join(str(e) for e in errors))
+
+
+class JobInfoExtractor:
+    """
+    Incremental version of the regex job-info rules: feed() it the text of
+    one page at a time; `complete` turns True once no later page can change
+    the result. The first line mentioning recruitment/job/vacancy/post is
+    the title, the first mentioning a department/ministry/state/organization
+    the department, the first URL the apply link, and the deadline is
+    chosen as in date_extract.extract_last_date.
+    """
+
+    def __init__(self):
+        self.title = ""
+        self.department = ""
+        self.apply_link = ""
+        self._date_rank = NO_DATE
+        self._date = None
+
+    def feed(self, text: str):
+        for line in text.splitlines():
+            if self.title and self.department and self.apply_link:
+                break
+            lower = line.lower()
+            if not self.title and any(w in lower for w in TITLE_WORDS):
+                self.title = line.strip()[:80]
+            if not self.department and any(w in lower for w in DEPARTMENT_WORDS):
+                self.department = line.strip()
+            if not self.apply_link and "http" in line:
+                match = _LINK_RE.search(line)
+                if match:
+                    self.apply_link = match.group(1)
+        if self._date_rank != BEST_RANK:
+            rank, found = find_last_date(text)
+            if rank < self._date_rank:  # ties go to the earlier page
+                self._date_rank, self._date = rank, found
+
+    @property
+    def complete(self) -> bool:
+        return bool(self.title and self.department and self.apply_link) and self._date_rank == BEST_RANK
+
+    def result(self) -> Dict[str, str]:
+        return {
+            "title": self.title,
+            "last_date": str(self._date) if self._date else NOT_SPECIFIED,
+            "department": self.department,
+            "apply_link": self.apply_link,
+        }
+
+
+def read_pdf(data: Buffer, max_pages: Optional[int] = None,
+             max_chars: Optional[int] = None) -> Tuple[str, Dict[str, str]]:
+    """
+    Extract text page by page until the job info is complete or the budget
+    runs out. Returns (text read so far, job info found in it).
+    """
+    extractor = JobInfoExtractor()
+    pages = []
+    texts = iter_page_texts(data, max_pages, max_chars)
+    try:
+        for text in texts:
+            pages.append(text)
+            extractor.feed(text)
+            if extractor.complete:
+                break
+    finally:
+        texts.close()
+    return "\n".join(pages), extractor.result()
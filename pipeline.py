@@ -0,0 +1,156 @@
+# pipeline.py
+# Building blocks for the streaming scrape pipeline in fetch_jobs.py.
+# Jobs flow through the stages (discover -> fetch -> extract -> dedupe ->
+# enrich -> persist) in chunks instead of being accumulated for the whole
+# run: each chunk is saved as soon as it is enriched, so memory stays flat
+# and a crash only loses the chunk in flight.
+#
+# prefetch() runs the crawl stages in a background thread behind a bounded
+# queue: the crawler works on the next chunk while the current one is being
+# enriched and saved, and blocks (backpressure) once `depth` chunks are
+# waiting. Checkpoint records the work units already saved, with their
+# records, so an interrupted run resumes where it stopped instead of
+# starting over.
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Yield lists of up to `size` items."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def prefetch(items: Iterable[T], depth: int = 2, name: str = "prefetch") -> Iterator[T]:
+    """
+    Consume `items` in a background thread, buffering at most `depth` of
+    them. Exceptions raised by the producer are re-raised in the consumer;
+    if the consumer stops early the producer is told to stop too.
+    """
+    buffer: "queue.Queue" = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as e:
+            put((_DONE, e))
+
+    thread = threading.Thread(target=produce, name=name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()  # the producer finishes its current item, never two threads on shared state
+
+
+class Checkpoint:
+    """
+    Keys of the work units (e.g. listing candidates) the current run has
+    finished and saved, plus the records saved for them, appended to a
+    JSON-lines log after every chunk (header line, then one line per chunk)
+    and synced to disk. A resumed run takes those records from the
+    checkpoint itself, so resuming needs no other cache to have been
+    written, even after a hard kill. A checkpoint left behind by an
+    interrupted run is resumed if it is younger than `max_age` seconds;
+    clear() removes it once a run completes.
+    """
+
+    def __init__(self, path: str, max_age: float = 12 * 3600):
+        self.path = path
+        self.started = time.time()
+        self.done = set()
+        self.records: Dict[str, Dict] = {}
+        self.resumed = False
+        try:
+            with open(path, encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                if time.time() - header["started"] < max_age:
+                    self.started = header["started"]
+                    self.resumed = True
+                    for line in f:
+                        try:
+                            chunk = json.loads(line)
+                        except ValueError:
+                            break  # the last line was cut off by the crash
+                        self.done.update(chunk["done"])
+                        self.records.update(chunk["records"])
+                    logging.info(f"⏯️ Resuming interrupted run: {len(self.done)} work units already saved")
+                else:
+                    logging.info("⏯️ Ignoring stale checkpoint from an old interrupted run")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"⚠️ Checkpoint unreadable, starting from scratch: {e}")
+        self._file = None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.done
+
+    def record(self, key: str) -> Optional[Dict]:
+        """The record saved for key by the interrupted run, if any."""
+        return self.records.get(key)
+
+    def mark(self, keys: Iterable[str], records: Optional[Dict[str, Dict]] = None):
+        """Record keys (and the records saved for them) as persisted, on disk before returning."""
+        keys = list(keys)
+        if not keys:
+            return
+        if self._file is None:
+            # Start the log afresh (a resumed one may end in a cut-off line), carrying over what it held
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"started": self.started}) + "\n")
+                if self.done:
+                    f.write(json.dumps({"done": sorted(self.done), "records": self.records}, ensure_ascii=False) + "\n")
+            os.replace(tmp, self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self.done.update(keys)
+        self._file.write(json.dumps({"done": keys, "records": records or {}}, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def clear(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
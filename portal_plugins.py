@@ -0,0 +1,142 @@
+# portal_plugins.py
+# Extractor plugins for the official portals in portals.py, keyed by the
+# portal's "type" field. Each plugin turns a fetched page into a list of
+# notifications: {"title", "link", "text"}. Portals whose type has no
+# registered plugin are skipped before any network request is made.
+#
+# Optional per-portal keys understood by the plugins:
+#   "selector"   CSS selector for notification links (html, pdf-list). An
+#                html portal without one, or whose selector matches nothing
+#                on the page (the markup changed), falls back to every link
+#                with a notification word in its text, minus site
+#                navigation ("Examination Calendar", "How to Apply").
+#   "items_path" dotted path to the list of items in a JSON response (json)
+#   "title_key" / "link_key"  field names inside each JSON item (json)
+#   "limit"      max notifications taken from the portal (default 25)
+
+import json
+import logging
+import re
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, List
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from html_workers import decode_html
+
+DEFAULT_LIMIT = 25
+NOTIFICATION_WORDS = re.compile(
+    r"recruit|vacanc|notification|advertisement|advt|post|exam|apply|bharti|भर्ती|विज्ञापन",
+    re.IGNORECASE,
+)
+# Menu links that carry a notification word but never lead to a vacancy
+NAVIGATION_WORDS = re.compile(
+    r"calendar|how to apply|instructions?|guidelines|faqs?|log ?in|sign ?in|register|contact|help",
+    re.IGNORECASE,
+)
+
+PLUGINS: Dict[str, Callable] = {}
+
+
+def register(portal_type: str):
+    """Decorator: register an extractor for portals of the given type."""
+    def wrap(fn):
+        PLUGINS[portal_type] = fn
+        return fn
+    return wrap
+
+
+def has_plugin(portal: Dict) -> bool:
+    return portal.get("type", "html") in PLUGINS
+
+
+def run_plugin(portal: Dict, content: bytes, encoding: str, parser: str) -> List[Dict]:
+    """Worker-side entry point: run the portal's plugin and de-duplicate by link."""
+    notifications = PLUGINS[portal.get("type", "html")](portal, content, encoding, parser)
+    seen, unique = set(), []
+    for item in notifications:
+        if item["link"] in seen:
+            continue
+        seen.add(item["link"])
+        unique.append(item)
+    return unique[:portal.get("limit", DEFAULT_LIMIT)]
+
+
+def _link_items(portal, soup, selector, require_keyword=False):
+    items = []
+    for tag in soup.select(selector):
+        href = tag.get("href")
+        title = " ".join(tag.get_text(" ", strip=True).split())
+        if not href or not title or href.startswith(("#", "javascript:", "mailto:")):
+            continue
+        if require_keyword and (not NOTIFICATION_WORDS.search(title) or NAVIGATION_WORDS.search(title)):
+            continue
+        # Surrounding row/list item usually carries the dates
+        container = tag.find_parent(["tr", "li", "p", "div"])
+        text = " ".join(container.get_text(" ", strip=True).split()) if container else title
+        items.append({"title": title, "link": urljoin(portal["url"], href), "text": text[:500]})
+    return items
+
+
+@register("html")
+def extract_html(portal, content, encoding, parser):
+    """Notification links picked by the portal's CSS selector (or any notification-like link)."""
+    soup = BeautifulSoup(decode_html(content, encoding), parser)
+    selector = portal.get("selector")
+    if selector:
+        items = _link_items(portal, soup, selector)
+        if items:
+            return items
+        logging.warning(f"⚠️ Selector for {portal.get('name', portal['url'])} matched nothing, "
+                        f"using notification links instead")
+    return _link_items(portal, soup, "a[href]", require_keyword=True)
+
+
+@register("pdf-list")
+def extract_pdf_list(portal, content, encoding, parser):
+    """Pages that list notifications as direct PDF links."""
+    soup = BeautifulSoup(decode_html(content, encoding), parser)
+    selector = portal.get("selector", "a[href$='.pdf'], a[href$='.PDF']")
+    return _link_items(portal, soup, selector)
+
+
+@register("rss")
+def extract_rss(portal, content, encoding, parser):
+    """RSS 2.0 / Atom feeds."""
+    root = ET.fromstring(content)
+    items = []
+    for node in root.iter():
+        tag = node.tag.rsplit("}", 1)[-1]
+        if tag not in ("item", "entry"):
+            continue
+        fields = {child.tag.rsplit("}", 1)[-1]: child for child in node}
+        title = (fields["title"].text or "").strip() if "title" in fields else ""
+        link_node = fields.get("link")
+        link = ""
+        if link_node is not None:
+            link = (link_node.text or link_node.get("href") or "").strip()
+        if not title or not link:
+            continue
+        summary = fields.get("description", fields.get("summary"))
+        text = title + " " + (summary.text or "" if summary is not None else "")
+        items.append({"title": title, "link": urljoin(portal["url"], link), "text": text[:500]})
+    return items
+
+
+@register("json")
+def extract_json(portal, content, encoding, parser):
+    """JSON APIs: items found at portal['items_path'] (dotted path)."""
+    data = json.loads(decode_html(content, encoding))
+    for key in filter(None, portal.get("items_path", "").split(".")):
+        data = data[int(key)] if isinstance(data, list) else data[key]
+    title_key = portal.get("title_key", "title")
+    link_key = portal.get("link_key", "link")
+    items = []
+    for entry in data:
+        title, link = entry.get(title_key), entry.get(link_key)
+        if not title or not link:
+            continue
+        text = " ".join(str(v) for v in entry.values() if isinstance(v, str))
+        items.append({"title": str(title).strip(), "link": urljoin(portal["url"], link), "text": text[:500]})
+    return items
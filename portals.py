@@ -1,11 +1,26 @@
 # portals.py
 # List of major Indian government job portals (central & state)
 # You can add/remove portals here. Each portal can have extra config for scraping.
+# "type" selects the extractor plugin in portal_plugins.py: html, rss, json or pdf-list.
+# Portals whose type has no plugin are skipped without being fetched.
+# "html" portals without a "selector" (CSS selector for the notification
+# links) use the keyword fallback in portal_plugins.py; give a portal a
+# selector once its notice board has been recorded
+# (benchmarks/fixture_server.py record) and checked. A selector that stops
+# matching falls back to the keywords too.
+# "verified": True marks a portal whose plugin and keys were checked against
+# a recording of its live page; until then the run also keeps the portal's
+# "See official site" record.
+# Optional keys: "state", "items_path"/"title_key"/"link_key" (json),
+# "limit" (max notifications).
 
 PORTALS = [
     # Central Government
     {"name": "SSC", "url": "https://ssc.nic.in/", "type": "html"},
-    {"name": "UPSC", "url": "https://upsc.gov.in/", "type": "html"},
+    {"name": "UPSC", "url": "https://upsc.gov.in/", "type": "html",
+     # Advertisements and exam notices are PDFs under /sites/default/files/ (Advt-No-..., Notif-...);
+     # not yet checked against a recording of the live page
+     "selector": "a[href*='/files/Advt'], a[href*='/files/Notif']"},
     {"name": "Railway Recruitment Board (RRB)", "url": "https://indianrailways.gov.in/railwayboard/view_section.jsp?lang=0&id=0,4,1244", "type": "html"},
     {"name": "IBPS", "url": "https://www.ibps.in/", "type": "html"},
     {"name": "DRDO", "url": "https://www.drdo.gov.in/careers", "type": "html"},
@@ -14,21 +29,24 @@ PORTALS = [
     {"name": "Indian Navy", "url": "https://www.joinindiannavy.gov.in/", "type": "html"},
     {"name": "Indian Air Force", "url": "https://afcat.cdac.in/AFCAT/", "type": "html"},
     # State PSCs (examples, add all states)
-    {"name": "Bihar PSC (BPSC)", "url": "https://bpsc.bih.nic.in/", "type": "html"},
-    {"name": "UPPSC", "url": "https://uppsc.up.nic.in/", "type": "html"},
-    {"name": "MPPSC", "url": "https://mppsc.mp.gov.in/", "type": "html"},
-    {"name": "RPSC", "url": "https://rpsc.rajasthan.gov.in/", "type": "html"},
-    {"name": "WBPSC", "url": "https://wbpsc.gov.in/", "type": "html"},
-    {"name": "HPSC", "url": "http://hpsc.gov.in/", "type": "html"},
-    {"name": "JKPSC", "url": "http://jkpsc.nic.in/", "type": "html"},
-    {"name": "Kerala PSC", "url": "https://www.keralapsc.gov.in/", "type": "html"},
-    {"name": "APPSC", "url": "https://psc.ap.gov.in/", "type": "html"},
-    {"name": "TSPSC", "url": "https://www.tspsc.gov.in/", "type": "html"},
-    {"name": "UKPSC", "url": "https://psc.uk.gov.in/", "type": "html"},
-    {"name": "GPSC (Gujarat)", "url": "https://gpsc.gujarat.gov.in/", "type": "html"},
-    {"name": "MPSC (Maharashtra)", "url": "https://mpsc.gov.in/", "type": "html"},
-    {"name": "TNPSC", "url": "https://www.tnpsc.gov.in/", "type": "html"},
-    {"name": "KPSC (Karnataka)", "url": "https://www.kpsc.kar.nic.in/", "type": "html"},
+    {"name": "Bihar PSC (BPSC)", "url": "https://bpsc.bih.nic.in/", "type": "html", "state": "Bihar",
+     # Advertisements are published under /Advt/ (notices under /Notices/ are not jobs);
+     # not yet checked against a recording of the live page
+     "selector": "a[href*='/Advt/']"},
+    {"name": "UPPSC", "url": "https://uppsc.up.nic.in/", "type": "html", "state": "Uttar Pradesh"},
+    {"name": "MPPSC", "url": "https://mppsc.mp.gov.in/", "type": "html", "state": "Madhya Pradesh"},
+    {"name": "RPSC", "url": "https://rpsc.rajasthan.gov.in/", "type": "html", "state": "Rajasthan"},
+    {"name": "WBPSC", "url": "https://wbpsc.gov.in/", "type": "html", "state": "West Bengal"},
+    {"name": "HPSC", "url": "http://hpsc.gov.in/", "type": "html", "state": "Haryana"},
+    {"name": "JKPSC", "url": "http://jkpsc.nic.in/", "type": "html", "state": "Jammu & Kashmir"},
+    {"name": "Kerala PSC", "url": "https://www.keralapsc.gov.in/", "type": "html", "state": "Kerala"},
+    {"name": "APPSC", "url": "https://psc.ap.gov.in/", "type": "html", "state": "Andhra Pradesh"},
+    {"name": "TSPSC", "url": "https://www.tspsc.gov.in/", "type": "html", "state": "Telangana"},
+    {"name": "UKPSC", "url": "https://psc.uk.gov.in/", "type": "html", "state": "Uttarakhand"},
+    {"name": "GPSC (Gujarat)", "url": "https://gpsc.gujarat.gov.in/", "type": "html", "state": "Gujarat"},
+    {"name": "MPSC (Maharashtra)", "url": "https://mpsc.gov.in/", "type": "html", "state": "Maharashtra"},
+    {"name": "TNPSC", "url": "https://www.tnpsc.gov.in/", "type": "html", "state": "Tamil Nadu"},
+    {"name": "KPSC (Karnataka)", "url": "https://www.kpsc.kar.nic.in/", "type": "html", "state": "Karnataka"},
     # Add all other state PSCs/SSCs/Police/Teacher boards as needed
     # ...
 ]
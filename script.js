@@ -21,17 +21,108 @@ if (localStorage.getItem("lang")) {
   document.getElementById("langToggle").value = localStorage.getItem("lang");
 }
 
-// 🔍 Load Job Manifest
-fetch("jobs/job_manifest.json")
-  .then((res) => res.json())
-  .then((files) => {
-    files.forEach((filename) => loadJobFile(`jobs/${filename}`));
-  })
-  .catch((err) => {
-    console.error("Failed to load job manifest:", err);
-  });
-
+// 🔍 Load Job Index
+// jobs/index/index.json lists the chunks of each category shard; the "all"
+// shard holds every job's card fields in one or two gzipped chunks.
+// Falls back to the per-job manifest if the index hasn't been built yet.
+const INDEX_DIR = "jobs/index";
 const categories = new Set();
+const cardsById = new Map();
+
+function fetchJSON(url) {
+  if (typeof DecompressionStream === "undefined") {
+    return fetch(url).then((res) => res.json());
+  }
+  return fetch(`${url}.gz`)
+    .then((res) => {
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
+      return new Response(res.body.pipeThrough(new DecompressionStream("gzip"))).json();
+    })
+    .catch(() => fetch(url).then((res) => res.json()));
+}
+
+function loadJobs() {
+  fetchJSON(`${INDEX_DIR}/index.json`)
+    .then((index) => {
+      Object.entries(index.shards).forEach(([name, shard]) => {
+        if (name !== "all") populateFilter(shard.label);
+      });
+      // Chunks are rendered in order so the list keeps its deadline sort
+      return index.shards.all.chunks.reduce(
+        (prev, chunk) => prev.then(() => fetchJSON(`${INDEX_DIR}/${chunk}`)).then((jobs) => jobs.forEach(renderJob)),
+        Promise.resolve()
+      );
+    })
+    .catch((err) => {
+      console.warn("Job index unavailable, loading manifest:", err);
+      loadManifest();
+    });
+}
+
+function loadManifest() {
+  fetch("jobs/job_manifest.json")
+    .then((res) => res.json())
+    .then((files) => {
+      files.forEach((filename) => loadJobFile(`jobs/${filename}`));
+    })
+    .catch((err) => {
+      console.error("Failed to load job manifest:", err);
+    });
+}
+
+loadJobs();
+
+// 🔎 Search Index
+// jobs/search/index.json maps tokens, prefixes and facet values to job
+// numbers (delta-encoded), so queries never scan the rendered cards.
+let searchIndex = null;
+
+function decodePostings(deltas) {
+  let doc = 0;
+  return deltas.map((d) => (doc += d));
+}
+
+function loadSearchIndex() {
+  fetchJSON("jobs/search/index.json")
+    .then((index) => {
+      index.stopwords = new Set(index.stopwords);
+      searchIndex = index;
+      applyFilters();
+    })
+    .catch((err) => console.warn("Search index unavailable, filtering cards directly:", err));
+}
+
+function termDocs(token) {
+  const docs = new Set(decodePostings(searchIndex.terms[token] || []));
+  if (token.length <= searchIndex.prefix_max) {
+    decodePostings(searchIndex.prefixes[token] || []).forEach((d) => docs.add(d));
+  } else {
+    // Longer than the stored prefixes: expand against the vocabulary
+    Object.keys(searchIndex.terms).forEach((term) => {
+      if (term.startsWith(token)) decodePostings(searchIndex.terms[term]).forEach((d) => docs.add(d));
+    });
+  }
+  return docs;
+}
+
+// Returns the set of matching job ids, or null when nothing is filtered
+function searchJobs(query, category) {
+  let result = null;
+  const intersect = (docs) => {
+    result = result === null ? docs : new Set([...result].filter((d) => docs.has(d)));
+  };
+  query
+    .toLowerCase()
+    .split(/[^0-9a-z\u0900-\u097f]+/)
+    // One-letter words (other than numbers) are not indexed; skip them rather than match nothing
+    .filter((token) => token.length >= (searchIndex.prefix_min || 2) || /^[0-9]+$/.test(token))
+    .filter((token) => !searchIndex.stopwords.has(token))
+    .forEach((token) => intersect(termDocs(token)));
+  if (category) intersect(new Set(decodePostings(searchIndex.facets.category[category] || [])));
+  return result === null ? null : new Set([...result].map((d) => searchIndex.docs[d]));
+}
+
+loadSearchIndex();
 
 // 📦 Load Each Job File
 function loadJobFile(url) {
@@ -44,6 +135,15 @@ function loadJobFile(url) {
     .catch((err) => console.warn("Job load failed:", err));
 }
 
+// 📄 Full details are only fetched when a card from the index is opened
+function openJob(job) {
+  if (!job.id) return showModal(job);
+  fetch(`jobs/${encodeURIComponent(job.id)}`)
+    .then((res) => res.json())
+    .then(showModal)
+    .catch(() => showModal(job));
+}
+
 // 🎨 Render Job Card
 function renderJob(job) {
   const container = document.getElementById("jobListings");
@@ -57,7 +157,8 @@ function renderJob(job) {
     <a href="${job.apply_link}" class="apply-link" target="_blank">Apply Now</a>
     ${job.pdf_url ? `<button class="preview-btn" data-pdf="${job.pdf_url}">Preview PDF</button>` : ""}
   `;
-  card.addEventListener("click", () => showModal(job));
+  card.addEventListener("click", () => openJob(job));
+  if (job.id) cardsById.set(job.id, card);
   container.appendChild(card);
 }
 
@@ -76,12 +177,7 @@ function populateFilter(category) {
 document.getElementById("resetFilters").addEventListener("click", () => {
   document.getElementById("searchJob").value = "";
   document.getElementById("departmentFilter").value = "";
-  document.getElementById("jobListings").innerHTML = "";
-  fetch("jobs/job_manifest.json")
-    .then((res) => res.json())
-    .then((files) => {
-      files.forEach((filename) => loadJobFile(`jobs/${filename}`));
-    });
+  applyFilters();
 });
 
 document.getElementById("searchJob").addEventListener("input", applyFilters);
@@ -90,6 +186,13 @@ document.getElementById("departmentFilter").addEventListener("change", applyFilt
 function applyFilters() {
   const query = document.getElementById("searchJob").value.toLowerCase();
   const category = document.getElementById("departmentFilter").value;
+  if (searchIndex && cardsById.size) {
+    const ids = searchJobs(query, category);
+    cardsById.forEach((card, id) => {
+      card.style.display = !ids || ids.has(id) ? "block" : "none";
+    });
+    return;
+  }
   const cards = document.querySelectorAll(".job-card");
   cards.forEach((card) => {
     const title = card.querySelector("h3").textContent.toLowerCase();
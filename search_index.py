@@ -0,0 +1,150 @@
+# search_index.py
+# Static search index for the site, built at save time.
+# Tokenizes title, category, state and summary of every job into an
+# inverted index (token -> job numbers) plus prefix entries, so the page can
+# answer search-as-you-type queries and category/state filters from one
+# small file instead of scanning every rendered card. Devanagari words are
+# also indexed in Latin transliteration ("भर्ती" -> "bharti"), so either
+# script finds Hindi titles and summaries.
+#
+# Output (jobs/search/index.json, plus .gz):
+#   {"docs": [job filename, ...],
+#    "terms": {token: [doc, ...]},
+#    "prefixes": {prefix: [doc, ...]},
+#    "facets": {"category": {label: [doc, ...]}, "state": {label: [doc, ...]}},
+#    "prefix_min": 2, "prefix_max": 6, "stopwords": [...]}
+# Words shorter than prefix_min are indexed only if they are numbers, so the
+# page ignores shorter query words (a first keystroke) instead of matching
+# nothing.
+# Posting lists are sorted ascending and delta-encoded.
+
+import logging
+import os
+import re
+from typing import Dict, Iterable, List
+
+from job_index import write_compressed
+
+SEARCH_DIR = "search"
+SEARCH_FILE = "index.json"
+INDEXED_FIELDS = ("title", "category", "state", "summary", "summary_hi")
+MIN_PREFIX, MAX_PREFIX = 2, 6
+STOPWORDS = {
+    "a", "an", "and", "as", "at", "by", "for", "from", "in", "of", "on", "or", "the", "to", "with",
+    "का", "की", "के", "में", "और", "से", "को", "पर", "है", "हेतु",
+}
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+|[ऀ-ॿ]+")
+
+# ---------- Devanagari -> Latin ----------
+_CONSONANTS = {
+    "क": "k", "ख": "kh", "ग": "g", "घ": "gh", "ङ": "n", "च": "ch", "छ": "chh", "ज": "j", "झ": "jh",
+    "ञ": "n", "ट": "t", "ठ": "th", "ड": "d", "ढ": "dh", "ण": "n", "त": "t", "थ": "th", "द": "d",
+    "ध": "dh", "न": "n", "प": "p", "फ": "ph", "ब": "b", "भ": "bh", "म": "m", "य": "y", "र": "r",
+    "ल": "l", "व": "v", "श": "sh", "ष": "sh", "स": "s", "ह": "h", "ळ": "l",
+    # Precomposed nukta letters (decomposed ones lose the nukta in transliterate)
+    "\u0958": "q", "\u0959": "kh", "\u095a": "g", "\u095b": "z", "\u095c": "r", "\u095d": "rh", "\u095e": "f",
+}
+_VOWELS = {
+    "अ": "a", "आ": "a", "इ": "i", "ई": "i", "उ": "u", "ऊ": "u", "ऋ": "ri", "ए": "e", "ऐ": "ai",
+    "ओ": "o", "औ": "au",
+}
+_MATRAS = {
+    "ा": "a", "ि": "i", "ी": "i", "ु": "u", "ू": "u", "ृ": "ri", "े": "e", "ै": "ai", "ो": "o", "ौ": "au",
+}
+_VIRAMA, _NUKTA = "्", "़"
+_NASALS = {"ं": "n", "ँ": "n", "ः": "h"}
+
+
+def transliterate(word: str) -> str:
+    """Rough Hindi-style romanization with schwa deletion ("सरकारी" -> "sarkari")."""
+    chars = list(word.replace(_NUKTA, ""))
+    out = []
+    for i, ch in enumerate(chars):
+        if ch in _CONSONANTS:
+            out.append(_CONSONANTS[ch])
+            nxt = chars[i + 1] if i + 1 < len(chars) else ""
+            if nxt in _MATRAS or nxt == _VIRAMA:
+                continue
+            # Inherent "a" is dropped word-finally and before a consonant that carries a vowel sign
+            after = chars[i + 2] if i + 2 < len(chars) else ""
+            if not nxt or nxt in _NASALS:
+                if i == 0 or nxt:
+                    out.append("a")
+            elif i > 0 and chars[i - 1] != _VIRAMA and nxt in _CONSONANTS and after in _MATRAS:
+                continue
+            else:
+                out.append("a")
+        elif ch in _MATRAS:
+            out.append(_MATRAS[ch])
+        elif ch in _VOWELS:
+            out.append(_VOWELS[ch])
+        elif ch in _NASALS:
+            out.append(_NASALS[ch])
+        elif ch.isdigit():
+            out.append(str(int(ch)))
+    return "".join(out)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of text, without stopwords; Devanagari words also yield their transliteration."""
+    tokens = []
+    for token in _TOKEN_RE.findall((text or "").lower()):
+        if token in STOPWORDS:
+            continue
+        if "ऀ" <= token[0] <= "ॿ":
+            latin = transliterate(token)
+            if len(latin) > 1:
+                tokens.append(latin)
+        if len(token) > 1 or token.isdigit():
+            tokens.append(token)
+    return tokens
+
+
+def _delta(docs: Iterable[int]) -> List[int]:
+    out, prev = [], 0
+    for doc in sorted(docs):
+        out.append(doc - prev)
+        prev = doc
+    return out
+
+
+def build_search_index(jobs: Dict[str, Dict]) -> Dict:
+    """Build the search index for {filename: job}."""
+    docs = sorted(jobs)
+    terms: Dict[str, set] = {}
+    prefixes: Dict[str, set] = {}
+    facets: Dict[str, Dict[str, set]] = {"category": {}, "state": {}}
+    for n, job_id in enumerate(docs):
+        job = jobs[job_id]
+        text = " ".join(str(job.get(field) or "") for field in INDEXED_FIELDS)
+        for token in set(tokenize(text)):
+            terms.setdefault(token, set()).add(n)
+            for size in range(MIN_PREFIX, min(len(token), MAX_PREFIX + 1)):
+                prefixes.setdefault(token[:size], set()).add(n)
+        for facet, values in facets.items():
+            label = job.get(facet)
+            if label and label != "N/A":
+                values.setdefault(label, set()).add(n)
+    return {
+        "docs": docs,
+        "terms": {t: _delta(d) for t, d in sorted(terms.items())},
+        "prefixes": {p: _delta(d) for p, d in sorted(prefixes.items())},
+        "facets": {f: {label: _delta(d) for label, d in sorted(v.items())} for f, v in facets.items()},
+        "prefix_min": MIN_PREFIX,
+        "prefix_max": MAX_PREFIX,
+        "stopwords": sorted(STOPWORDS),
+    }
+
+
+def write_search_index(jobs_folder: str, jobs: Dict[str, Dict]) -> Dict:
+    """Write jobs/search/index.json (+ precompressed copies) and return the index."""
+    index = build_search_index(jobs)
+    search_dir = os.path.join(jobs_folder, SEARCH_DIR)
+    os.makedirs(search_dir, exist_ok=True)
+    sizes = write_compressed(os.path.join(search_dir, SEARCH_FILE), index)
+    logging.info(
+        f"🔎 Search index: {len(index['docs'])} jobs, {len(index['terms'])} terms, "
+        f"{len(index['prefixes'])} prefixes ({sizes['gzip'] / 1024:.1f} KiB gzipped)"
+    )
+    return index
@@ -0,0 +1,238 @@
+# telegram_dispatch.py
+# Telegram notifications for new jobs.
+# New jobs are packed into digest messages (many jobs per message, under
+# Telegram's 4096-character limit) and sent over one pooled session. A
+# token bucket keeps within Telegram's per-chat limits, 429 responses wait
+# for the server's retry_after, and other failures back off exponentially.
+# A persistent outbox records which jobs (by their stable listing key) were
+# already announced, so nothing is sent twice across runs.
+# Long fields are clipped before MarkdownV2 escaping, never the escaped
+# text, so a block can't end inside an escape sequence or a link.
+#
+# The API base URL is configurable, so the dispatcher can be pointed at a
+# local stand-in server for testing (TELEGRAM_API_BASE in fetch_jobs.py;
+# see benchmarks/telegram_stub.py).
+
+import json
+import logging
+import os
+import random
+import time
+from typing import Callable, Dict, List, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+TELEGRAM_API = "https://api.telegram.org"
+MAX_MESSAGE_CHARS = 4096
+JOBS_PER_DIGEST = 15
+TITLE_CHARS = 300
+SUMMARY_CHARS = 140
+TAG_CHARS = 40
+LINK_CHARS = 1500  # longer (escaped) links are left out rather than cut
+OUTBOX_RETENTION = 180 * 86400  # forget sent job keys after 180 days
+
+_MARKDOWN_SPECIAL = ('_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!')
+
+
+def escape_markdown(text):
+    # Escape Telegram Markdown special characters
+    if not text:
+        return ''
+    text = str(text).replace('\\', '\\\\')
+    for ch in _MARKDOWN_SPECIAL:
+        text = text.replace(ch, f'\\{ch}')
+    return text
+
+
+def escape_link(url: str) -> str:
+    """Escape a URL for use inside (...) of a MarkdownV2 link."""
+    return url.replace('\\', '\\\\').replace(')', '\\)')
+
+
+class TokenBucket:
+    """Allow `rate` events per second on average with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+
+    def acquire(self):
+        while True:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            self.sleep((1 - self.tokens) / self.rate)
+
+
+class Outbox:
+    """Persistent record of jobs already announced: {"sent": {job key: unix time}}."""
+
+    def __init__(self, path: str, retention: float = OUTBOX_RETENTION):
+        self.path = path
+        self.retention = retention
+        self.exists = os.path.exists(path)
+        self.new = not self.exists  # no outbox when loaded: first run or lost cache
+        self.sent: Dict[str, float] = {}
+        if self.exists:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.sent = json.load(f).get("sent", {})
+            except Exception as e:
+                logging.warning(f"⚠️ Could not load Telegram outbox {path}: {e}")
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self.sent
+
+    def mark(self, job_ids):
+        now = time.time()
+        for job_id in job_ids:
+            self.sent[job_id] = now
+
+    def save(self):
+        cutoff = time.time() - self.retention
+        self.sent = {k: t for k, t in self.sent.items() if t >= cutoff}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"sent": self.sent}, f)
+        os.replace(tmp, self.path)
+        self.exists = True
+
+
+def clip(text, limit: int) -> str:
+    """Shorten plain text to at most `limit` characters, marking the cut with an ellipsis."""
+    text = str(text)
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def format_job(job: Dict) -> str:
+    """One job's block inside a digest message (MarkdownV2), bounded by the field limits above."""
+    block = f"*{escape_markdown(clip(job.get('title') or 'New Job', TITLE_CHARS))}*"
+    deadline = job.get('last_date') or job.get('deadline') or ''
+    if deadline and deadline != "Not Specified":
+        block += f"\n🗓️ Deadline: {escape_markdown(clip(deadline, TAG_CHARS))}"
+    summary = job.get('summary') or job.get('description') or ''
+    if summary:
+        block += f"\n{escape_markdown(clip(summary, SUMMARY_CHARS))}"
+    tags = job.get('tags') or job.get('skills') or []
+    if tags and isinstance(tags, list):
+        block += f"\n🏷️ {' | '.join(escape_markdown(clip(t, TAG_CHARS)) for t in tags[:6])}"
+    link = escape_link(job.get('apply_link') or job.get('url') or '')
+    if link and len(link) <= LINK_CHARS:
+        block += f"\n[Apply Here]({link})"
+    return block
+
+
+def build_digests(jobs: List[Tuple[str, Dict]], per_digest: int = JOBS_PER_DIGEST,
+                  max_chars: int = MAX_MESSAGE_CHARS) -> List[Tuple[str, List[str]]]:
+    """Pack (job_id, job) pairs into as few messages as possible: [(text, job_ids)]."""
+    digests, blocks, ids = [], [], []
+
+    def flush():
+        if blocks:
+            header = f"🆕 *{len(blocks)} new job{'s' if len(blocks) > 1 else ''}*"
+            digests.append(("\n\n".join([header] + blocks), list(ids)))
+            blocks.clear()
+            ids.clear()
+
+    for job_id, job in jobs:
+        block = format_job(job)
+        size = sum(len(b) + 2 for b in blocks) + len(block) + 40
+        if blocks and (len(blocks) >= per_digest or size > max_chars):
+            flush()
+        blocks.append(block)
+        ids.append(job_id)
+    flush()
+    return digests
+
+
+class TelegramDispatcher:
+    """
+    Send digests of new jobs to one chat.
+    Defaults follow Telegram's limits: about one message per second per chat
+    and at most 20 per minute in a group.
+    """
+
+    def __init__(self, token: str, chat_id: str, outbox: Outbox, api_base: str = TELEGRAM_API,
+                 max_retries: int = 5, timeout: float = 10, per_digest: int = JOBS_PER_DIGEST,
+                 sleep: Callable[[float], None] = time.sleep, clock: Callable[[], float] = time.monotonic):
+        self.url = f"{api_base.rstrip('/')}/bot{token}/sendMessage"
+        self.chat_id = chat_id
+        self.outbox = outbox
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.per_digest = per_digest
+        self.sleep = sleep
+        self.per_second = TokenBucket(rate=1.0, capacity=1, clock=clock, sleep=sleep)
+        self.per_minute = TokenBucket(rate=20 / 60, capacity=20, clock=clock, sleep=sleep)
+        self.session = requests.Session()
+        self.session.mount(api_base, HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self.sent_messages = 0
+        self.retries = 0
+
+    def _post(self, text: str) -> bool:
+        payload = {
+            "chat_id": self.chat_id,
+            "text": text,
+            "parse_mode": "MarkdownV2",
+            "disable_web_page_preview": True,
+        }
+        for attempt in range(self.max_retries + 1):
+            self.per_second.acquire()
+            self.per_minute.acquire()
+            try:
+                resp = self.session.post(self.url, json=payload, timeout=self.timeout)
+            except requests.RequestException as e:
+                logging.warning(f"⚠️ Telegram request failed: {e}")
+                resp = None
+            if resp is not None and resp.status_code == 200:
+                return True
+            if resp is not None and resp.status_code == 429:
+                try:
+                    wait = float(resp.json().get("parameters", {}).get("retry_after", 1))
+                except ValueError:
+                    wait = float(resp.headers.get("Retry-After", 1))
+                logging.info(f"⏳ Telegram rate limit, retrying after {wait:.0f}s")
+            elif resp is not None and resp.status_code < 500:
+                logging.warning(f"Failed to send Telegram notification: {resp.text}")
+                return False  # bad request / auth errors won't succeed on retry
+            else:
+                wait = min(60, 2 ** attempt) * (0.5 + random.random())
+            if attempt < self.max_retries:
+                self.retries += 1
+                self.sleep(wait)
+        return False
+
+    def notify(self, jobs: List[Tuple[str, Dict]]) -> int:
+        """Announce jobs not yet in the outbox; returns the number of jobs sent."""
+        fresh, seen = [], set()
+        for job_id, job in jobs:
+            if job_id not in self.outbox and job_id not in seen:
+                fresh.append((job_id, job))
+                seen.add(job_id)
+        if not fresh:
+            logging.info("No jobs to notify on Telegram.")
+            return 0
+        sent = 0
+        for text, job_ids in build_digests(fresh, self.per_digest):
+            if not self._post(text):
+                logging.error(f"❌ Gave up on a Telegram digest of {len(job_ids)} jobs; they will be retried next run")
+                break
+            self.sent_messages += 1
+            self.outbox.mark(job_ids)
+            self.outbox.save()  # saved per message so a crash never re-sends a digest
+            sent += len(job_ids)
+        logging.info(f"📨 Telegram: {sent} jobs in {self.sent_messages} messages ({self.retries} retries)")
+        return sent
+
+    def close(self):
+        self.session.close()